@@ -11,6 +11,9 @@ import os
 sys.path.insert(0, '.claude/skills/grade-comparison/scripts')
 import compare_grades
 
+sys.path.insert(0, 'scripts')
+from results_store import ResultsStore, RESULTS_DB
+
 def main():
     """Main function with flexible submission handling"""
 
@@ -19,7 +22,7 @@ def main():
         print("Example: python compare_grades.py WorkSubmissions04")
         print()
         print("This will:")
-        print("  1. Load grades from outputs/<submission_name>/grades.xlsx")
+        print("  1. Load grades from outputs/<submission_name>/results.sqlite3 (or grades.xlsx)")
         print("  2. Find PDFs in tests/<submission_name>/")
         print("  3. Generate comparison at outputs/<submission_name>/grade_comparison.xlsx")
         sys.exit(1)
@@ -32,21 +35,23 @@ def main():
     print()
 
     # Determine paths
+    results_path = f"outputs/{submission_name}/{RESULTS_DB}"
     grades_path = f"outputs/{submission_name}/grades.xlsx"
     worksubmissions_path = f"tests/{submission_name}"
     output_path = f"outputs/{submission_name}/grade_comparison.xlsx"
 
     # Fallback to main outputs/ if submission folder doesn't exist
-    if not os.path.exists(grades_path):
+    if not os.path.exists(results_path) and not os.path.exists(grades_path):
+        results_path = f"outputs/{RESULTS_DB}"
         grades_path = "outputs/grades.xlsx"
-        print(f"Note: Using fallback grades path: {grades_path}")
+        print(f"Note: Using fallback outputs folder: outputs/")
 
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     # Check if grades file exists
-    if not os.path.exists(grades_path):
-        print(f"Error: Could not find {grades_path}")
+    if not os.path.exists(results_path) and not os.path.exists(grades_path):
+        print(f"Error: Could not find {results_path} or {grades_path}")
         print("Please run evaluation first.")
         sys.exit(1)
 
@@ -56,8 +61,12 @@ def main():
         print("Please check the submission name.")
         sys.exit(1)
 
-    # Load evaluator grades
-    evaluator_grades = compare_grades.load_evaluator_grades(grades_path)
+    # Load evaluator grades (from the results store; grades.xlsx for older runs)
+    if os.path.exists(results_path):
+        with ResultsStore(results_path) as store:
+            evaluator_grades = store.grades()
+    else:
+        evaluator_grades = compare_grades.load_evaluator_grades(grades_path)
 
     # Find student folders
     student_folders = compare_grades.find_student_folders(worksubmissions_path)
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cover-page extractor
+Reads the first pages of each submission PDF once - text and hyperlinks
+together - and pulls out the team, student IDs, self score and GitHub URL.
+Results are cached by the PDF's content hash, so re-runs only open new or
+changed files, and a whole cohort can be processed with a worker pool.
+
+Usage:
+    python scripts/cover_page.py tests/WorkSubmissions05 --workers 8
+"""
+
+import re
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+
+from task_pool import run_tasks
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DB = PROJECT_ROOT / "outputs" / ".cache" / "cover_pages.sqlite3"
+
+# Only the cover pages carry submission details
+COVER_PAGES = 2
+
+# Bump when the patterns or the result shape change; older entries are ignored
+EXTRACTOR_VERSION = 1
+
+# Seconds one PDF may take before its worker is killed
+PDF_TIMEOUT = 60
+
+# PDFs in a participant folder that are not the student's submission: the
+# submission keys sheet and reports the graders dropped back into the folder
+NON_COVER_PDFS = ("submission_keys", "student_grade_report", "detailed_grade_breakdown")
+
+FIELDS = ("group_code", "student1", "student2", "github", "grade")
+
+# "Team: Name1 (ID1), Name2 (ID2) | Repository: ..."
+TEAM_PATTERN = re.compile(r'Team:\s*([^|]+?)\s*\|')
+# Hebrew cover: 9-digit ID followed by a Hebrew name
+STUDENT_ID_PATTERN = re.compile(r'(\d{9})\s+([\u0590-\u05FF\s]+)')
+GROUP_NAME_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9_\s-]+$')
+GITHUB_PATTERN = re.compile(r'https?://github\.com/[^\s\)\]>]+')
+
+SCORE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(?:Our Self Score|Self Score):\s*(\d+)\s*/\s*100',  # English format
+    r'(?:ימצע\s*ןויצ|ציון\s*עצמי)\s*[–-]\s*(\d+)',  # Hebrew format (reversed by the PDF text layer)
+    r'(?:ציון|הציון)\s*[:\s]*(\d+)',  # General Hebrew format
+)]
+
+# Numbered cover form ("1. Group code: ... 5. Grade suggestion: ...") used by
+# earlier cohorts; fills whatever the formats above left empty
+FORM_PATTERNS = {field: [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in patterns]
+                 for field, patterns in {
+    'group_code': [
+        r'1\.\s*(?:Group [Cc]ode|Codegroupe|קוד קבוצה):\s*([^\n]+)',
+        r'Group [Cc]ode:\s*([^\n]+)',
+        r'קוד קבוצה:\s*([^\n]+)',
+    ],
+    'student1': [
+        r'2\.\s*(?:Student one|Member A|שם חבר צוות ראשון):\s*([^\n]+)',
+        r'Student one:\s*([^\n]+)',
+        r'Member A:\s*([^\n]+)',
+        r'Student 1:\s*([^\n]+)',
+    ],
+    'student2': [
+        r'3\.\s*(?:Student two|Member B|שם חבר צוות שני):\s*([^\n]+)',
+        r'Student two:\s*([^\n]+)',
+        r'Member B:\s*([^\n]+)',
+        r'Student 2:\s*([^\n]+)',
+    ],
+    'github': [
+        r'4\.\s*(?:Repo link|GitHub Repository|קישור לריפו):\s*([^\n]+)',
+        r'GitHub Repository:\s*([^\n]+)',
+        r'Repo link:\s*([^\n]+)',
+        r'(https://github\.com/[^\s\)]+)',
+    ],
+    'grade': [
+        r'5\.\s*(?:Grade suggestion|הציון העצמי שלי):\s*(\d+)',
+        r'Grade suggestion:\s*(\d+)',
+        r'הציון העצמי שלי\s*[:]?\s*(\d+)',
+        r'(?:Suggested [Gg]rade|Self [Gg]rade):\s*(\d+)',
+    ],
+}.items()}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS covers (
+    content_hash TEXT NOT NULL,
+    version      INTEGER NOT NULL,
+    info         TEXT NOT NULL,
+    PRIMARY KEY (content_hash, version)
+)
+"""
+
+
+def _fitz():
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise ImportError("PyMuPDF is required to read cover pages. "
+                          "Install it with: pip install PyMuPDF")
+    return fitz
+
+
+def empty_info():
+    return {field: '' for field in FIELDS}
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_cover_pdf(folder):
+    """The main submission PDF in a participant folder (not keys or grade reports), or None"""
+    pdf_files = sorted(Path(folder).glob('*.pdf'))
+    main_pdfs = [p for p in pdf_files if not any(skip in p.name.lower() for skip in NON_COVER_PDFS)]
+    return main_pdfs[0] if main_pdfs else (pdf_files[0] if pdf_files else None)
+
+
+def read_cover(pdf_path, max_pages=COVER_PAGES):
+    """
+    Open a PDF once and return (text, github_url) for its first pages
+    The GitHub URL is the first github.com hyperlink or, failing that, URL in
+    the text, checking page by page.
+    """
+    fitz = _fitz()
+    text = ""
+    github = ""
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(min(max_pages, len(doc))):
+            page = doc[page_num]
+            page_text = page.get_text()
+            text += page_text
+            if github:
+                continue
+            for link in page.get_links():
+                if 'github.com' in link.get('uri', ''):
+                    github = link['uri']
+                    break
+            else:
+                match = GITHUB_PATTERN.search(page_text)
+                if match:
+                    github = match.group(0)
+    return text, github
+
+
+def parse_form_fields(text):
+    """Fields of the numbered cover form; missing fields are ''"""
+    info = empty_info()
+    for field, patterns in FORM_PATTERNS.items():
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                info[field] = match.group(1).strip()
+                break
+
+    # Keep just the URL / the number when the line carries extra text
+    if info['github']:
+        match = re.search(r'https://github\.com/[^\s\)]+', info['github'])
+        if match:
+            info['github'] = match.group(0)
+    if info['grade']:
+        match = re.search(r'(\d+)', info['grade'])
+        if match:
+            info['grade'] = match.group(1)
+    return info
+
+
+def parse_cover_text(text):
+    """Team, student, and self-score fields from cover-page text (GitHub is left to read_cover)"""
+    info = empty_info()
+
+    team_match = TEAM_PATTERN.search(text)
+    if team_match:
+        students = [s.strip() for s in team_match.group(1).strip().split(',')]
+        if len(students) >= 1:
+            info['student1'] = students[0]
+        if len(students) >= 2:
+            info['student2'] = students[1]
+
+        # Use the first student's name as group code
+        if info['student1']:
+            name_match = re.search(r'^([^(]+)', info['student1'])
+            if name_match:
+                info['group_code'] = name_match.group(1).strip().replace(' ', '_').lower()
+    else:
+        # Hebrew format: a group name line directly followed by a line with an ID
+        lines = text.split('\n')
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if GROUP_NAME_PATTERN.match(line) and len(line) < 50 and i + 1 < len(lines):
+                if re.search(r'\d{9}', lines[i + 1].strip()):
+                    info['group_code'] = line.replace(' ', '_').lower()
+                    break
+
+        student_matches = STUDENT_ID_PATTERN.findall(text)
+        for field, (student_id, student_name) in zip(('student1', 'student2'), student_matches):
+            info[field] = f"{student_name.strip()} ({student_id})"
+
+    for pattern in SCORE_PATTERNS:
+        score_match = pattern.search(text)
+        if score_match:
+            info['grade'] = score_match.group(1)
+            break
+    return info
+
+
+def extract_cover(pdf_path):
+    """Submission info (group_code, student1, student2, github, grade) from one PDF"""
+    text, github = read_cover(pdf_path)
+    info = parse_cover_text(text)
+    info['github'] = github
+    for field, value in parse_form_fields(text).items():
+        if not info[field]:
+            info[field] = value
+    return info
+
+
+class CoverPageCache:
+    """
+    Extracted cover info keyed by PDF content hash.
+
+    Use as a context manager; new entries are committed on exit.
+    Pass db_path=None to disable caching (every lookup misses).
+    """
+
+    def __init__(self, db_path=CACHE_DB):
+        self._conn = None
+        if db_path is None:
+            return
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), timeout=30)
+            self._conn.execute(_SCHEMA)
+            self._conn.execute("DELETE FROM covers WHERE version != ?", (EXTRACTOR_VERSION,))
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: cover page cache disabled ({e})")
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def get(self, digest):
+        if self._conn is None:
+            return None
+        row = self._conn.execute("SELECT info FROM covers WHERE content_hash = ? AND version = ?",
+                                 (digest, EXTRACTOR_VERSION)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, digest, info):
+        if self._conn is not None:
+            self._conn.execute("INSERT OR REPLACE INTO covers VALUES (?, ?, ?)",
+                               (digest, EXTRACTOR_VERSION, json.dumps(info)))
+
+
+def extract_all(pdf_paths, workers=1, timeout=PDF_TIMEOUT, cache_path=CACHE_DB):
+    """
+    Extract cover info for many PDFs
+
+    Cached PDFs are not opened; the rest are read by a pool of workers, each
+    killed after timeout seconds. Returns {path: info} in input order; a PDF
+    that could not be read gets empty fields plus an 'error' message (and is
+    not cached).
+    """
+    pdf_paths = [Path(p) for p in pdf_paths]
+    results = {}
+    with CoverPageCache(cache_path) as cache:
+        digests = {}
+        tasks = []
+        for path in pdf_paths:
+            digest = file_hash(path)
+            info = cache.get(digest)
+            if info is not None:
+                results[path] = info
+            else:
+                digests[path] = digest
+                tasks.append((path, (str(path),)))
+
+        for result in run_tasks(extract_cover, tasks, jobs=workers, timeout=timeout, retries=0):
+            path = result["key"]
+            if result["ok"]:
+                results[path] = result["value"]
+                cache.put(digests[path], result["value"])
+            else:
+                results[path] = dict(empty_info(), error=result["error"])
+
+    return {path: results[path] for path in pdf_paths}
+
+
+def cohort_covers(worksubmissions_folder, workers=1, timeout=PDF_TIMEOUT, cache_path=CACHE_DB):
+    """
+    Cover info for every Participant_* folder
+    Returns [(folder, pdf_path or None, info or None)] in folder order
+    """
+    folders = sorted(d for d in Path(worksubmissions_folder).iterdir()
+                     if d.is_dir() and d.name.startswith('Participant_'))
+    pdfs = {folder: find_cover_pdf(folder) for folder in folders}
+    infos = extract_all([p for p in pdfs.values() if p], workers, timeout, cache_path)
+    return [(folder, pdf, infos[pdf] if pdf else None) for folder, pdf in pdfs.items()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract submission details from cover-page PDFs")
+    parser.add_argument("folder", help="WorkSubmissions folder containing Participant_* folders")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes reading PDFs (default: 1)")
+    parser.add_argument("--timeout", type=float, default=PDF_TIMEOUT,
+                        help=f"Seconds one PDF may take (default: {PDF_TIMEOUT})")
+    parser.add_argument("--no-cache", action="store_true", help="Read every PDF, ignoring the cache")
+    parser.add_argument("--json", metavar="PATH", help="Also write {participant folder: info} to PATH")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    covers = cohort_covers(args.folder, max(1, args.workers), args.timeout,
+                           None if args.no_cache else CACHE_DB)
+
+    for folder, pdf, info in covers:
+        if info is None:
+            print(f"[X] {folder.name}: no PDF found")
+        elif 'error' in info:
+            print(f"[X] {folder.name}: {info['error']}")
+        else:
+            print(f"[OK] {folder.name}: {info['group_code'] or '-'} | {info['student1'] or '-'}"
+                  f" | {info['student2'] or '-'} | {info['github'] or '-'} | {info['grade'] or '-'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(
+            {folder.name: dict(info or empty_info(), pdf=pdf.name if pdf else None)
+             for folder, pdf, info in covers}, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\nSaved: {args.json}")
+
+
+if __name__ == '__main__':
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
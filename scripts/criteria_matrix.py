@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Student x criterion membership matrix
+Interns students and criteria to integer ids and stores "student has
+criterion" as a bit-packed NumPy matrix, so graph counts and per-student
+scores are column and row reductions instead of nested list scans
+"""
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(f"Missing dependency: {e}. Install with: pip install numpy")
+
+# Rows reduced at a time (bounds temporary memory to ROW_BLOCK x criteria bytes)
+ROW_BLOCK = 4096
+
+# Bit b of byte value v, most significant bit first (np.packbits order)
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).astype(np.float64)
+
+
+class CriteriaMatrix:
+    """
+    Bit-packed boolean matrix, one row per student and one bit per criterion.
+
+    Students keep the order of the input mapping; criteria keep first-seen
+    order (or the order given in `criteria`). Memory is S x C / 8 bytes,
+    about 6 MB for 50,000 students x 1,000 criteria.
+    """
+
+    def __init__(self, students, criteria, bits):
+        self.students = list(students)
+        self.criteria = list(criteria)
+        self.student_index = {name: i for i, name in enumerate(self.students)}
+        self.criterion_index = {name: j for j, name in enumerate(self.criteria)}
+        self.bits = bits
+        self._counts = None
+
+    @classmethod
+    def from_student_criteria(cls, student_criteria, criteria=None):
+        """
+        Build from {student: iterable of criteria}
+        If criteria is given it fixes the column order; unknown criteria are appended.
+        """
+        criterion_index = {}
+        for name in criteria or ():
+            criterion_index.setdefault(name, len(criterion_index))
+
+        rows, cols = [], []
+        for row, crits in enumerate(student_criteria.values()):
+            for criterion in crits:
+                col = criterion_index.setdefault(criterion, len(criterion_index))
+                rows.append(row)
+                cols.append(col)
+
+        n_students, n_criteria = len(student_criteria), len(criterion_index)
+        bits = np.zeros((n_students, (n_criteria + 7) // 8), dtype=np.uint8)
+        if rows:
+            rows = np.asarray(rows, dtype=np.intp)
+            cols = np.asarray(cols, dtype=np.intp)
+            np.bitwise_or.at(bits, (rows, cols >> 3), (0x80 >> (cols & 7)).astype(np.uint8))
+        return cls(student_criteria.keys(), criterion_index.keys(), bits)
+
+    @property
+    def shape(self):
+        return len(self.students), len(self.criteria)
+
+    def _byte_tables(self, values):
+        """
+        (256, bytes) table: entry [b, k] is the sum of values over the bits
+        set in byte value b of packed column k
+        """
+        n_bytes = self.bits.shape[1]
+        padded = np.zeros(n_bytes * 8, dtype=np.float64)
+        padded[:len(self.criteria)] = values
+        return _BYTE_BITS @ padded.reshape(n_bytes, 8).T
+
+    def _column(self, criterion):
+        """Boolean vector over students for one criterion"""
+        j = self.criterion_index[criterion]
+        return (self.bits[:, j >> 3] & (0x80 >> (j & 7))) != 0
+
+    # ------------------------------------------------------------------
+    # Column reductions
+    # ------------------------------------------------------------------
+
+    def counts(self):
+        """Number of students having each criterion (int array in criteria order)"""
+        if self._counts is None:
+            n_bytes = self.bits.shape[1]
+            counts = np.zeros((n_bytes, 8), dtype=np.int64)
+            for bit in range(8):
+                counts[:, bit] = ((self.bits >> (7 - bit)) & 1).sum(axis=0, dtype=np.int64)
+            self._counts = counts.reshape(-1)[:len(self.criteria)]
+        return self._counts
+
+    def students_with(self, criterion):
+        """Students having criterion, in student order"""
+        return [self.students[i] for i in np.flatnonzero(self._column(criterion))]
+
+    def prevalence(self):
+        """Fraction of students having each criterion"""
+        return self.counts() / max(len(self.students), 1)
+
+    def criteria_mask(self, names):
+        """Boolean vector over criteria selecting names"""
+        mask = np.zeros(len(self.criteria), dtype=bool)
+        for name in names:
+            j = self.criterion_index.get(name)
+            if j is not None:
+                mask[j] = True
+        return mask
+
+    # ------------------------------------------------------------------
+    # Row reductions
+    # ------------------------------------------------------------------
+
+    def row_sums(self, values):
+        """Per-student sum of values (one per criterion) over the criteria they have"""
+        tables = self._byte_tables(np.asarray(values, dtype=np.float64))
+        columns = np.arange(self.bits.shape[1])
+        sums = np.empty(len(self.students), dtype=np.float64)
+        for start in range(0, len(self.students), ROW_BLOCK):
+            block = self.bits[start:start + ROW_BLOCK]
+            sums[start:start + len(block)] = tables[block, columns].sum(axis=1)
+        return sums
+
+    def row_counts(self, mask=None):
+        """Per-student number of criteria, optionally only those selected by mask"""
+        values = np.ones(len(self.criteria)) if mask is None else np.asarray(mask, dtype=np.float64)
+        return np.rint(self.row_sums(values)).astype(np.int64)
+
+    def criteria_of(self, student):
+        """Criteria a student has, in criteria order"""
+        row = np.unpackbits(self.bits[self.student_index[student]], count=len(self.criteria))
+        return [self.criteria[j] for j in np.flatnonzero(row)]
@@ -1,7 +1,14 @@
-import json
+import sys
+from pathlib import Path
 
-with open('E:/Projects/student-project-evaluator/outputs/criteria_graph_final.json', 'r') as f:
-    data = json.load(f)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from results_store import ResultsStore
+
+# Results store of the run to inspect (outputs/<WorkSubmissionsXX>/results.sqlite3 after organizing)
+RESULTS = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("outputs/results.sqlite3")
+
+with ResultsStore(RESULTS) as store:
+    data = store.criteria_graph()
 
 print(f"Total criteria: {len(data['criteria'])}\n")
 
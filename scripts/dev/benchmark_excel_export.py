@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark: in-memory vs streaming (write-only) Excel export
+Writes the sheets of evaluate_batch.create_excel_report that grow with the
+cohort - Grades, Student Details, and Criteria Distribution and Flagged
+Criteria with their per-criterion Students lists - the old way
+(openpyxl.Workbook with per-cell styling and full auto-size) and through
+excel_export.StreamingWorkbook. Wall time and peak Python memory are
+reported for each cohort size, so each writer's memory growth is measured
+rather than read off one cohort. The streaming writer still grows with the
+workbook's text: openpyxl keeps the shared-strings table until save().
+
+Usage:
+    python benchmark_excel_export.py [--students 2500 5000 10000] [--criteria 500]
+"""
+
+import sys
+import random
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import openpyxl
+from openpyxl.styles import Font, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
+
+from excel_export import StreamingWorkbook, grade_color_scale, highlight_rule
+
+HEADERS = ["Student ID", "Raw Score", "Max Possible", "Percentage", "Grade", "Rank", "Criteria Count"]
+CRITERIA_HEADERS = ["Criterion", "Count", "Weight", "Category", "Students"]
+FLAGGED_HEADERS = ["Criterion", "Count", "Weight", "Category", "Rarity Bonus", "Students"]
+CATEGORIES = ["Documentation", "Testing", "CodeQuality", "DevOps", "Planning", "Research", "Visuals"]
+
+# Criteria at or below this count are rare (flagged), as in evaluate_batch
+RARE_COUNT = 3
+
+
+def synthetic_cohort(n_students, n_criteria, seed=0):
+    """
+    (student rows, criteria graph) shaped like evaluate_batch's data
+    Most criteria are common; the last 5% are held by 1-3 students each, so
+    Flagged Criteria is never empty
+    """
+    rng = random.Random(seed)
+    criteria = [f"criterion_{j:04d}" for j in range(n_criteria)]
+    rare = criteria[n_criteria - max(1, n_criteria // 20):]
+    common = criteria[:len(criteria) - len(rare)] or criteria
+    ids = [f"{10000 + i}" for i in range(n_students)]
+
+    held = {student_id: set(rng.sample(common, rng.randint(min(5, len(common)), min(60, len(common)))))
+            for student_id in ids}
+    for criterion in rare:
+        for student_id in rng.sample(ids, min(n_students, rng.randint(1, RARE_COUNT))):
+            held[student_id].add(criterion)
+
+    graph = {criterion: {"count": 0, "students": [], "category": CATEGORIES[j % len(CATEGORIES)]}
+             for j, criterion in enumerate(criteria)}
+    students = []
+    for i, student_id in enumerate(ids):
+        for criterion in held[student_id]:
+            graph[criterion]["count"] += 1
+            graph[criterion]["students"].append(student_id)
+        grade = rng.uniform(40, 100)
+        students.append((student_id, round(grade * 0.8, 2), 80.0, round(grade * 0.9, 2),
+                         round(grade, 2), i + 1, len(held[student_id]), ", ".join(sorted(held[student_id]))))
+    for data in graph.values():
+        data["weight"] = 1 - data["count"] / n_students
+    return students, graph
+
+
+def criteria_rows(graph):
+    """Criteria Distribution rows, most common first"""
+    for criterion, data in sorted(graph.items(), key=lambda x: x[1]["count"], reverse=True):
+        yield [criterion, data["count"], round(data["weight"], 3), data["category"], ", ".join(data["students"])]
+
+
+def flagged_rows(graph):
+    """Flagged Criteria rows (rare criteria), rarest first"""
+    for criterion, data in sorted(graph.items(), key=lambda x: x[1]["count"]):
+        if data["count"] <= RARE_COUNT:
+            yield [criterion, data["count"], round(data["weight"], 3), data["category"], "Yes (+1)",
+                   ", ".join(data["students"])]
+
+
+def write_in_memory(cohort, path):
+    students, graph = cohort
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Grades"
+    ws.append(HEADERS)
+    thin = Side(style='thin')
+    for cell in ws[1]:
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    for row in students:
+        ws.append(list(row[:7]))
+
+    ws_details = wb.create_sheet("Student Details")
+    ws_details.append(["Student ID", "Rank", "Grade", "Criteria"])
+    for row in students:
+        ws_details.append([row[0], row[5], row[4], row[7]])
+
+    rare_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+    ws_criteria = wb.create_sheet("Criteria Distribution")
+    ws_criteria.append(CRITERIA_HEADERS)
+    for row in criteria_rows(graph):
+        ws_criteria.append(row)
+        if row[1] <= RARE_COUNT:
+            ws_criteria.cell(row=ws_criteria.max_row, column=2).fill = rare_fill
+
+    ws_flagged = wb.create_sheet("Flagged Criteria")
+    ws_flagged.append(FLAGGED_HEADERS)
+    for row in flagged_rows(graph):
+        ws_flagged.append(row)
+
+    for sheet in wb.worksheets:
+        for column in sheet.columns:
+            width = max(len(str(cell.value)) for cell in column)
+            sheet.column_dimensions[get_column_letter(column[0].column)].width = min(width + 2, 50)
+    wb.save(path)
+
+
+def write_streaming(cohort, path):
+    students, graph = cohort
+    wb = StreamingWorkbook()
+    wb.add_table("Grades", HEADERS, (list(row[:7]) for row in students),
+                 rules={"Grade": [grade_color_scale()]})
+    wb.add_table("Student Details", ["Student ID", "Rank", "Grade", "Criteria"],
+                 ([row[0], row[5], row[4], row[7]] for row in students))
+    wb.add_table("Criteria Distribution", CRITERIA_HEADERS, criteria_rows(graph),
+                 rules={"Count": [highlight_rule("lessThanOrEqual", RARE_COUNT)]})
+    wb.add_table("Flagged Criteria", FLAGGED_HEADERS, flagged_rows(graph))
+    wb.save(path)
+
+
+def measure(writer, cohort, path):
+    """(seconds, peak traced MB, file MB) of one writer run"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    writer(cohort, path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, path.stat().st_size / 1e6
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare in-memory and streaming Excel export")
+    parser.add_argument("--students", type=int, nargs="+", default=[2500, 5000, 10000],
+                        help="Cohort sizes to measure (default: 2500 5000 10000)")
+    parser.add_argument("--criteria", type=int, default=500, help="Distinct criteria (default: 500)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    writers = [("in-memory", write_in_memory), ("streaming", write_streaming)]
+    peaks = {label: [] for label, _ in writers}
+
+    print(f"{'Students':>9}  {'Writer':<10} {'Seconds':>8}  {'Peak MB':>8}  {'File MB':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_students in args.students:
+            cohort = synthetic_cohort(n_students, args.criteria)
+            for label, writer in writers:
+                seconds, peak, size = measure(writer, cohort, Path(tmp) / f"{label}.xlsx")
+                peaks[label].append(peak)
+                print(f"{n_students:>9}  {label:<10} {seconds:8.2f}  {peak:8.1f}  {size:7.1f}", flush=True)
+
+    if len(args.students) > 1:
+        print(f"\nPeak memory growth from {args.students[0]} to {args.students[-1]} students "
+              f"(x{args.students[-1] / args.students[0]:g} cohort, {args.criteria} criteria):")
+        for label, values in peaks.items():
+            print(f"  {label:<10} {values[0]:8.1f} -> {values[-1]:8.1f} MB (x{values[-1] / values[0]:.2f})")
+
+
+if __name__ == "__main__":
+    main()
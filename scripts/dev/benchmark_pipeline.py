@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark: evaluation pipeline stages against the PRD targets
+Generates a synthetic cohort (synthetic_cohort.py), or takes an existing
+WorkSubmissions folder, and times each step of run_evaluation.main, the
+grades workbook writer and the student report generator. Results are
+written as JSON; with --baseline a previous result file is compared stage
+by stage and slower stages are reported as regressions (exit code 1).
+
+PRD targets: < 30 s per student, < 20 min for 35 students, 50+ markdown
+files per project. The 35-student figure is projected linearly from the
+measured per-student time when the cohort has a different size.
+
+Usage:
+    python benchmark_pipeline.py --students 35 --md-files 50 --json bench.json
+    python benchmark_pipeline.py --baseline bench.json --json bench_new.json
+    python benchmark_pipeline.py --cohort tests/WorkSubmissions05 --workers 8
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import run_evaluation
+import generate_student_reports
+from results_store import grades_by_student, results_path, save_results
+from synthetic_cohort import add_cohort_arguments, cohort_options, generate_cohort
+
+RESULT_VERSION = 1
+
+TARGETS = {
+    "per_student_seconds": 30,
+    "cohort_35_seconds": 20 * 60,
+    "md_files_per_project": 50,
+}
+
+# Stages faster than this are too noisy to call regressions
+MIN_REGRESSION_SECONDS = 0.05
+
+
+class StageTimer:
+    """Wall time of named stages, in the order they ran; output is captured unless verbose"""
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        output = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with output:
+            yield
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+
+def reset_extraction_cache(db_path):
+    """Point run_evaluation at db_path; workers (and this process) reopen their cache"""
+    if run_evaluation._extraction_cache is not None:
+        run_evaluation._extraction_cache.close()
+    run_evaluation._extraction_cache = None
+    run_evaluation.EXTRACTION_CACHE_DB = db_path
+
+
+def run_once(cohort, output_dir, cache_db, args):
+    """One timed pass over cohort; returns {stage: seconds}"""
+    timer = StageTimer(args.verbose)
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+
+    # Cold discovery fills a fresh cache (one left by an earlier --keep run is
+    # removed); the warm pass reads it back
+    reset_extraction_cache(cache_db)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{cache_db}{suffix}").unlink(missing_ok=True)
+    with timer.stage("discover"):
+        student_criteria = run_evaluation.discover_cohorts([cohort], args.workers)[cohort]
+    if args.warm:
+        reset_extraction_cache(cache_db)
+        with timer.stage("discover_warm"):
+            run_evaluation.discover_cohorts([cohort], args.workers)
+    reset_extraction_cache(run_evaluation.CACHE_DB)
+
+    with timer.stage("build_graph"):
+        criteria_graph = run_evaluation.build_criteria_graph(student_criteria, cohort)
+    with timer.stage("categorize"):
+        category_counts = run_evaluation.count_categories(criteria_graph)
+    with timer.stage("assignment_profile"):
+        assignment_type = run_evaluation.detect_assignment_type(cohort)
+        if assignment_type:
+            criteria_graph = run_evaluation.apply_assignment_profile(criteria_graph, assignment_type)
+    with timer.stage("grade"):
+        grades = run_evaluation.calculate_grades(criteria_graph, student_criteria)
+
+    # The writers alone, then Step 10 as run_evaluation.main runs it
+    scratch = output_dir / "scratch"
+    scratch.mkdir(parents=True)
+    with timer.stage("results_store"):
+        save_results(results_path(scratch), criteria_graph, student_criteria, grades)
+    with timer.stage("grades_workbook"):
+        run_evaluation.write_grades_workbook(scratch / "grades.xlsx", grades)
+    with timer.stage("write_outputs"):
+        run_evaluation.write_outputs(output_dir, criteria_graph, student_criteria, grades, cohort,
+                                     assignment_type, category_counts)
+
+    if args.reports != "none":
+        report_args = [cohort.name, "--jobs", str(args.jobs), "--force"]
+        if args.reports == "bundle":
+            report_args.append("--bundle")
+        with timer.stage("reports"):
+            generate_student_reports.generate_reports(
+                generate_student_reports.parse_args(report_args), criteria_graph,
+                grades_by_student(grades), student_criteria, output_dir / "student_reports")
+    return timer.seconds
+
+
+def summarize(runs):
+    """{stage: {"seconds": best, "runs": [...]}} over repeated runs"""
+    return {stage: {"seconds": round(min(run[stage] for run in runs), 4),
+                    "runs": [round(run[stage], 4) for run in runs]}
+            for stage in runs[0]}
+
+
+def check_targets(stages, students, md_files_per_project):
+    # Per student: everything a grading run does, excluding side benchmarks
+    side = ("discover_warm", "results_store", "grades_workbook")
+    total = sum(s["seconds"] for name, s in stages.items() if name not in side)
+    per_student = total / max(1, students)
+    values = {
+        "per_student_seconds": per_student,
+        "cohort_35_seconds": total if students == 35 else per_student * 35,
+        "md_files_per_project": md_files_per_project,
+    }
+    targets = {}
+    for name, limit in TARGETS.items():
+        value = values[name]
+        ok = value >= limit if name == "md_files_per_project" else value < limit
+        targets[name] = {"value": round(value, 3), "target": limit, "ok": ok}
+    return total, targets
+
+
+def compare_baseline(stages, baseline, tolerance):
+    """Stages slower than the baseline by more than tolerance (a fraction)"""
+    regressions = []
+    for name, stage in stages.items():
+        before = baseline.get("stages", {}).get(name, {}).get("seconds")
+        if before is None:
+            continue
+        now = stage["seconds"]
+        if now > before * (1 + tolerance) and now - before > MIN_REGRESSION_SECONDS:
+            regressions.append({"stage": name, "baseline": before, "seconds": now,
+                                "change": round(now / before - 1, 3) if before else None})
+    return regressions
+
+
+def md_files_per_project(cohort):
+    counts = [sum(1 for _ in run_evaluation.find_markdown_files(folder))
+              for folder in run_evaluation.find_student_folders(cohort)]
+    return min(counts) if counts else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time the evaluation pipeline stage by stage")
+    parser.add_argument("--cohort", help="Benchmark this WorkSubmissions folder instead of a synthetic one")
+    add_cohort_arguments(parser)
+    parser.add_argument("--workers", type=int, default=1, help="Processes for per-student discovery")
+    parser.add_argument("--jobs", type=int, default=1, help="Processes for PDF conversion")
+    parser.add_argument("--reports", choices=("individual", "bundle", "none"), default="individual",
+                        help="Student report mode to time (default: individual)")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs; the fastest counts (default: 1)")
+    parser.add_argument("--no-warm", dest="warm", action="store_false",
+                        help="Skip the second discovery pass against a warm extraction cache")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Earlier --json results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Slowdown over the baseline reported as a regression (default: 0.2 = 20%%)")
+    parser.add_argument("--keep", help="Keep the synthetic cohort and outputs in this folder")
+    parser.add_argument("--verbose", action="store_true", help="Show the stages' own output")
+    args = parser.parse_args(argv)
+    args.workers = max(1, args.workers)
+    args.repeat = max(1, args.repeat)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(args.keep or tmp)
+        work.mkdir(parents=True, exist_ok=True)
+        if args.cohort:
+            cohort = Path(args.cohort)
+            cohort_info = {"folder": str(cohort), "students": len(run_evaluation.find_student_folders(cohort))}
+            generate_seconds = None
+        else:
+            cohort = work / "WorkSubmissionsBench"
+            if cohort.exists():
+                shutil.rmtree(cohort)
+            start = time.perf_counter()
+            cohort_info = generate_cohort(cohort, **cohort_options(args))
+            generate_seconds = time.perf_counter() - start
+        md_per_project = md_files_per_project(cohort)
+        print(f"Cohort: {cohort} ({cohort_info['students']} students, >= {md_per_project} markdown files each)")
+
+        runs = []
+        for i in range(args.repeat):
+            seconds = run_once(cohort, work / "outputs" / cohort.name, work / f"extraction_{i}.sqlite3", args)
+            runs.append(seconds)
+            print(f"  run {i + 1}/{args.repeat}: {sum(seconds.values()):.2f}s", flush=True)
+
+    stages = summarize(runs)
+    total, targets = check_targets(stages, cohort_info["students"], md_per_project)
+    regressions = compare_baseline(stages, baseline, args.tolerance) if baseline else []
+
+    print(f"\n{'Stage':<20} {'Seconds':>9}" + (f" {'Baseline':>9}" if baseline else ""))
+    for name, stage in stages.items():
+        line = f"{name:<20} {stage['seconds']:>9.3f}"
+        if baseline:
+            before = baseline.get("stages", {}).get(name, {}).get("seconds")
+            line += f" {before:>9.3f}" if before is not None else f" {'-':>9}"
+        print(line)
+    print(f"{'total':<20} {total:>9.3f}")
+
+    print("\nPRD targets:")
+    for name, target in targets.items():
+        print(f"  [{'OK' if target['ok'] else 'MISS'}] {name}: {target['value']} (target {target['target']})")
+    for regression in regressions:
+        change = f" (+{regression['change']:.0%})" if regression['change'] is not None else ""
+        print(f"  [REGRESSION] {regression['stage']}: {regression['baseline']:.3f}s -> "
+              f"{regression['seconds']:.3f}s{change}")
+
+    if args.json:
+        result = {
+            "version": RESULT_VERSION,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "options": {k: v for k, v in vars(args).items() if k not in ("json", "baseline", "keep", "verbose")},
+            "cohort": dict(cohort_info, md_files_per_project=md_per_project, generate_seconds=generate_seconds),
+            "stages": stages,
+            "total_seconds": round(total, 4),
+            "targets": targets,
+            "regressions": regressions,
+        }
+        Path(args.json).write_text(json.dumps(result, indent=2), encoding='utf-8')
+        print(f"\nResults saved to {args.json}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
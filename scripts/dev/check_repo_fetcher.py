@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+End-to-end check of repo_fetcher.py against local bare repositories
+
+Builds a throwaway "GitHub" of bare repos (several commits, markdown, config
+files, source code and a vendored node_modules tree) plus a cohort whose
+submission_info.xlsx files point at them, then checks that fetching is
+shallow and sparse, that failures are recorded, and that a second run
+resumes instead of re-cloning.
+
+Usage:
+    python check_repo_fetcher.py [--students 12] [--workers 4]
+"""
+
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import repo_fetcher
+
+FILES = {
+    "README.md": "# Project\n",
+    "docs/PRD.md": "# PRD\n",
+    "pyproject.toml": "[tool.ruff]\n",
+    ".pre-commit-config.yaml": "repos: []\n",
+    ".github/workflows/ci.yml": "on: push\n",
+    "src/app.py": "print('hi')\n" * 1000,
+    "data/big.bin": "x" * 500_000,
+    "node_modules/pkg/README.md": "# vendored\n",
+}
+EXPECTED = {"README.md", "docs/PRD.md", "pyproject.toml", ".pre-commit-config.yaml", ".github/workflows/ci.yml"}
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def make_bare_repo(mirror, owner, repo, work):
+    src = work / f"{owner}-{repo}"
+    src.mkdir()
+    git("init", "-q", "-b", "main", cwd=src)
+    for i in range(3):
+        for name, content in FILES.items():
+            path = src / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"{content}{i}\n")
+        git("add", "-A", cwd=src)
+        git("-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", f"commit {i}", cwd=src)
+    bare = mirror / owner / f"{repo}.git"
+    bare.parent.mkdir(parents=True, exist_ok=True)
+    git("clone", "-q", "--bare", str(src), str(bare))
+    git("config", "uploadpack.allowFilter", "true", cwd=bare)
+
+
+def write_submission_info(folder, github):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Field", "Value"])
+    ws.append(["GitHub Repository", github])
+    wb.save(folder / repo_fetcher.SUBMISSION_INFO)
+
+
+def checked_out(repo_dir):
+    return {str(p.relative_to(repo_dir)).replace("\\", "/") for p in repo_dir.rglob("*")
+            if p.is_file() and ".git" not in p.relative_to(repo_dir).parts[:1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(condition, message):
+        print(f"  [{'OK' if condition else 'FAIL'}] {message}")
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        mirror, work, cohort = tmp / "mirror", tmp / "work", tmp / "cohort"
+        for d in (mirror, work, cohort):
+            d.mkdir()
+
+        for i in range(args.students):
+            folder = cohort / f"Participant_{1000 + i}_assignsubmission_file"
+            folder.mkdir()
+            if i == 0:
+                # Repository that does not exist
+                write_submission_info(folder, "https://github.com/team0/missing")
+                continue
+            make_bare_repo(mirror, f"team{i}", f"hw{i}", work)
+            write_submission_info(folder, f"https://github.com/team{i}/hw{i}/tree/main")
+        (cohort / f"Participant_{1000 + args.students}_assignsubmission_file").mkdir()  # no URL
+        base = mirror.as_uri()
+
+        print("First run")
+        fetched, skipped = repo_fetcher.fetch_cohort(cohort, args.workers, base, retries=1, backoff=0.01)
+        done = [n for n, e in fetched.items() if e["status"] == "done"]
+        check(len(done) == args.students - 1, f"{len(done)} of {args.students - 1} repositories fetched")
+        missing = fetched.get("Participant_1000_assignsubmission_file", {})
+        check(missing.get("status") == "failed" and missing.get("permanent"),
+              "missing repository recorded as a permanent failure")
+        check(missing.get("attempts") == 1, "permanent failure not retried")
+        check(list(skipped.values()) == ["no GitHub URL"], "participant without a URL skipped")
+
+        repo_dir = cohort / "Participant_1001_assignsubmission_file" / "hw1"
+        check(checked_out(repo_dir) == EXPECTED,
+              f"sparse checkout holds only markdown and config files ({sorted(checked_out(repo_dir))})")
+        commits = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=repo_dir,
+                                 capture_output=True, text=True).stdout.strip()
+        check(commits == "1", f"shallow history ({commits} commit)")
+        missing_blobs = subprocess.run(["git", "rev-list", "--objects", "--missing=print", "HEAD"],
+                                       cwd=repo_dir, capture_output=True, text=True).stdout.count("\n?")
+        check(missing_blobs >= 2, f"blobs outside the sparse set not downloaded ({missing_blobs} missing)")
+        check(not list(cohort.rglob("*.partial")), "no partial clones left behind")
+
+        state = json.loads((cohort / repo_fetcher.STATE_FILE).read_text())["repos"]
+        check(len(state) == args.students, "state file records every attempted repository")
+
+        print("Resumed run")
+        # Simulate an interruption: one clone never recorded, another removed
+        del state["Participant_1002_assignsubmission_file"]
+        repo_fetcher.save_state(cohort, state)
+        shutil.rmtree(cohort / "Participant_1003_assignsubmission_file" / "hw3")
+        fetched, skipped = repo_fetcher.fetch_cohort(cohort, args.workers, base, retries=1, backoff=0.01)
+        check(sorted(fetched) == ["Participant_1003_assignsubmission_file"],
+              f"only the removed clone is fetched again ({sorted(fetched)})")
+        check(skipped.get("Participant_1002_assignsubmission_file") == "already exists",
+              "existing clone missing from the state file is kept")
+        check(skipped.get("Participant_1000_assignsubmission_file", "").startswith("failed earlier"),
+              "permanent failure not retried on resume")
+
+    print(f"\n{'PASSED' if not failures else f'FAILED ({len(failures)} checks)'}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Check: rule pack cost on adversarial markdown
+Loads every pack in scripts/rules (which rejects exponential backtracking
+shapes), lists the rules flagged as quadratic, then extracts a set of
+long-line documents - a minified table, an inline base64 image, a line of
+repeated negative words - with per-rule accounting and a per-document
+timeout. Rules whose slowest evaluation is over the budget, and documents
+that time out, are failures (exit code 1).
+
+Usage:
+    python check_rule_packs.py [--budget-ms 100] [--timeout 5] [--size-kb 64]
+"""
+
+import sys
+import time
+import base64
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from extraction_engine import (RULES_DIR, RulePackError, RuleTimeout, format_rule_stats, load_rule_pack,
+                               merge_rule_stats, over_budget)
+
+
+def adversarial_documents(size):
+    """{filename: text} of about size characters each, mostly on one line"""
+    cells = "| " + " | ".join(f"cell{i} coverage {i % 100}%" for i in range(size // 20)) + " |"
+    image = base64.b64encode(bytes(range(256)) * (size // 340 + 1)).decode()[:size]
+    return {
+        "README.md": "# Results\n\n" + "| a | b |\n|---|---|\n" + cells + "\n",
+        "IMAGE.md": f"# Coverage\n\n![coverage report](data:image/png;base64,{image})\n",
+        "NEGATIVE.md": "# Notes\n\n" + "no " * (size // 3) + "\n",
+        "HEADERS.md": "".join(f"## {'x' * 200} {i}\n" for i in range(size // 210)),
+        "SPACES.md": "- " + " " * size + "x\n",
+    }
+
+
+def check_pack(path, documents, budget, timeout):
+    """(rule stats, [timeout messages]) for one pack over documents"""
+    rules = load_rule_pack(path)
+    rules.configure(document_timeout=timeout, accounting=True)
+    stats, timeouts = {}, []
+    try:
+        for filename, text in documents.items():
+            start = time.perf_counter()
+            try:
+                rules.extract(text, filename)
+            except RuleTimeout as e:
+                timeouts.append(str(e))
+            print(f"    {filename:<12} {time.perf_counter() - start:8.3f}s")
+        merge_rule_stats(stats, rules.take_rule_stats())
+    finally:
+        rules.configure()
+    return stats, timeouts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check rule packs for slow rules on adversarial markdown")
+    parser.add_argument("packs", nargs="*", help="Rule pack names or paths (default: all in scripts/rules)")
+    parser.add_argument("--budget-ms", type=float, default=100,
+                        help="Slowest single rule evaluation allowed, in ms (default: 100)")
+    parser.add_argument("--timeout", type=float, default=5, help="Per-document timeout in seconds (default: 5)")
+    parser.add_argument("--size-kb", type=float, default=64, help="Adversarial document size in KB (default: 64)")
+    parser.add_argument("--top", type=int, default=5, help="Costliest rules listed per pack (default: 5)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    packs = args.packs or sorted(p.stem for p in RULES_DIR.glob("*.json"))
+    documents = adversarial_documents(int(args.size_kb * 1024))
+    budget = args.budget_ms / 1000
+    failures = 0
+
+    for pack in packs:
+        print(f"\n{pack}")
+        try:
+            rules = load_rule_pack(pack)
+        except RulePackError as e:
+            print(f"  [FAIL] {e}")
+            failures += 1
+            continue
+        for risky in rules.risky_rules:
+            print(f"  [RISK] {risky['rule']} {risky['pattern']!r}: {risky['risk']}")
+
+        stats, timeouts = check_pack(pack, documents, budget, args.timeout)
+        for line in format_rule_stats(stats, budget, args.top):
+            print(f"  {line}")
+        for message in timeouts:
+            print(f"  [FAIL] {message}")
+        failures += len(timeouts) + len(over_budget(stats, budget))
+
+    print(f"\n{'OK' if not failures else f'{failures} failure(s)'}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,17 @@
 """
 Sample Student Report - Shows criteria for selected students
 """
-import json
+import sys
+from pathlib import Path
 
-with open('E:/Projects/student-project-evaluator/outputs/criteria_graph_final.json', 'r') as f:
-    data = json.load(f)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from results_store import ResultsStore
+
+# Results store of the run to inspect (outputs/<WorkSubmissionsXX>/results.sqlite3 after organizing)
+RESULTS = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("outputs/results.sqlite3")
+
+with ResultsStore(RESULTS) as store:
+    data = store.criteria_graph()
 
 # Sample students with different performance levels
 sample_students = ['38954', '38953', '38960', '38979', '38957', '38966']
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Synthetic cohort generator
+Writes a WorkSubmissions-style folder of Participant_* trees for benchmarks.
+Markdown text is built from the run_evaluation rule pack's own keywords, so
+every extraction stage has work to do; knobs set the scale (students, files
+per student, file size), vendored trees the walker must skip, the share of
+Hebrew lines and how often a keyword sits in a negative context
+("TODO: add docker"). The same seed always writes the same cohort.
+
+Usage:
+    python synthetic_cohort.py /tmp/WorkSubmissionsBench --students 35 --md-files 50
+"""
+
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from extraction_engine import RULES_DIR
+
+RULE_PACK = RULES_DIR / "run_evaluation.json"
+
+# Directories submission_walker.EXCLUDED_DIRS skips; vendored trees go here
+VENDOR_DIRS = ["node_modules", "venv", "dist", "build", "vendor", ".venv", "site-packages", "target"]
+
+# Names matched by the pack's filename stage, mixed in with generic ones
+DOC_NAMES = ["README.md", "PRD.md", "TESTING.md", "CONTRIBUTING.md", "ARCHITECTURE.md",
+             "CHANGELOG.md", "API.md", "ROADMAP.md"]
+
+HEBREW = [
+    "הפרויקט כולל", "במסגרת העבודה הוספנו", "המערכת תומכת ב", "בחרנו להשתמש ב",
+    "תיעוד מלא של", "הגדרנו דרישות עבור", "ביצענו בדיקות של", "ארכיטקטורת המערכת מבוססת על",
+]
+ENGLISH = [
+    "The project includes", "We added", "The system supports", "We chose to use",
+    "Full documentation of", "Requirements were defined for", "We ran checks with", "The design relies on",
+]
+FILLER = [
+    "the main workflow of the application", "handling user input and errors",
+    "the data model and its validation", "results shown in the dashboard",
+    "configuration loaded from environment variables", "logging for every request",
+]
+HEBREW_FILLER = ["זרימת העבודה הראשית", "טיפול בקלט ובשגיאות", "מודל הנתונים", "הצגת התוצאות למשתמש"]
+
+CODE_FILES = {
+    "pyproject.toml": "[project]\nname = \"app\"\n\n[tool.ruff]\nline-length = 100\n\n[tool.pytest.ini_options]\naddopts = \"--cov\"\n",
+    ".pre-commit-config.yaml": "repos:\n  - repo: https://github.com/astral-sh/ruff-pre-commit\n",
+    ".github/workflows/ci.yml": "on: push\njobs:\n  test:\n    runs-on: ubuntu-latest\n    steps:\n      - run: pytest\n",
+    "Dockerfile": "FROM python:3.12-slim\nCOPY . /app\nRUN pip install -e /app\n",
+    "requirements.txt": "requests\npytest\npytest-cov\n",
+}
+
+
+def load_vocabulary(rule_pack=RULE_PACK):
+    """(keywords, negative keywords) taken from a rule pack"""
+    with open(rule_pack, encoding='utf-8') as f:
+        pack = json.load(f)
+
+    keywords = set()
+    for stage in pack["stages"]:
+        for rule in stage.get("rules", []):
+            if isinstance(rule, dict):
+                keywords.update(rule.get("all", []))
+                keywords.update(rule.get("any", []))
+    for words in pack.get("categories", {}).values():
+        keywords.update(words)
+
+    negative = pack.get("negative", {})
+    negatives = negative.get("keywords") if negative.get("type") == "substring" else None
+    return sorted(k for k in keywords if k.strip()), negatives or ["todo:", "future work", "not yet implemented"]
+
+
+def markdown_text(rng, size, keywords, negatives, hebrew, negative):
+    """About size bytes of markdown; each line names a keyword"""
+    lines = [f"# {rng.choice(FILLER).capitalize()}", ""]
+    written = 0
+    while written < size:
+        keyword = rng.choice(keywords)
+        if rng.random() < 0.08:
+            line = f"## {keyword.title()}"
+        elif rng.random() < hebrew:
+            line = f"{rng.choice(HEBREW)} {keyword} - {rng.choice(HEBREW_FILLER)}."
+        else:
+            line = f"{rng.choice(ENGLISH)} {keyword} for {rng.choice(FILLER)}."
+        if rng.random() < negative:
+            line = f"{rng.choice(negatives).capitalize()} {line.lstrip('# ')}"
+        if rng.random() < 0.3:
+            line = f"- {line}"
+        lines.append(line)
+        written += len(line.encode('utf-8')) + 1
+    return "\n".join(lines) + "\n"
+
+
+def generate_cohort(root, students=35, md_files=50, file_kb=8.0, vendor_dirs=2, vendor_files=20,
+                    code_files=10, hebrew=0.3, negative=0.1, seed=0, rule_pack=RULE_PACK):
+    """
+    Write students Participant_* folders under root
+
+    Each student gets md_files markdown files of about file_kb KB (sizes vary
+    +-50%) spread over docs/ folders, code_files Python modules plus common
+    config files, and vendor_dirs vendored trees of vendor_files files each.
+    hebrew and negative are the shares of lines written in Hebrew and with a
+    negative-context marker. Returns counts of what was written.
+    """
+    rng = random.Random(seed)
+    keywords, negatives = load_vocabulary(rule_pack)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    stats = {"students": students, "md_files": 0, "md_bytes": 0, "code_files": 0, "vendor_files": 0}
+
+    for i in range(students):
+        project = root / f"Participant_{10000 + i}_assignsubmission_file" / f"project{i}"
+        for j in range(md_files):
+            if j < len(DOC_NAMES):
+                path = project / ("docs" if j else ".") / DOC_NAMES[j]
+            else:
+                path = project / "docs" / f"section{j % 5}" / f"notes_{j:03d}.md"
+            text = markdown_text(rng, int(file_kb * 1024 * rng.uniform(0.5, 1.5)),
+                                 keywords, negatives, hebrew, negative)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding='utf-8')
+            stats["md_files"] += 1
+            stats["md_bytes"] += path.stat().st_size
+
+        for name, content in CODE_FILES.items():
+            path = project / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding='utf-8')
+        for j in range(code_files):
+            folder = "tests" if j % 3 == 0 else "src"
+            prefix = "test_" if folder == "tests" else ""
+            path = project / folder / f"{prefix}module_{j}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f'"""Module {j}"""\nimport logging\n\n\ndef {prefix}run_{j}(value: int) -> int:\n'
+                            f'    logging.info("run %s", value)\n    return value * {j}\n', encoding='utf-8')
+        stats["code_files"] += len(CODE_FILES) + code_files
+
+        for name in rng.sample(VENDOR_DIRS, min(vendor_dirs, len(VENDOR_DIRS))):
+            for j in range(vendor_files):
+                path = project / name / f"pkg{j % 7}" / (f"README_{j}.md" if j % 2 else f"mod_{j}.py")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                text = (markdown_text(rng, 2048, keywords, negatives, 0, 0) if j % 2
+                        else f"def vendored_{j}():\n    return {j}\n" * 50)
+                path.write_text(text, encoding='utf-8')
+                stats["vendor_files"] += 1
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic cohort of Participant_* folders")
+    parser.add_argument("folder", help="Folder to create (e.g. /tmp/WorkSubmissionsBench)")
+    add_cohort_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def add_cohort_arguments(parser):
+    """generate_cohort() options, shared with the benchmarks"""
+    parser.add_argument("--students", type=int, default=35, help="Participant folders (default: 35)")
+    parser.add_argument("--md-files", type=int, default=50, help="Markdown files per student (default: 50)")
+    parser.add_argument("--file-kb", type=float, default=8.0, help="Average markdown file size in KB (default: 8)")
+    parser.add_argument("--vendor-dirs", type=int, default=2,
+                        help="Vendored trees (node_modules, venv, ...) per student (default: 2)")
+    parser.add_argument("--vendor-files", type=int, default=20, help="Files in each vendored tree (default: 20)")
+    parser.add_argument("--code-files", type=int, default=10, help="Python modules per student (default: 10)")
+    parser.add_argument("--hebrew", type=float, default=0.3, help="Share of Hebrew lines, 0-1 (default: 0.3)")
+    parser.add_argument("--negative", type=float, default=0.1,
+                        help="Share of lines with a negative-context marker, 0-1 (default: 0.1)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+
+
+def cohort_options(args):
+    """generate_cohort() keyword arguments from parsed add_cohort_arguments() options"""
+    return {"students": args.students, "md_files": args.md_files, "file_kb": args.file_kb,
+            "vendor_dirs": args.vendor_dirs, "vendor_files": args.vendor_files, "code_files": args.code_files,
+            "hebrew": args.hebrew, "negative": args.negative, "seed": args.seed}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if Path(args.folder).exists() and any(Path(args.folder).iterdir()):
+        print(f"Error: {args.folder} is not empty")
+        return 1
+    stats = generate_cohort(args.folder, **cohort_options(args))
+    print(f"Wrote {stats['students']} students to {args.folder}: {stats['md_files']} markdown files "
+          f"({stats['md_bytes'] / 1e6:.1f} MB), {stats['code_files']} code/config files, "
+          f"{stats['vendor_files']} vendored files")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
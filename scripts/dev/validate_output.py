@@ -1,24 +1,27 @@
 #!/usr/bin/env python3
 """
-Validation script for criteria_graph_final.json
+Validation script for an evaluation run's results store
 Ensures data integrity and completeness
 """
 
-import json
+import sys
 from pathlib import Path
 
-def validate_criteria_graph():
-    """Validate the criteria graph JSON file"""
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from results_store import ResultsStore
 
-    output_file = Path("E:/Projects/student-project-evaluator/outputs/criteria_graph_final.json")
+def validate_criteria_graph(output_file=Path("outputs/results.sqlite3")):
+    """Validate the criteria graph and per-student counts held in the results store"""
 
     print("="*80)
-    print("VALIDATION REPORT: criteria_graph_final.json")
+    print(f"VALIDATION REPORT: {output_file.name}")
     print("="*80)
 
-    # Load the file
-    with open(output_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Load the run
+    with ResultsStore(output_file) as store:
+        data = store.criteria_graph()
+        grades = store.grades()
+        student_criteria = store.student_criteria()
 
     # Validate structure
     print("\n1. STRUCTURE VALIDATION")
@@ -67,6 +70,12 @@ def validate_criteria_graph():
     print(f"✓ All {len(criteria)} criteria have valid structure")
     print(f"✓ All student counts and weights are consistent")
 
+    # Stored per-student criteria counts must match the membership table
+    for student, row in grades.items():
+        assert row['criteria_count'] == len(student_criteria[student]), \
+            f"Criteria count mismatch for {student}: {row['criteria_count']} vs {len(student_criteria[student])}"
+    print(f"✓ Per-student criteria counts match membership for {len(grades)} students")
+
     # Validate student IDs
     print("\n4. STUDENT ID VALIDATION")
     print("-" * 80)
@@ -147,7 +156,7 @@ def validate_criteria_graph():
 
 if __name__ == "__main__":
     try:
-        validate_criteria_graph()
+        validate_criteria_graph(Path(sys.argv[1]) if len(sys.argv) > 1 else Path("outputs/results.sqlite3"))
         print("\n✓ Validation completed successfully!")
     except AssertionError as e:
         print(f"\n✗ Validation failed: {e}")
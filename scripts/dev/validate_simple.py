@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
-import json
+import sys
 from pathlib import Path
 
-output_file = Path("E:/Projects/student-project-evaluator/outputs/criteria_graph_final.json")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from results_store import ResultsStore
+
+output_file = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("outputs/results.sqlite3")
 
 print("="*80)
-print("VALIDATION REPORT: criteria_graph_final.json")
+print(f"VALIDATION REPORT: {output_file.name}")
 print("="*80)
 
-with open(output_file, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+with ResultsStore(output_file) as store:
+    data = store.criteria_graph()
 
 # Validate structure
 print("\n1. STRUCTURE VALIDATION")
@@ -1,11 +1,18 @@
-import json
+import sys
+from pathlib import Path
 
-with open('E:/Projects/student-project-evaluator/outputs/criteria_graph_final.json', 'r') as f:
-    data = json.load(f)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from results_store import ResultsStore
+
+# Results store of the run to inspect (outputs/<WorkSubmissionsXX>/results.sqlite3 after organizing)
+RESULTS = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("outputs/results.sqlite3")
+
+with ResultsStore(RESULTS) as store:
+    data = store.criteria_graph()
+    student_id = '38953'
+    criteria_for_student = store.criteria_of(student_id)
 
-student_id = '38953'
 print(f'Student {student_id} has these criteria:')
-criteria_for_student = [k for k, v in data['criteria'].items() if student_id in v['students']]
 print(f'Total: {len(criteria_for_student)} criteria\n')
 
 print('All criteria for this student:')
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Streaming Excel export
+Writes grade workbooks with openpyxl's write-only worksheets: rows are
+streamed to disk as they are appended, header/title looks are shared named
+styles, and highlighting is done with conditional-format rules instead of
+styling cells one by one. Memory stays flat as sheets grow.
+"""
+
+from itertools import islice
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule, ColorScaleRule
+from openpyxl.styles import Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+# Column widths are fitted to the header and this many leading rows
+WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 50
+
+_THIN = Side(style='thin')
+
+
+def grade_color_scale():
+    """Red -> yellow -> green over a grade column"""
+    return ColorScaleRule(start_type='min', start_color='F8696B',
+                          mid_type='percentile', mid_value=50, mid_color='FFEB84',
+                          end_type='max', end_color='63BE7B')
+
+
+def highlight_rule(operator, value, color="FFC7CE"):
+    """Fill cells matching e.g. ("lessThanOrEqual", 3) or ("equal", '"X"')"""
+    return CellIsRule(operator=operator, formula=[str(value)],
+                      fill=PatternFill(fill_type="solid", start_color=color, end_color=color))
+
+
+class StreamingWorkbook:
+    """
+    Write-only workbook with shared "header" and "title" named styles.
+
+    Sheets must be written one after another: add_table() consumes its rows
+    iterator completely before returning.
+    """
+
+    def __init__(self, header_color="4472C4", header_border=True):
+        self.wb = openpyxl.Workbook(write_only=True)
+
+        header = NamedStyle(name="header")
+        header.font = Font(bold=True, color="FFFFFF")
+        header.fill = PatternFill(fill_type="solid", start_color=header_color, end_color=header_color)
+        if header_border:
+            header.border = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+        self.wb.add_named_style(header)
+
+        title = NamedStyle(name="title")
+        title.font = Font(size=16, bold=True)
+        self.wb.add_named_style(title)
+
+    def _cell(self, ws, value, style):
+        cell = WriteOnlyCell(ws, value)
+        cell.style = style
+        return cell
+
+    def add_table(self, title, headers, rows, autosize=True, rules=None):
+        """
+        Stream a header row plus rows into a new sheet
+        rules maps a header name to conditional-format rules for that column's data cells.
+        Returns the number of data rows written.
+        """
+        ws = self.wb.create_sheet(title)
+        rows = iter(rows)
+
+        # Widths must be set before the first row is written
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS)) if autosize else []
+        if autosize:
+            for col, header in enumerate(headers, 1):
+                longest = max([len(str(header))] + [len(str(row[col - 1])) for row in sample if col <= len(row)])
+                ws.column_dimensions[get_column_letter(col)].width = min(longest + 2, MAX_COLUMN_WIDTH)
+
+        ws.append([self._cell(ws, header, "header") for header in headers])
+        count = 0
+        for row in sample:
+            ws.append(row)
+            count += 1
+        for row in rows:
+            ws.append(row)
+            count += 1
+
+        for header, column_rules in (rules or {}).items() if count else ():
+            letter = get_column_letter(list(headers).index(header) + 1)
+            for rule in column_rules:
+                ws.conditional_formatting.add(f"{letter}2:{letter}{count + 1}", rule)
+        return count
+
+    def add_rows(self, title, rows, title_row=True, merge_title=None):
+        """
+        Write a small free-form sheet (e.g. a summary), columns fitted to its contents
+        The first row uses the "title" style when title_row is set; merge_title
+        is a range such as "A1:E1".
+        """
+        ws = self.wb.create_sheet(title)
+        rows = [list(row) for row in rows]
+        for col in range(1, max((len(row) for row in rows), default=0) + 1):
+            longest = max(len(str(row[col - 1])) for row in rows if col <= len(row))
+            ws.column_dimensions[get_column_letter(col)].width = min(longest + 2, MAX_COLUMN_WIDTH)
+        for i, row in enumerate(rows):
+            if i == 0 and title_row:
+                row = [self._cell(ws, row[0], "title")] + row[1:]
+            ws.append(row)
+        if merge_title:
+            ws.merged_cells.add(merge_title)
+        return ws
+
+    def save(self, path):
+        self.wb.save(path)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Content-addressed extraction cache
+Remembers which criteria a markdown file produced so re-runs only extract
+new or modified files
+
+Entries live in a SQLite database under outputs/.cache/ and are keyed by
+the file's content hash, its filename (filename rules depend on it) and the
+rule pack version. Editing a rule pack changes its version, so stale entries
+are never returned; they are pruned when the cache is opened.
+"""
+
+import json
+import sqlite3
+import hashlib
+from pathlib import Path
+
+from extraction_engine import STREAM_THRESHOLD, iter_file_blocks
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DB = PROJECT_ROOT / "outputs" / ".cache" / "extraction.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    content_hash  TEXT NOT NULL,
+    filename      TEXT NOT NULL,
+    rules_version TEXT NOT NULL,
+    criteria      TEXT NOT NULL,
+    PRIMARY KEY (content_hash, filename, rules_version)
+)
+"""
+
+
+def content_hash(text):
+    """SHA-256 of the decoded document text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Per-file extraction results for one rule pack.
+
+    Use as a context manager; new entries are committed on exit (or on commit()).
+    Each process should open its own cache; SQLite serializes the writers.
+    Pass db_path=None to disable caching (every lookup misses).
+    """
+
+    def __init__(self, pack, db_path=CACHE_DB):
+        self.pack = pack
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        if db_path is None:
+            return
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            # Drop entries from older versions of this pack
+            self._conn.execute(
+                "DELETE FROM extractions WHERE rules_version LIKE ? AND rules_version != ?",
+                (f"{pack.name}@%", pack.version))
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: extraction cache disabled ({e})")
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def commit(self):
+        if self._conn is not None:
+            self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def extract(self, content, filename):
+        """Return the pack's criteria for content, extracting only on a cache miss"""
+        if self._conn is None:
+            self.misses += 1
+            return self.pack.extract(content, filename)
+        return self._lookup(content_hash(content), filename, lambda: self.pack.extract(content, filename))
+
+    def _lookup(self, digest, filename, extract):
+        if self._conn is None:
+            self.misses += 1
+            return extract()
+
+        key = (digest, filename, self.pack.version)
+        row = self._conn.execute(
+            "SELECT criteria FROM extractions"
+            " WHERE content_hash = ? AND filename = ? AND rules_version = ?", key).fetchone()
+        if row is not None:
+            self.hits += 1
+            return json.loads(row[0])
+
+        self.misses += 1
+        criteria = extract()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?)",
+            key + (json.dumps(criteria),))
+        return criteria
+
+    def extract_file(self, md_file):
+        """Read a markdown file and return its criteria; large files are hashed and scanned in blocks"""
+        md_file = Path(md_file)
+        if md_file.stat().st_size <= STREAM_THRESHOLD:
+            content = md_file.read_text(encoding='utf-8', errors='ignore')
+            return self.extract(content, md_file.name)
+
+        digest = hashlib.sha256()
+        for block in iter_file_blocks(md_file):
+            digest.update(block.encode('utf-8'))
+        return self._lookup(digest.hexdigest(), md_file.name, lambda: self.pack.extract_file(md_file))
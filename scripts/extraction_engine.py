@@ -0,0 +1,822 @@
+#!/usr/bin/env python3
+"""
+Shared criteria extraction engine
+Loads a declarative rule pack (scripts/rules/*.json), compiles it once and
+extracts criteria from markdown documents
+
+Rule pack layout:
+    name              - pack name
+    negative          - {"type": "regex", "patterns": [...], "flags": [...]}
+                        or {"type": "substring", "keywords": [...]}
+    positive          - {"type": "substring", "keywords": [...]} (optional)
+    stages            - ordered list of extraction stages (see STAGE_TYPES)
+    categories        - {category: [keywords]} checked in order
+    category_normalize - optional {"old": "new"} replacements before matching
+
+Compiled packs are memoized per process, keyed by the pack's content hash
+and ENGINE_VERSION (which also versions the extraction cache's entries).
+
+Large files are streamed (RulePack.extract_file): each line-aligned block is
+scanned together with overlap from its neighbours, so memory stays flat and
+context windows still work across block boundaries. Lines longer than a
+block (minified tables, inline images) are cut.
+
+Patterns are checked for catastrophic-backtracking shapes when a pack is
+compiled (see regex_safety): exponential ones are rejected, quadratic ones
+are listed in RulePack.risky_rules. RulePack.configure() can bound the
+extraction time of each document, or of each block of a streamed one
+(RuleTimeout names the rule that was running; off by default), and record
+per-rule call counts and match time.
+"""
+
+import re
+import json
+import time
+import signal
+import hashlib
+import threading
+from contextlib import contextmanager
+from functools import reduce
+from pathlib import Path
+
+from keyword_matcher import KeywordMatcher
+from negative_index import NegativeContextIndex, compile_indicators
+from regex_safety import EXPONENTIAL, pattern_risks
+
+ENGINE_VERSION = 4
+
+RULES_DIR = Path(__file__).parent / "rules"
+
+# Files above STREAM_THRESHOLD bytes are scanned in line-aligned blocks of
+# at most STREAM_BLOCK_SIZE characters instead of being read whole
+STREAM_THRESHOLD = 4 * 1024 * 1024
+STREAM_BLOCK_SIZE = 256 * 1024
+STREAM_MIN_OVERLAP = 4096
+
+STAGE_TYPES = ("filename", "line_keywords", "headers", "patterns", "indicator_snippets")
+
+_MARKDOWN_HEADER = re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE)
+
+_loaded_packs = {}
+
+
+class RulePackError(ValueError):
+    """Raised when a rule pack is malformed"""
+
+
+class RuleTimeout(Exception):
+    """Raised when extracting one document (or streamed block) runs over RulePack.document_timeout"""
+
+    def __init__(self, filename, rule, seconds):
+        super().__init__(f"rule timed out: {rule} ran over the {seconds:g}s limit on {filename}")
+        self.filename = filename
+        self.rule = rule
+        self.seconds = seconds
+
+
+class _AccountedPattern:
+    """A compiled pattern that records its calls and match time in a rule_stats entry"""
+
+    def __init__(self, regex, pack, entry):
+        self.regex = regex
+        self.pattern = regex.pattern
+        self.flags = regex.flags
+        self.pack = pack
+        self.entry = entry
+
+    def _record(self, elapsed):
+        entry = self.entry
+        entry["calls"] += 1
+        entry["seconds"] += elapsed
+        if elapsed > entry["max_seconds"]:
+            entry["max_seconds"] = elapsed
+            entry["max_document"] = self.pack._document
+
+    def search(self, *args):
+        self.pack._running = self.entry["rule"]
+        start = time.perf_counter()
+        try:
+            return self.regex.search(*args)
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def match(self, *args):
+        self.pack._running = self.entry["rule"]
+        start = time.perf_counter()
+        try:
+            return self.regex.match(*args)
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def finditer(self, *args):
+        """One call covers the whole iteration, however far the caller takes it"""
+        matches = self.regex.finditer(*args)
+        elapsed = 0.0
+        try:
+            while True:
+                self.pack._running = self.entry["rule"]
+                start = time.perf_counter()
+                try:
+                    match = next(matches)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield match
+        finally:
+            self._record(elapsed)
+
+
+def _unwrap(pattern):
+    return pattern.regex if isinstance(pattern, _AccountedPattern) else pattern
+
+
+# SIGALRM can interrupt a running regex; elsewhere the deadline is checked between stages
+_HAS_ALARM = hasattr(signal, "setitimer")
+
+
+def _flags(names):
+    """Convert a list of flag names (e.g. ["IGNORECASE"]) to re flags"""
+    try:
+        return reduce(lambda acc, name: acc | getattr(re, name), names or [], 0)
+    except AttributeError as e:
+        raise RulePackError(f"Unknown regex flag: {e}")
+
+
+def _compile(pattern, flags, where):
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise RulePackError(f"{where}: invalid pattern {pattern!r}: {e}")
+
+
+class Stage:
+    """One compiled extraction stage"""
+
+    def __init__(self, spec, index):
+        self.type = spec.get("type")
+        if self.type not in STAGE_TYPES:
+            raise RulePackError(f"stage {index}: unknown type {self.type!r}")
+        self.where = f"stage {index} ({self.type})"
+        self.lowercase = spec.get("lowercase", False)
+        self.first_only = spec.get("first_only", False)
+        flags = _flags(spec.get("flags"))
+
+        if self.type == "filename":
+            self.match = spec.get("match", "search")
+            if self.match == "substring":
+                self.rules = [(pattern, criterion) for pattern, criterion in spec["rules"]]
+            else:
+                self.rules = [(_compile(pattern, flags, self.where), criterion)
+                              for pattern, criterion in spec["rules"]]
+
+        elif self.type == "line_keywords":
+            self.rules = [
+                (tuple(rule.get("all", [])), rule["criterion"],
+                 rule.get("min_line", 0), rule.get("filename"))
+                for rule in spec["rules"]
+            ]
+
+        elif self.type == "headers":
+            self.source = spec.get("source", "markdown_headers")
+            self.match = spec.get("match", "search")
+            self.negative_lookahead = spec.get("negative_lookahead_lines")
+            self.rules = [(_compile(pattern, flags, self.where), criterion)
+                          for pattern, criterion in spec["rules"]]
+
+        elif self.type == "patterns":
+            self.scope = spec.get("scope", "document")
+            self.occurrence = spec.get("occurrence", "first")
+            self.window = spec.get("negative_window")
+            self.anchor = spec.get("negative_anchor", "span")
+            self.skip_negative_lines = spec.get("skip_negative_lines", False)
+            self.require_positive = spec.get("require_positive", False)
+            self.rules = [(_compile(pattern, flags, self.where), criterion)
+                          for pattern, criterion in spec["rules"]]
+
+        elif self.type == "indicator_snippets":
+            self.indicators = [_compile(pattern, flags, self.where) for pattern in spec["indicators"]]
+            self.window = spec.get("negative_window")
+            self.snippet_length = spec.get("snippet_length", 100)
+            self.rules = [(_compile(pattern, flags, self.where), criterion)
+                          for pattern, criterion in spec["rules"]]
+
+
+class RulePack:
+    """A compiled rule pack"""
+
+    # Regex searches run by this process (read by the tracing counters)
+    regex_evaluations = 0
+
+    def __init__(self, spec, digest):
+        self.name = spec.get("name", "rules")
+        self.digest = digest
+        self.version = f"{self.name}@{digest[:12]}"
+
+        negative = spec.get("negative") or {}
+        self.negative_keywords = frozenset(negative.get("keywords", []))
+        self.negative_regexes = compile_indicators(negative.get("patterns", []), _flags(negative.get("flags")))
+        self.positive_keywords = frozenset((spec.get("positive") or {}).get("keywords", []))
+
+        self.stages = [Stage(stage, i) for i, stage in enumerate(spec.get("stages", []))]
+
+        # One automaton for every literal keyword the line stages look for
+        line_keywords = set(self.negative_keywords) | set(self.positive_keywords)
+        for stage in self.stages:
+            if stage.type == "line_keywords":
+                line_keywords.update(kw for required, _, _, _ in stage.rules for kw in required)
+        self.line_matcher = KeywordMatcher(line_keywords) if line_keywords else None
+
+        # Context each streamed chunk needs from its neighbours
+        reach = max([stage.window or 0 for stage in self.stages if stage.type in ("patterns", "indicator_snippets")]
+                    + [stage.snippet_length for stage in self.stages if stage.type == "indicator_snippets"]
+                    + [0])
+        self.stream_overlap = max(STREAM_MIN_OVERLAP, 4 * reach)
+        self.stream_overlap_lines = 1 + max([stage.negative_lookahead or 0 for stage in self.stages
+                                             if stage.type == "headers"] + [0])
+
+        self.categories = list((spec.get("categories") or {}).items())
+        self.category_normalize = spec.get("category_normalize") or {}
+        self.default_category = spec.get("default_category", "Uncategorized")
+
+        # Catastrophic-backtracking shapes: exponential ones never load
+        self.risky_rules = []
+        negative_flags = _flags(negative.get("flags"))
+        checks = [(f"negative pattern {i}", pattern, negative_flags)
+                  for i, pattern in enumerate(negative.get("patterns", []))]
+        checks += [(rule, pattern.pattern, pattern.flags) for rule, _, pattern in self._patterns()
+                   if not rule.startswith("negative")]
+        for rule, pattern, flags in checks:
+            risks = pattern_risks(pattern, flags)
+            for severity, risk in risks:
+                if severity == EXPONENTIAL:
+                    raise RulePackError(f"{rule}: pattern {pattern!r} can backtrack catastrophically ({risk})")
+            if risks:
+                self.risky_rules.append({"rule": rule, "pattern": pattern,
+                                         "risk": "; ".join(risk for _, risk in risks)})
+
+        # Run-time limits and accounting (see configure())
+        self.document_timeout = None
+        self.rule_stats = None
+        self._running = None
+        self._document = None
+        self._deadline = None
+
+    # ------------------------------------------------------------------
+    # Limits and per-rule accounting
+    # ------------------------------------------------------------------
+
+    def _patterns(self):
+        """(rule id, criterion, compiled pattern) for every regex the pack runs"""
+        for stage in self.stages:
+            if stage.type == "line_keywords" or (stage.type == "filename" and stage.match == "substring"):
+                continue
+            for i, (pattern, criterion) in enumerate(stage.rules):
+                yield f"{stage.where} rule {i}", criterion, pattern
+            for i, pattern in enumerate(getattr(stage, "indicators", [])):
+                yield f"{stage.where} indicator {i}", None, pattern
+        for i, pattern in enumerate(self.negative_regexes):
+            yield f"negative pattern {i}", None, pattern
+
+    def _replace_patterns(self, wrap):
+        """Swap every compiled pattern p for wrap(rule id, criterion, p)"""
+        for stage in self.stages:
+            if stage.type == "line_keywords" or (stage.type == "filename" and stage.match == "substring"):
+                continue
+            stage.rules = [(wrap(f"{stage.where} rule {i}", criterion, pattern), criterion)
+                           for i, (pattern, criterion) in enumerate(stage.rules)]
+            if stage.type == "indicator_snippets":
+                stage.indicators = [wrap(f"{stage.where} indicator {i}", None, pattern)
+                                    for i, pattern in enumerate(stage.indicators)]
+        self.negative_regexes = [wrap(f"negative pattern {i}", None, pattern)
+                                 for i, pattern in enumerate(self.negative_regexes)]
+
+    def configure(self, document_timeout=None, accounting=False):
+        """
+        Set this process's run-time limits
+        document_timeout - seconds one document, or one block of a streamed
+                           document, may take (None or 0: unbounded);
+                           extraction then raises RuleTimeout
+        accounting       - record calls and match time per rule in rule_stats
+        """
+        self.document_timeout = document_timeout or None
+        if accounting and self.rule_stats is None:
+            self.rule_stats = {}
+
+            def wrap(rule, criterion, pattern):
+                entry = self.rule_stats[rule] = {"rule": rule, "criterion": criterion, "pattern": pattern.pattern,
+                                                 "calls": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                 "max_document": None}
+                return _AccountedPattern(pattern, self, entry)
+            self._replace_patterns(wrap)
+        elif not accounting and self.rule_stats is not None:
+            self.rule_stats = None
+            self._replace_patterns(lambda rule, criterion, pattern: _unwrap(pattern))
+
+    def take_rule_stats(self):
+        """Per-rule stats recorded since the last call ({} without accounting); counters restart"""
+        if self.rule_stats is None:
+            return {}
+        taken = {}
+        for rule, entry in self.rule_stats.items():
+            if entry["calls"]:
+                taken[rule] = dict(entry)
+                entry.update(calls=0, seconds=0.0, max_seconds=0.0, max_document=None)
+        return taken
+
+    @contextmanager
+    def _time_limit(self, filename):
+        """Bound one document's (or streamed block's) extraction by document_timeout"""
+        self._document = filename
+        limit = self.document_timeout
+        if not limit:
+            yield
+            return
+
+        if not _HAS_ALARM or threading.current_thread() is not threading.main_thread():
+            # Checked between stages; cannot stop a single runaway regex
+            self._deadline = time.perf_counter() + limit
+            try:
+                yield
+            finally:
+                self._deadline = None
+            return
+
+        def expired(signum, frame):
+            raise RuleTimeout(filename, self._running, limit)
+
+        previous = signal.signal(signal.SIGALRM, expired)
+        signal.setitimer(signal.ITIMER_REAL, limit)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def _run_stage(self, stage, doc, filename):
+        self._running = stage.where
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise RuleTimeout(filename, stage.where, self.document_timeout)
+        return getattr(self, f"_run_{stage.type}")(stage, doc, filename)
+
+    # ------------------------------------------------------------------
+    # Extraction
+    # ------------------------------------------------------------------
+
+    def scan(self, content, filename):
+        """
+        Run every stage over one document
+        Returns list of (line_no, criterion) hits; line_no is None for
+        filename and document-level hits
+        """
+        doc = _Document(self, content)
+        hits = []
+        with self._time_limit(filename):
+            for stage in self.stages:
+                hits.extend(self._run_stage(stage, doc, filename))
+        return hits
+
+    def extract(self, content, filename):
+        """Return the unique criteria found in one document, in discovery order"""
+        return list(dict.fromkeys(criterion for _, criterion in self.scan(content, filename)))
+
+    def extract_blocks(self, blocks, filename):
+        """
+        Extract criteria from a document given as line-aligned text blocks
+        Each block is scanned with overlap from its neighbours, so only about
+        three blocks are held in memory regardless of document size
+        """
+        blocks = iter(blocks)
+        current = next(blocks, None)
+        if current is None:
+            return self.extract('', filename)
+
+        state = _new_stream_state()
+        criteria = {}
+        previous = ''
+        line_base = 0
+        first = True
+        while current is not None:
+            following = next(blocks, None)
+            before = _tail_lines(previous, self.stream_overlap)
+            after = _head_lines(following, self.stream_overlap, self.stream_overlap_lines) if following else ''
+            doc = _Document(self, before + current + after,
+                            core=(len(before), len(before) + len(current)),
+                            first_line=line_base - before.count('\n'),
+                            first=first, last=following is None, state=state)
+            # The time limit applies per block, so it does not grow with file size
+            with self._time_limit(filename):
+                for stage in self.stages:
+                    for _, criterion in self._run_stage(stage, doc, filename):
+                        criteria.setdefault(criterion, None)
+
+            line_base += current.count('\n')
+            previous, current, first = current, following, False
+        return list(criteria)
+
+    def extract_file(self, path):
+        """Extract criteria from a markdown file, streaming it if it is large"""
+        path = Path(path)
+        if path.stat().st_size <= STREAM_THRESHOLD:
+            return self.extract(path.read_text(encoding='utf-8', errors='ignore'), path.name)
+        return self.extract_blocks(iter_file_blocks(path), path.name)
+
+    def _run_filename(self, stage, doc, filename):
+        if not doc.first:
+            return []
+        name = filename.lower() if stage.lowercase else filename
+        hits = []
+        evaluations = 0
+        for pattern, criterion in stage.rules:
+            if stage.match == "substring":
+                found = pattern in name
+            elif stage.match == "match":
+                found = pattern.match(name) is not None
+                evaluations += 1
+            else:
+                found = pattern.search(name) is not None
+                evaluations += 1
+            if found:
+                hits.append((None, criterion))
+                if stage.first_only:
+                    break
+        self.regex_evaluations += evaluations
+        return hits
+
+    def _run_line_keywords(self, stage, doc, filename):
+        line_keywords, _ = doc.line_hits()
+        negative_lines = doc.negative_lines()
+        core = doc.core_lines()
+        clean_lines = doc.clean_lines()
+        filename_lower = filename.lower()
+
+        hits = []
+        for required, criterion, min_line, only_filename in stage.rules:
+            if only_filename is not None and filename_lower != only_filename:
+                continue
+            if not required:
+                # Keyword-free rules fire once the file has a line that survives the negative filter
+                if clean_lines > min_line:
+                    hits.append((None, criterion))
+                continue
+            for line_no in sorted(line_keywords):
+                if line_no not in core or line_no in negative_lines:
+                    continue
+                if doc.first_line + line_no < min_line:
+                    continue
+                if all(kw in line_keywords[line_no] for kw in required):
+                    hits.append((doc.first_line + line_no, criterion))
+        hits.sort(key=lambda hit: -1 if hit[0] is None else hit[0])
+        return hits
+
+    def _run_headers(self, stage, doc, filename):
+        hits = []
+        evaluations = 0
+        if stage.source == "lines":
+            lines = doc.lines()
+            negative_lines = doc.negative_lines() if stage.negative_lookahead else set()
+            for i in doc.core_lines():
+                text = lines[i].lower() if stage.lowercase else lines[i]
+                for pattern, criterion in stage.rules:
+                    found = pattern.match(text) if stage.match == "match" else pattern.search(text)
+                    evaluations += 1
+                    if not found:
+                        continue
+                    if criterion:
+                        following = range(i + 1, i + 1 + (stage.negative_lookahead or 0))
+                        if not any(n in negative_lines for n in following):
+                            hits.append((doc.first_line + i, criterion))
+                    if stage.first_only:
+                        break
+        else:
+            start, end = doc.core()
+            evaluations += 1
+            for header_match in _MARKDOWN_HEADER.finditer(doc.content, start):
+                if header_match.start() >= end:
+                    break
+                text = header_match.group(1).strip()
+                text = text.lower() if stage.lowercase else text
+                for pattern, criterion in stage.rules:
+                    found = pattern.match(text) if stage.match == "match" else pattern.search(text)
+                    evaluations += 1
+                    if found:
+                        if criterion:
+                            hits.append((None, criterion))
+                        if stage.first_only:
+                            break
+        self.regex_evaluations += evaluations
+        return hits
+
+    def _run_patterns(self, stage, doc, filename):
+        hits = []
+        if stage.scope == "line":
+            line_keywords, _ = doc.line_hits()
+            negative_lines = doc.negative_lines()
+            lines = doc.lines()
+            for i in doc.core_lines():
+                if stage.skip_negative_lines and i in negative_lines:
+                    continue
+                if stage.require_positive and not (line_keywords.get(i, set()) & self.positive_keywords):
+                    continue
+                text = lines[i].lower() if stage.lowercase else lines[i]
+                for pattern, criterion in stage.rules:
+                    if pattern.search(text):
+                        hits.append((doc.first_line + i, criterion))
+                self.regex_evaluations += len(stage.rules)
+            return hits
+
+        text = doc.text(stage.lowercase)
+        start, end = doc.core(stage.lowercase)
+        for rule_no, (pattern, criterion) in enumerate(stage.rules):
+            self.regex_evaluations += 1
+            if stage.window is None:
+                match = pattern.search(text, start)
+                if match and match.start() < end:
+                    hits.append((None, criterion))
+                continue
+
+            # Only the first occurrence in the document is checked
+            key = (id(stage), rule_no)
+            if stage.occurrence != "any" and key in doc.state["decided"]:
+                continue
+            index = doc.negative_index(stage.lowercase)
+            for match in doc.finditer(pattern, text, start, end, key):
+                if stage.occurrence != "any":
+                    doc.state["decided"].add(key)
+                anchor_end = match.start() if stage.anchor == "start" else match.end()
+                if not index.near(match.start(), anchor_end, radius=stage.window):
+                    hits.append((None, criterion))
+                    break
+                if stage.occurrence != "any":
+                    break
+        return hits
+
+    def _run_indicator_snippets(self, stage, doc, filename):
+        text = doc.text(stage.lowercase)
+        start, end = doc.core(stage.lowercase)
+        index = doc.negative_index(stage.lowercase) if stage.window is not None else None
+        found = doc.state["snippets_found"].setdefault(id(stage), set())
+        already_found = set(found)
+        wanted = {criterion for _, criterion in stage.rules}
+        checked_ends = set()
+
+        for indicator_no, indicator in enumerate(stage.indicators):
+            if found == wanted:
+                break
+            self.regex_evaluations += 1
+            for match in doc.finditer(indicator, text, start, end, (id(stage), indicator_no)):
+                pos = match.end()
+                # Several indicators can end at the same offset; the snippet is the same
+                if pos in checked_ends:
+                    continue
+                if index is not None and index.near(match.start(), radius=stage.window):
+                    continue
+                checked_ends.add(pos)
+                snippet = text[pos:pos + stage.snippet_length]
+                for pattern, criterion in stage.rules:
+                    if criterion not in found:
+                        self.regex_evaluations += 1
+                        if pattern.search(snippet):
+                            found.add(criterion)
+                if found == wanted:
+                    break
+
+        return [(None, criterion) for pattern, criterion in stage.rules
+                if criterion in found and criterion not in already_found]
+
+    # ------------------------------------------------------------------
+    # Categorization
+    # ------------------------------------------------------------------
+
+    def categorize(self, criterion_name):
+        """Categorize a criterion using the pack's ordered category keywords"""
+        name = criterion_name.lower()
+        for old, new in self.category_normalize.items():
+            name = name.replace(old, new)
+        for category, keywords in self.categories:
+            if any(keyword in name for keyword in keywords):
+                return category
+        return self.default_category
+
+
+def iter_file_blocks(path, block_size=STREAM_BLOCK_SIZE):
+    """
+    Yield a text file in blocks of at most block_size characters, each ending
+    at a newline; a line longer than block_size (minified tables, inline
+    images) is cut, and the overlap between blocks covers matches across the cut
+    """
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        carry = ''
+        while True:
+            chunk = f.read(block_size - len(carry))
+            block = carry + chunk
+            if not block:
+                return
+            carry = ''
+            if chunk and not block.endswith('\n'):
+                cut = block.rfind('\n') + 1 or len(block)
+                block, carry = block[:cut], block[cut:]
+            yield block
+
+
+def _tail_lines(text, size):
+    """
+    Whole lines at the end of text covering at least size characters
+    A line reaching back more than 2 * size characters is cut at size
+    """
+    if len(text) <= size:
+        return text
+    start = text.rfind('\n', 0, len(text) - size) + 1
+    return text[start if len(text) - start <= 2 * size else len(text) - size:]
+
+
+def _head_lines(text, size, min_lines):
+    """
+    Whole lines at the start of text covering at least size characters and min_lines lines
+    Lines running past 2 * size characters are cut at size
+    """
+    end = text.find('\n', size)
+    newline = -1
+    for _ in range(min_lines):
+        newline = text.find('\n', newline + 1)
+        if newline == -1:
+            break
+    end = len(text) if end == -1 or newline == -1 else max(end, newline) + 1
+    return text[:end if end <= 2 * size else size]
+
+
+def _new_stream_state():
+    """Cross-chunk state: rules already decided, regex resume points, snippet finds"""
+    return {"decided": set(), "overshoot": {}, "snippets_found": {}, "clean_lines": 0}
+
+
+class _Document:
+    """
+    Lazily computed per-document views shared between stages
+
+    When streaming, a document is one chunk of a file: the core span is the
+    part this chunk is responsible for and the text around it is overlap
+    from the neighbouring blocks, so context windows see across boundaries.
+    """
+
+    def __init__(self, pack, content, core=None, first_line=0, first=True, last=True, state=None):
+        self.pack = pack
+        self.content = content
+        self.first_line = first_line
+        self.first = first
+        self.last = last
+        self.state = state if state is not None else _new_stream_state()
+        self._core = core
+        self._lower = None
+        self._lines = None
+        self._line_hits = None
+        self._negative_lines = None
+        self._clean_lines = None
+        self._core_lines = None
+        self._lower_core = None
+        self._indexes = {}
+
+    def text(self, lowercase=False):
+        if not lowercase:
+            return self.content
+        if self._lower is None:
+            self._lower = self.content.lower()
+        return self._lower
+
+    def core(self, lowercase=False):
+        """(start, end) offsets of the core span in text(lowercase)"""
+        if self._core is None:
+            return 0, len(self.text(lowercase))
+        if not lowercase:
+            return self._core
+        if self._lower_core is None:
+            # str.lower() can change length (e.g. U+0130), so map the offsets
+            start, end = self._core
+            lower_start = len(self.content[:start].lower())
+            self._lower_core = (lower_start, lower_start + len(self.content[start:end].lower()))
+        return self._lower_core
+
+    def core_lines(self):
+        """Indexes into lines() that fall inside the core span"""
+        if self._core_lines is None:
+            start, end = self.core()
+            first = self.content.count('\n', 0, start)
+            self._core_lines = range(first, first + self.content.count('\n', start, end) + (1 if self.last else 0))
+        return self._core_lines
+
+    def lines(self):
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+
+    def line_hits(self):
+        if self._line_hits is None:
+            if self.pack.line_matcher is None:
+                self._line_hits = ({}, self.content.count('\n') + 1)
+            else:
+                self._line_hits = self.pack.line_matcher.line_hits(self.text(lowercase=True))
+        return self._line_hits
+
+    def negative_lines(self):
+        """Line numbers containing a negative keyword"""
+        if self._negative_lines is None:
+            line_keywords, _ = self.line_hits()
+            negatives = self.pack.negative_keywords
+            self._negative_lines = {n for n, kws in line_keywords.items() if kws & negatives}
+        return self._negative_lines
+
+    def clean_lines(self):
+        """Lines without a negative keyword, counted from the start of the file"""
+        if self._clean_lines is None:
+            core = self.core_lines()
+            negatives = sum(1 for n in self.negative_lines() if n in core)
+            self.state["clean_lines"] += len(core) - negatives
+            self._clean_lines = self.state["clean_lines"]
+        return self._clean_lines
+
+    def negative_index(self, lowercase=False):
+        if lowercase not in self._indexes:
+            self._indexes[lowercase] = NegativeContextIndex(self.text(lowercase), self.pack.negative_regexes)
+            self.pack.regex_evaluations += len(self.pack.negative_regexes)
+        return self._indexes[lowercase]
+
+    def finditer(self, pattern, text, start, end, key):
+        """
+        Yield matches of pattern starting inside [start, end)
+        Resumes where the previous chunk's last match ended, so a match that
+        ran over the boundary is not followed by one the full-text scan skips.
+        """
+        overshoot = self.state["overshoot"]
+        frontier = start + overshoot.pop(key, 0)
+        try:
+            for match in pattern.finditer(text, frontier):
+                if match.start() >= end:
+                    break
+                frontier = max(frontier, match.end())
+                yield match
+        finally:
+            if frontier > end:
+                overshoot[key] = frontier - end
+
+
+def merge_rule_stats(total, stats):
+    """Add take_rule_stats() output (e.g. from a worker) into total, in place"""
+    for rule, entry in stats.items():
+        if rule not in total:
+            total[rule] = dict(entry)
+            continue
+        merged = total[rule]
+        merged["calls"] += entry["calls"]
+        merged["seconds"] += entry["seconds"]
+        if entry["max_seconds"] > merged["max_seconds"]:
+            merged["max_seconds"] = entry["max_seconds"]
+            merged["max_document"] = entry["max_document"]
+    return total
+
+
+def over_budget(stats, budget):
+    """Rules whose slowest single call took longer than budget seconds, slowest first"""
+    return sorted((entry for entry in stats.values() if entry["max_seconds"] > budget),
+                  key=lambda entry: -entry["max_seconds"])
+
+
+def format_rule_stats(stats, budget=None, top=10):
+    """The costliest rules (by total match time) and those over budget, as printable lines"""
+    lines = [f"  {'Seconds':>9}  {'Calls':>9}  {'Slowest':>9}  Rule"]
+    for entry in sorted(stats.values(), key=lambda entry: -entry["seconds"])[:top]:
+        lines.append(f"  {entry['seconds']:9.3f}  {entry['calls']:>9,}  {entry['max_seconds']:9.4f}  "
+                     f"{entry['rule']} {entry['pattern']!r}")
+    if budget is not None:
+        flagged = over_budget(stats, budget)
+        lines.append(f"Rules over the {budget * 1000:g} ms budget: {len(flagged)}")
+        for entry in flagged:
+            lines.append(f"  {entry['max_seconds']:9.4f}s  {entry['rule']} {entry['pattern']!r}"
+                         f" on {entry['max_document']}")
+    return lines
+
+
+def _resolve(name_or_path):
+    path = Path(name_or_path)
+    if path.suffix != ".json":
+        path = RULES_DIR / f"{name_or_path}.json"
+    if not path.exists():
+        raise FileNotFoundError(f"Rule pack not found: {path}")
+    return path
+
+
+def load_rule_pack(name_or_path):
+    """
+    Load and compile a rule pack by name (scripts/rules/<name>.json) or path
+    Compiled packs are reused within the process
+    """
+    path = _resolve(name_or_path)
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw + f"engine-{ENGINE_VERSION}".encode()).hexdigest()
+
+    if digest not in _loaded_packs:
+        try:
+            spec = json.loads(raw.decode('utf-8'))
+        except json.JSONDecodeError as e:
+            raise RulePackError(f"{path}: {e}")
+        _loaded_packs[digest] = RulePack(spec, digest)
+    return _loaded_packs[digest]
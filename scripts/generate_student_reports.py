@@ -1,15 +1,189 @@
 #!/usr/bin/env python3
 """
 Student Report Generator
-Generates individual Markdown and PDF reports for each student
+Generates individual PDF reports (rendered directly to HTML) and, optionally,
+Markdown copies for each student
 """
 
+import os
 import sys
 import json
+import hashlib
+import argparse
 from pathlib import Path
 from datetime import datetime
+from html import escape
 from collections import defaultdict
-import openpyxl
+
+from results_store import ResultsStore, results_path
+from scoring import RARE_PREVALENCE
+from task_pool import run_tasks
+
+# Seconds one PDF conversion may take before it is killed
+PDF_TIMEOUT = 120
+
+# Professional CSS styling matching Detailed_Grade_Breakdown.pdf
+REPORT_CSS = """
+@page {
+    size: A4;
+    margin: 2.5cm;
+}
+
+body {
+    font-family: 'Arial', sans-serif;
+    font-size: 11pt;
+    line-height: 1.6;
+    color: #333;
+}
+
+h1 {
+    color: #000;
+    text-align: center;
+    font-size: 28pt;
+    font-weight: bold;
+    margin: 20px 0 30px 0;
+    padding: 0;
+    border: none;
+    letter-spacing: 1px;
+}
+
+h2 {
+    color: #000;
+    font-size: 20pt;
+    font-weight: bold;
+    margin-top: 30px;
+    margin-bottom: 15px;
+    padding: 0;
+    border: none;
+}
+
+h3 {
+    color: #000;
+    font-size: 16pt;
+    font-weight: bold;
+    margin-top: 20px;
+    margin-bottom: 10px;
+}
+
+ul {
+    margin-left: 0;
+    padding-left: 20px;
+}
+
+li {
+    margin-bottom: 8px;
+}
+
+strong {
+    color: #2c3e50;
+    font-weight: 600;
+}
+
+hr {
+    border: none;
+    border-top: 1px solid #bdc3c7;
+    margin: 20px 0;
+}
+
+p {
+    margin: 10px 0;
+}
+
+/* Header info styling */
+.header-info {
+    text-align: center;
+    margin-bottom: 30px;
+}
+
+.header-info p {
+    margin: 5px 0;
+    font-size: 11pt;
+    color: #555;
+}
+
+/* Final score styling */
+.final-score {
+    text-align: center;
+    font-size: 32pt;
+    font-weight: bold;
+    color: #f39c12;
+    margin: 30px 0;
+    letter-spacing: 1px;
+}
+
+/* Table styling */
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 15px 0;
+}
+
+th {
+    background-color: #5b9bd5;
+    color: white;
+    font-weight: bold;
+    padding: 10px;
+    text-align: left;
+    border: 1px solid #ddd;
+}
+
+td {
+    padding: 8px 10px;
+    border: 1px solid #ddd;
+}
+
+tr:nth-child(even) {
+    background-color: #f9f9f9;
+}
+
+/* Status indicators */
+.status-excellent {
+    color: #27ae60;
+    font-weight: bold;
+}
+
+.status-fair {
+    color: #f39c12;
+    font-weight: bold;
+}
+
+.status-poor {
+    color: #e74c3c;
+    font-weight: bold;
+}
+"""
+
+# Document shell around each report body, built once per run
+_HTML_HEAD = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>{REPORT_CSS}</style>
+</head>
+<body>
+"""
+_HTML_TAIL = """
+</body>
+</html>
+"""
+
+# Bump when render_report_html / generate_markdown_report output changes, so
+# unchanged-looking reports are re-rendered
+REPORT_TEMPLATE_VERSION = 1
+_TEMPLATE_DIGEST = hashlib.sha256(
+    f"{REPORT_TEMPLATE_VERSION}\0{_HTML_HEAD}\0{_HTML_TAIL}".encode('utf-8')).hexdigest()
+
+# Per-report input fingerprints of the last run, kept in the reports folder
+MANIFEST_FILE = ".report_manifest.json"
+
+# Bundle mode: every student in one PDF, one top-level bookmark per student
+BUNDLE_FILE = "cohort_reports.pdf"
+BUNDLE_CSS = """
+h1 { -pdf-outline: false; }
+.student-id { -pdf-outline: true; -pdf-outline-level: 0; -pdf-outline-open: false; }
+h2 { -pdf-outline-level: 1; -pdf-outline-open: false; }
+h3 { -pdf-outline-level: 2; }
+"""
 
 # Category ordering (logical development lifecycle)
 CATEGORY_ORDER = [
@@ -24,8 +198,22 @@ CATEGORY_ORDER = [
     "Uncategorized"
 ]
 
+def load_results(work_submissions_folder):
+    """
+    Load the criteria graph, student grades and per-student criteria from the
+    run's results store. Output folders written before the store existed fall
+    back to the JSON/Excel exports (per-student criteria are then None and get
+    inverted from the graph).
+    """
+    store_path = results_path(Path("outputs") / work_submissions_folder)
+    if not store_path.exists():
+        return load_criteria_graph(work_submissions_folder), load_student_grades(work_submissions_folder), None
+
+    with ResultsStore(store_path) as store:
+        return store.criteria_graph(), store.grades(), store.student_criteria()
+
 def load_criteria_graph(work_submissions_folder):
-    """Load criteria graph from JSON file"""
+    """Load criteria graph from JSON file (pre-results-store output folders)"""
     json_path = Path("outputs") / work_submissions_folder / "criteria_graph_final.json"
 
     if not json_path.exists():
@@ -37,7 +225,7 @@ def load_criteria_graph(work_submissions_folder):
         return json.load(f)
 
 def load_student_grades(work_submissions_folder):
-    """Load student grades from Excel file"""
+    """Load student grades from Excel file (pre-results-store output folders)"""
     xlsx_path = Path("outputs") / work_submissions_folder / "grades.xlsx"
 
     if not xlsx_path.exists():
@@ -45,6 +233,8 @@ def load_student_grades(work_submissions_folder):
         print(f"Please run: python scripts/run_evaluation.py tests/{work_submissions_folder}")
         sys.exit(1)
 
+    import openpyxl
+
     wb = openpyxl.load_workbook(xlsx_path)
     ws = wb.active
 
@@ -66,7 +256,57 @@ def load_student_grades(work_submissions_folder):
 
     return grades
 
-def build_student_report_data(student_name, criteria_graph, student_grades):
+class ReportIndex:
+    """
+    Lookups shared by every student's report, built once per cohort
+
+    - student_criteria: {student: set of criteria} (inverted from the graph
+      unless the results store's membership is passed in)
+    - criterion_info:   {criterion: report item with prevalence and tier}
+    - strengths_by_category:    rare criteria per category, rarest first
+    - improvements_by_category: all criteria per category, most common first
+    - category_totals:  {category: number of criteria}
+
+    With these, one report costs time proportional to its own length
+    instead of a scan of the whole graph per student.
+    """
+
+    def __init__(self, criteria_graph, student_criteria=None):
+        total_students = criteria_graph['metadata']['total_students']
+        criteria = criteria_graph['criteria']
+
+        if student_criteria is None:
+            student_criteria = defaultdict(list)
+            for criterion, crit_data in criteria.items():
+                for student in crit_data['students']:
+                    student_criteria[student].append(criterion)
+        self.student_criteria = {s: set(crits) for s, crits in student_criteria.items()}
+
+        self.criterion_info = {}
+        by_category = defaultdict(list)
+        for criterion, crit_data in criteria.items():
+            prevalence = crit_data['count'] / total_students
+            self.criterion_info[criterion] = {
+                'name': criterion,
+                'prevalence': prevalence,
+                'count': crit_data['count'],
+                'total_students': total_students,
+                'tier': 'rare' if prevalence <= RARE_PREVALENCE else 'common'
+            }
+            by_category[crit_data['category']].append(self.criterion_info[criterion])
+
+        self.category_of = {criterion: crit_data['category'] for criterion, crit_data in criteria.items()}
+        self.category_totals = {category: len(items) for category, items in by_category.items()}
+        self.strengths_by_category = {
+            category: sorted((item for item in items if item['tier'] == 'rare'), key=lambda x: x['prevalence'])
+            for category, items in by_category.items()
+        }
+        self.improvements_by_category = {
+            category: sorted(items, key=lambda x: x['prevalence'], reverse=True)
+            for category, items in by_category.items()
+        }
+
+def build_student_report_data(student_name, criteria_graph, student_grades, index=None):
     """
     Build report data structure for a single student
 
@@ -75,69 +315,44 @@ def build_student_report_data(student_name, criteria_graph, student_grades):
     - strengths: {category: [criteria]} - rare criteria (<=15%)
     - improvements: {category: [criteria]} - missing criteria
     - category_breakdown: {category: (achieved, total)}
+
+    Pass a ReportIndex shared across the cohort; one is built if omitted.
     """
-    total_students = criteria_graph['metadata']['total_students']
+    if index is None:
+        index = ReportIndex(criteria_graph)
     total_criteria = criteria_graph['metadata']['total_criteria']
 
     # Get student's criteria
-    student_criteria = set()
-    for criterion, crit_data in criteria_graph['criteria'].items():
-        if student_name in crit_data['students']:
-            student_criteria.add(criterion)
+    student_criteria = index.student_criteria.get(student_name, set())
 
-    # Identify strengths (rare criteria, <=15% prevalence)
-    strengths = defaultdict(list)
+    achieved = defaultdict(int)
     for criterion in student_criteria:
-        crit_data = criteria_graph['criteria'][criterion]
-        prevalence = crit_data['count'] / total_students
+        achieved[index.category_of[criterion]] += 1
 
-        if prevalence <= 0.15:
-            strengths[crit_data['category']].append({
-                'name': criterion,
-                'prevalence': prevalence,
-                'count': crit_data['count'],
-                'total_students': total_students
-            })
+    # Strengths: rare criteria (<=15% prevalence), rarest first
+    strengths = {}
+    for category in achieved:
+        items = [item for item in index.strengths_by_category[category] if item['name'] in student_criteria]
+        if items:
+            strengths[category] = items
 
-    # Sort strengths by prevalence (rarest first)
-    for category in strengths:
-        strengths[category].sort(key=lambda x: x['prevalence'])
-
-    # Identify improvements (missing criteria)
-    improvements = defaultdict(list)
-    for criterion, crit_data in criteria_graph['criteria'].items():
-        if criterion not in student_criteria:
-            prevalence = crit_data['count'] / total_students
-            improvements[crit_data['category']].append({
-                'name': criterion,
-                'prevalence': prevalence,
-                'count': crit_data['count'],
-                'total_students': total_students
-            })
-
-    # Sort improvements by prevalence (most common first - highest priority)
-    for category in improvements:
-        improvements[category].sort(key=lambda x: x['prevalence'], reverse=True)
+    # Improvements: missing criteria, most common first (highest priority)
+    improvements = {}
+    for category, items in index.improvements_by_category.items():
+        if achieved[category] < len(items):
+            improvements[category] = [item for item in items if item['name'] not in student_criteria]
 
     # Category breakdown
     category_breakdown = {}
     for category in CATEGORY_ORDER:
-        criteria_in_category = [
-            c for c, data in criteria_graph['criteria'].items()
-            if data['category'] == category
-        ]
-        achieved_in_category = [
-            c for c in criteria_in_category
-            if c in student_criteria
-        ]
-        if criteria_in_category:  # Only include categories that exist
-            category_breakdown[category] = (len(achieved_in_category), len(criteria_in_category))
+        if category in index.category_totals:  # Only include categories that exist
+            category_breakdown[category] = (achieved[category], index.category_totals[category])
 
     return {
         'student_name': student_name,
         'grade_info': student_grades.get(student_name, {}),
-        'strengths': dict(strengths),
-        'improvements': dict(improvements),
+        'strengths': strengths,
+        'improvements': improvements,
         'category_breakdown': category_breakdown,
         'total_criteria': total_criteria,
         'achieved_criteria': len(student_criteria),
@@ -220,11 +435,101 @@ def generate_markdown_report(report_data, output_path):
     with open(output_path, 'w', encoding='utf-8') as f:
         f.writelines(lines)
 
+def report_fingerprint(report_data):
+    """
+    Hash of everything a report is rendered from: its data plus the
+    template/CSS version. The assessment date is not included, so a rerun on
+    another day keeps unchanged reports as they are.
+    """
+    payload = json.dumps(report_data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{_TEMPLATE_DIGEST}\0{payload}".encode('utf-8')).hexdigest()
+
+def load_manifest(output_dir):
+    """
+    Fingerprints from the last run: ({student: {"md": fp, "pdf": fp}}, bundle fp)
+    Returns ({}, None) when there is no usable manifest.
+    """
+    try:
+        with open(output_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest["reports"], manifest.get("bundle")
+    except (OSError, ValueError, KeyError):
+        return {}, None
+
+def save_manifest(output_dir, manifest, bundle=None):
+    tmp_path = output_dir / (MANIFEST_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"reports": manifest, "bundle": bundle}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, output_dir / MANIFEST_FILE)
+
+def bundle_fingerprint(fingerprints):
+    """Fingerprint of the cohort bundle: its students, in order, and their report fingerprints"""
+    payload = "\n".join(f"{name}\0{fp}" for name, fp in fingerprints.items())
+    return hashlib.sha256(f"{BUNDLE_CSS}\0{payload}".encode('utf-8')).hexdigest()
+
+def wrap_html(body):
+    """Complete HTML document (styles included) around a report body"""
+    return _HTML_HEAD + body + _HTML_TAIL
+
+def _criteria_list_html(parts, criteria_by_category):
+    """### category / - **criterion** sections, in CATEGORY_ORDER"""
+    for category in CATEGORY_ORDER:
+        if criteria_by_category.get(category):
+            parts.append(f"<h3>{escape(category)}</h3>\n<ul>\n")
+            for item in criteria_by_category[category]:
+                parts.append(f"<li><strong>{escape(item['name'])}</strong></li>\n")
+            parts.append("</ul>\n")
+
+def render_report_html(report_data):
+    """
+    Render a report straight from build_student_report_data() output to an
+    HTML body: the same sections as generate_markdown_report, without writing
+    and re-parsing markdown
+    """
+    parts = ["<h1>STUDENT EVALUATION REPORT</h1>\n"]
+
+    parts.append('<div class="header-info">\n')
+    parts.append(f"<p class=\"student-id\"><strong>Student ID:</strong> {escape(report_data['student_name'])}</p>\n")
+    parts.append(f"<p><strong>Assessment Date:</strong> {datetime.now().strftime('%Y-%m-%d')}</p>\n")
+    parts.append("</div>\n")
+
+    grade_info = report_data['grade_info']
+    if grade_info:
+        parts.append(f'<div class="final-score">FINAL SCORE: {grade_info.get("grade", 0):.1f} / 100</div>\n')
+
+    parts.append("<hr />\n<h2>Strengths</h2>\n")
+    if report_data['strengths']:
+        parts.append("<p>Notable accomplishments in your project:</p>\n")
+        _criteria_list_html(parts, report_data['strengths'])
+    else:
+        parts.append("<p><em>Focus on exploring advanced techniques and best practices in future projects.</em></p>\n")
+
+    parts.append("<hr />\n<h2>Areas for Improvement</h2>\n")
+    if report_data['improvements']:
+        parts.append("<p>The following criteria were not found in your submission. "
+                     "These represent opportunities to enhance your project:</p>\n")
+        _criteria_list_html(parts, report_data['improvements'])
+    else:
+        parts.append("<p><strong>Excellent!</strong> You have achieved all criteria.</p>\n")
+
+    parts.append("<hr />\n<h2>Category Breakdown</h2>\n<table>\n<thead>\n<tr>\n"
+                 "<th>Category</th>\n<th>Criteria Achieved</th>\n<th>Total</th>\n<th>Percentage</th>\n"
+                 "</tr>\n</thead>\n<tbody>\n")
+    for category in CATEGORY_ORDER:
+        if category in report_data['category_breakdown']:
+            achieved, total = report_data['category_breakdown'][category]
+            pct = (achieved / total * 100) if total > 0 else 0
+            parts.append(f"<tr>\n<td>{escape(category)}</td>\n<td>{achieved}</td>\n<td>{total}</td>\n<td>{pct:.0f}%</td>\n</tr>\n")
+    parts.append("</tbody>\n</table>\n")
+
+    parts.append("<hr />\n<p><em>This report was generated automatically by the Student Project Evaluator.</em>\n"
+                 "<em>For questions about this evaluation, please contact your instructor.</em></p>\n")
+    return "".join(parts)
+
 def convert_markdown_to_pdf(md_path, pdf_path):
     """Convert markdown file to PDF with professional styling"""
     try:
         import markdown2
-        from xhtml2pdf import pisa
     except ImportError as e:
         raise ImportError(f"Missing dependency: {e}. Install with: pip install markdown2 xhtml2pdf")
 
@@ -238,242 +543,299 @@ def convert_markdown_to_pdf(md_path, pdf_path):
         extras=['tables', 'fenced-code-blocks']
     )
 
-    # Professional CSS styling matching Detailed_Grade_Breakdown.pdf
-    css_style = """
-    @page {
-        size: A4;
-        margin: 2.5cm;
-    }
-
-    body {
-        font-family: 'Arial', sans-serif;
-        font-size: 11pt;
-        line-height: 1.6;
-        color: #333;
-    }
 
-    h1 {
-        color: #000;
-        text-align: center;
-        font-size: 28pt;
-        font-weight: bold;
-        margin: 20px 0 30px 0;
-        padding: 0;
-        border: none;
-        letter-spacing: 1px;
-    }
-
-    h2 {
-        color: #000;
-        font-size: 20pt;
-        font-weight: bold;
-        margin-top: 30px;
-        margin-bottom: 15px;
-        padding: 0;
-        border: none;
-    }
-
-    h3 {
-        color: #000;
-        font-size: 16pt;
-        font-weight: bold;
-        margin-top: 20px;
-        margin-bottom: 10px;
-    }
-
-    ul {
-        margin-left: 0;
-        padding-left: 20px;
-    }
-
-    li {
-        margin-bottom: 8px;
-    }
-
-    strong {
-        color: #2c3e50;
-        font-weight: 600;
-    }
-
-    hr {
-        border: none;
-        border-top: 1px solid #bdc3c7;
-        margin: 20px 0;
-    }
-
-    p {
-        margin: 10px 0;
-    }
+    # Create full HTML document
+    full_html = wrap_html(html_content)
 
-    /* Header info styling */
-    .header-info {
-        text-align: center;
-        margin-bottom: 30px;
-    }
+    convert_html_to_pdf(full_html, pdf_path)
 
-    .header-info p {
-        margin: 5px 0;
-        font-size: 11pt;
-        color: #555;
-    }
+def convert_html_to_pdf(full_html, pdf_path):
+    """Convert a complete HTML document (see wrap_html) to PDF"""
+    try:
+        from xhtml2pdf import pisa
+    except ImportError as e:
+        raise ImportError(f"Missing dependency: {e}. Install with: pip install xhtml2pdf")
 
-    /* Final score styling */
-    .final-score {
-        text-align: center;
-        font-size: 32pt;
-        font-weight: bold;
-        color: #f39c12;
-        margin: 30px 0;
-        letter-spacing: 1px;
-    }
+    with open(pdf_path, 'wb') as pdf_file:
+        pisa_status = pisa.CreatePDF(full_html, dest=pdf_file)
 
-    /* Table styling */
-    table {
-        width: 100%;
-        border-collapse: collapse;
-        margin: 15px 0;
-    }
+    if pisa_status.err:
+        raise Exception(f"PDF conversion failed with {pisa_status.err} errors")
 
-    th {
-        background-color: #5b9bd5;
-        color: white;
-        font-weight: bold;
-        padding: 10px;
-        text-align: left;
-        border: 1px solid #ddd;
-    }
+def render_pdf(full_html, pdf_path):
+    """
+    Pool task: convert one report, publishing the PDF only when complete
+    The PDF is written next to its final name and renamed into place, so a
+    killed or failed conversion never leaves a truncated <student>.pdf behind.
+    """
+    pdf_path = Path(pdf_path)
+    tmp_path = pdf_path.with_name(pdf_path.name + ".tmp")
+    try:
+        convert_html_to_pdf(full_html, tmp_path)
+        os.replace(tmp_path, pdf_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return str(pdf_path)
+
+def convert_reports(output_dir, html_reports, jobs=1, timeout=PDF_TIMEOUT, retries=1):
+    """
+    Convert {student: HTML body} to PDFs in a pool of jobs processes
+    Returns the failed conversion results (see task_pool.run_tasks)
+    """
+    done = 0
+
+    def report(result):
+        nonlocal done
+        done += 1
+        if result["ok"]:
+            retried = f", attempt {result['attempts']}" if result["attempts"] > 1 else ""
+            print(f"  [{done}/{len(html_reports)}] {result['key']}... OK ({result['elapsed']:.1f}s{retried})")
+        else:
+            print(f"  [{done}/{len(html_reports)}] {result['key']}... FAILED - {result['error']}")
 
-    td {
-        padding: 8px 10px;
-        border: 1px solid #ddd;
-    }
+    tasks = [(name, (wrap_html(body), str(output_dir / f"{name}.pdf"))) for name, body in html_reports.items()]
+    results = run_tasks(render_pdf, tasks, jobs=jobs, timeout=timeout, retries=retries, on_result=report)
 
-    tr:nth-child(even) {
-        background-color: #f9f9f9;
-    }
+    # Temporary files of conversions killed mid-write
+    for tmp_path in output_dir.glob("*.pdf.tmp"):
+        tmp_path.unlink()
+    return [result for result in results if not result["ok"]]
 
-    /* Status indicators */
-    .status-excellent {
-        color: #27ae60;
-        font-weight: bold;
-    }
+def convert_bundle(bundle_path, html_reports, timeout=PDF_TIMEOUT, retries=1):
+    """
+    Render {student: HTML body} into one PDF in a single xhtml2pdf pass
+    (stylesheet and fonts set up once), each student on a new page under
+    its own bookmark. Returns the failed conversion results.
+    """
+    body = "\n<pdf:nextpage />\n".join(html_reports.values())
+    full_html = wrap_html(body).replace("</style>", BUNDLE_CSS + "</style>", 1)
 
-    .status-fair {
-        color: #f39c12;
-        font-weight: bold;
-    }
+    # One task, so the time limit covers the whole cohort
+    results = run_tasks(render_pdf, [("cohort bundle", (full_html, str(bundle_path)))],
+                        timeout=timeout * max(1, len(html_reports)), retries=retries)
+    return [result for result in results if not result["ok"]]
 
-    .status-poor {
-        color: #e74c3c;
-        font-weight: bold;
-    }
+def split_bundle(bundle_path, student_names, output_dir, only=None):
     """
-
-    # Create full HTML document
-    full_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>{css_style}</style>
-    </head>
-    <body>
-        {html_content}
-    </body>
-    </html>
+    Write per-student PDFs from a bundle's page ranges
+    student_names is the bundle order; top-level bookmark k starts student k.
+    only limits which students are written. Returns the names written.
     """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError as e:
+        raise ImportError(f"Missing dependency: {e}. Install with: pip install pypdf")
 
-    # Convert to PDF
-    with open(pdf_path, 'wb') as pdf_file:
-        pisa_status = pisa.CreatePDF(full_html, dest=pdf_file)
-
-    if pisa_status.err:
-        raise Exception(f"PDF conversion failed with {pisa_status.err} errors")
+    reader = PdfReader(str(bundle_path))
+    starts = [reader.get_destination_page_number(item) for item in reader.outline if not isinstance(item, list)]
+    if len(starts) != len(student_names):
+        raise ValueError(f"{bundle_path.name} has {len(starts)} student bookmarks, expected {len(student_names)}")
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/generate_student_reports.py <WorkSubmissionsXX>")
-        print("\nExample:")
-        print("  python scripts/generate_student_reports.py WorkSubmissions05")
+    written = []
+    ends = starts[1:] + [len(reader.pages)]
+    for name, start, end in zip(student_names, starts, ends):
+        if only is not None and name not in only:
+            continue
+        writer = PdfWriter()
+        for page in reader.pages[start:end]:
+            writer.add_page(page)
+        pdf_path = output_dir / f"{name}.pdf"
+        tmp_path = pdf_path.with_name(pdf_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            writer.write(f)
+        os.replace(tmp_path, pdf_path)
+        written.append(name)
+    return written
+
+def print_failure_summary(failed, markdown_written=False):
+    """Group failed conversions by reason"""
+    timed_out = [r for r in failed if r["timed_out"]]
+    errors = defaultdict(list)
+    for r in failed:
+        if not r["timed_out"]:
+            errors[r["error"]].append(r["key"])
+
+    print(f"\n  WARNING: {len(failed)} PDF conversions failed")
+    if timed_out:
+        print(f"  Timed out ({len(timed_out)}): {', '.join(r['key'] for r in timed_out)}")
+    for error, students in sorted(errors.items(), key=lambda x: -len(x[1])):
+        print(f"  {error} ({len(students)}): {', '.join(students)}")
+    if markdown_written:
+        print(f"  Markdown files available for manual conversion")
+    else:
+        print(f"  Re-run with --markdown to keep Markdown copies for manual conversion")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate per-student PDF (and optionally Markdown) reports")
+    parser.add_argument("folder", help="WorkSubmissions folder name under outputs/ (e.g. WorkSubmissions05)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Processes for PDF conversion (default: 1)")
+    parser.add_argument("--timeout", type=float, default=PDF_TIMEOUT,
+                        help=f"Seconds one PDF conversion may take before it is killed (default: {PDF_TIMEOUT})")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="Extra attempts for a conversion that fails (default: 1)")
+    parser.add_argument("--markdown", action="store_true",
+                        help="Also write each report as Markdown (always written when PDF output is unavailable)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-render every report, even those whose inputs are unchanged since the last run")
+    parser.add_argument("--bundle", action="store_true",
+                        help=f"Render the whole cohort into one bookmarked PDF ({BUNDLE_FILE}) in a single pass")
+    parser.add_argument("--split", action="store_true",
+                        help="With --bundle: also write per-student PDFs cut from the bundle's page ranges")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_submissions_folder = args.folder
+    if args.split and not args.bundle:
+        print("Error: --split requires --bundle")
         sys.exit(1)
 
-    work_submissions_folder = sys.argv[1]
-
     print("\n" + "="*80)
     print("STUDENT REPORT GENERATOR")
     print("="*80)
 
     # Step 1: Load data
     print(f"\n[1/5] Loading criteria graph and grades...")
-    criteria_graph = load_criteria_graph(work_submissions_folder)
-    student_grades = load_student_grades(work_submissions_folder)
+    criteria_graph, student_grades, student_criteria = load_results(work_submissions_folder)
     print(f"  Loaded data for {len(student_grades)} students")
 
+    generate_reports(args, criteria_graph, student_grades, student_criteria,
+                     Path("outputs") / work_submissions_folder / "student_reports")
+
+def generate_reports(args, criteria_graph, student_grades, student_criteria, output_dir):
+    """
+    Steps 2-5: build and render every student's report into output_dir
+    args are parse_args() options; student_criteria may be None (inverted from the graph).
+    Returns the failed PDF conversions (see task_pool.run_tasks).
+    """
+    index = ReportIndex(criteria_graph, student_criteria)
+
     # Step 2: Create output directory
     print(f"\n[2/5] Creating output directory...")
-    output_dir = Path("outputs") / work_submissions_folder / "student_reports"
+    output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"  Created: {output_dir}")
 
-    # Step 3: Generate markdown reports
-    print(f"\n[3/5] Generating markdown reports...")
+    # PDFs are rendered straight from HTML; only xhtml2pdf is needed
+    try:
+        from xhtml2pdf import pisa
+        pdf_available = True
+    except ImportError:
+        pdf_available = False
+    write_markdown = args.markdown or not pdf_available
+
+    # Step 3: Build reports (only those whose inputs changed since the last run)
+    print(f"\n[3/5] Building reports...")
     student_names = sorted(student_grades.keys())
+    previous, previous_bundle = ({}, None) if args.force else load_manifest(output_dir)
+    individual_pdfs = pdf_available and (not args.bundle or args.split)
+    manifest = {}
+    html_reports = {}
+    bundle_reports = {}
+    unchanged = 0
+
+    report_data_by_student = {
+        student_name: build_student_report_data(student_name, criteria_graph, student_grades, index)
+        for student_name in student_names
+    }
+    fingerprints = {name: report_fingerprint(data) for name, data in report_data_by_student.items()}
+
+    # The bundle is re-rendered only when some report (or the student list) changed
+    bundle_path = output_dir / BUNDLE_FILE
+    bundle = bundle_fingerprint(fingerprints) if pdf_available and args.bundle else previous_bundle
+    rebuild_bundle = pdf_available and args.bundle and (bundle != previous_bundle or not bundle_path.exists())
 
     for i, student_name in enumerate(student_names, 1):
+        report_data = report_data_by_student[student_name]
+        fingerprint = fingerprints[student_name]
+        last = previous.get(student_name, {})
+        entry = manifest[student_name] = {}
+
+        need_pdf = individual_pdfs and not (
+            last.get("pdf") == fingerprint and (output_dir / f"{student_name}.pdf").exists())
+        need_md = write_markdown and not (
+            last.get("md") == fingerprint and (output_dir / f"{student_name}.md").exists())
+
+        # Keep outputs this run leaves untouched
+        for kind in ("pdf", "md"):
+            if kind in last and (output_dir / f"{student_name}.{kind}").exists():
+                entry[kind] = last[kind]
+
+        if rebuild_bundle:
+            bundle_reports[student_name] = render_report_html(report_data)
+
+        if not (need_pdf or need_md or rebuild_bundle):
+            unchanged += 1
+            continue
         print(f"  [{i}/{len(student_names)}] {student_name}...")
 
-        report_data = build_student_report_data(
-            student_name, criteria_graph, student_grades
-        )
+        if need_pdf:
+            # With --bundle the PDF is cut from the bundle and needs no HTML of its own
+            html_reports[student_name] = bundle_reports.get(student_name) if args.bundle else \
+                render_report_html(report_data)
+        if need_md:
+            generate_markdown_report(report_data, output_dir / f"{student_name}.md")
+            entry["md"] = fingerprint
 
-        md_path = output_dir / f"{student_name}.md"
-        generate_markdown_report(report_data, md_path)
-
-    print(f"  Generated {len(student_names)} markdown reports")
+    print(f"  Built {len(student_names) - unchanged} reports ({unchanged} unchanged, skipped)")
 
     # Step 4: Convert to PDF
     print(f"\n[4/5] Converting to PDF...")
 
-    # Check if dependencies are available
-    try:
-        import markdown2
-        from xhtml2pdf import pisa
-        pdf_available = True
-    except ImportError:
-        pdf_available = False
-        print("  WARNING: markdown2 or xhtml2pdf not installed")
-        print("  Install with: pip install markdown2 xhtml2pdf")
-        print("  Skipping PDF generation...")
-
     failed_conversions = []
 
-    if pdf_available:
-        for i, student_name in enumerate(student_names, 1):
-            print(f"  [{i}/{len(student_names)}] {student_name}...", end='', flush=True)
+    if pdf_available and args.bundle:
+        if rebuild_bundle:
+            print(f"  Rendering {len(bundle_reports)} reports into {BUNDLE_FILE}...", flush=True)
+            failed_conversions = convert_bundle(bundle_path, bundle_reports, timeout=args.timeout,
+                                                retries=max(0, args.retries))
+        else:
+            print(f"  {BUNDLE_FILE} up to date")
 
-            md_path = output_dir / f"{student_name}.md"
-            pdf_path = output_dir / f"{student_name}.pdf"
+        if failed_conversions:
+            bundle = None
+            # Nothing to split; every requested per-student PDF failed with the bundle
+            failed_conversions = [dict(failed_conversions[0], key=name) for name in html_reports] or failed_conversions
+        elif html_reports:
+            split_bundle(bundle_path, student_names, output_dir, only=html_reports)
+            print(f"  Split {len(html_reports)} per-student PDFs from {BUNDLE_FILE}")
 
-            try:
-                convert_markdown_to_pdf(md_path, pdf_path)
-                print(" OK")
-            except Exception as e:
-                failed_conversions.append(student_name)
-                print(f" FAILED - {e}")
+    elif pdf_available:
+        failed_conversions = convert_reports(output_dir, html_reports, jobs=max(1, args.jobs),
+                                             timeout=args.timeout, retries=max(0, args.retries))
+
+    if pdf_available:
+        # Failed conversions stay out of the manifest and are retried next run
+        failed_names = {result["key"] for result in failed_conversions}
+        for student_name in html_reports:
+            if student_name in failed_names:
+                manifest[student_name].pop("pdf", None)
+            else:
+                manifest[student_name]["pdf"] = fingerprints[student_name]
 
         if failed_conversions:
-            print(f"\n  WARNING: {len(failed_conversions)} PDF conversions failed")
-            print(f"  Markdown files available for manual conversion")
-        else:
-            print(f"  Generated {len(student_names)} PDF reports")
+            print_failure_summary(failed_conversions, write_markdown)
+        elif individual_pdfs:
+            print(f"  Generated {len(html_reports)} PDF reports ({len(student_names) - len(html_reports)} up to date)")
+    else:
+        print("  WARNING: xhtml2pdf not installed")
+        print("  Install with: pip install xhtml2pdf")
+        print("  Skipping PDF generation (Markdown reports written instead)...")
+
+    save_manifest(output_dir, manifest, bundle)
 
     # Step 5: Summary
     print(f"\n[5/5] Summary")
     print(f"  Generated files:")
-    print(f"    - {len(student_names)} markdown reports (.md)")
-    if pdf_available and not failed_conversions:
+    if write_markdown:
+        print(f"    - {len(student_names)} markdown reports (.md)")
+    if pdf_available and args.bundle and bundle is not None:
+        print(f"    - {BUNDLE_FILE} ({len(student_names)} students, bookmarked)")
+    if individual_pdfs and not failed_conversions:
         print(f"    - {len(student_names)} PDF reports (.pdf)")
-    elif pdf_available:
+    elif individual_pdfs:
         print(f"    - {len(student_names) - len(failed_conversions)} PDF reports (.pdf)")
     print(f"  Location: {output_dir.absolute()}")
 
@@ -481,6 +843,7 @@ def main():
     print("REPORT GENERATION COMPLETE!")
     print("="*80)
     print(f"\nReports saved to: {output_dir.absolute()}")
+    return failed_conversions
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Parallel tier-2 grading orchestrator
+Runs the tier2-orchestrator skill over every cloned repository in a cohort.
+Jobs run in a pool of worker processes (one per core by default), each with
+its own time budget. A job returns the assessment JSON the skill wrote, sent
+back over the worker's pipe, rather than a score scraped from stdout. Every
+finished job is recorded in a checkpoint file, so a crashed or interrupted
+run resumes with the repositories it had not graded yet.
+
+Usage:
+    python scripts/grade_orchestrator.py tests/WorkSubmissions05 --jobs 8
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+from pathlib import Path
+
+from task_pool import run_tasks
+
+PROJECT_ROOT = Path(__file__).parent.parent
+ORCHESTRATOR = PROJECT_ROOT / ".claude" / "skills" / "tier2-orchestrator" / "orchestrate.py"
+
+CHECKPOINT_FILE = ".grade_checkpoint.json"
+ASSESSMENT_GLOB = "assessments_tier2_*/tier2_assessment_{id}.json"
+
+# Seconds one repository may take; the worker gets a little longer to report
+JOB_BUDGET = 120
+_REPORT_GRACE = 15
+
+# Lines of the skill's output kept for a failed job
+_LOG_TAIL = 20
+
+
+def find_repos(worksubmissions_folder):
+    """[(participant_id, repo_path)] for participant folders holding a cloned repository"""
+    submissions = []
+    for folder in sorted(Path(worksubmissions_folder).glob("Participant_*")):
+        repos = sorted(d for d in folder.iterdir() if d.is_dir() and not d.name.endswith(".partial"))
+        if repos:
+            submissions.append((folder.name.split('_')[1], repos[0]))
+    return submissions
+
+
+def _kill(process):
+    """Kill a job and anything it started"""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+    except OSError:
+        pass
+    process.kill()
+
+
+def _latest_assessment(worksubmissions_folder, participant_id, since):
+    """The assessment file this job wrote, or None"""
+    written = [p for p in Path(worksubmissions_folder).glob(ASSESSMENT_GLOB.format(id=participant_id))
+               if p.stat().st_mtime >= since]
+    return max(written, key=lambda p: p.stat().st_mtime) if written else None
+
+
+def grade_repo(orchestrator, worksubmissions_folder, participant_id, repo_path, assignment, budget=JOB_BUDGET):
+    """
+    Grade one repository (runs in a pool worker)
+
+    Runs the skill in its own process group so a job over budget is killed
+    together with any helpers it started. Returns a JSON-serialisable dict
+    with the assessment; raises RuntimeError when there is none.
+    """
+    start = time.time()
+    process = subprocess.Popen(
+        [sys.executable, str(orchestrator), str(repo_path), participant_id, assignment],
+        cwd=str(worksubmissions_folder), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, errors='replace', start_new_session=(os.name == 'posix'))
+    try:
+        output, _ = process.communicate(timeout=budget)
+    except subprocess.TimeoutExpired:
+        _kill(process)
+        process.communicate()
+        raise RuntimeError(f"over its {budget:g}s budget")
+
+    tail = "\n".join(output.strip().splitlines()[-_LOG_TAIL:])
+    if process.returncode != 0:
+        raise RuntimeError(f"orchestrator exited with code {process.returncode}\n{tail}")
+    assessment_file = _latest_assessment(worksubmissions_folder, participant_id, start - 1)
+    if assessment_file is None:
+        raise RuntimeError(f"orchestrator wrote no assessment\n{tail}")
+    with open(assessment_file, encoding='utf-8') as f:
+        assessment = json.load(f)
+    return {
+        "total_score": assessment.get("total_score"),
+        "final_grade": assessment.get("final_grade"),
+        "performance_tier": assessment.get("performance_tier"),
+        "skills": assessment.get("skills", {}),
+        "assessment_file": str(assessment_file.relative_to(worksubmissions_folder)),
+    }
+
+
+def load_checkpoint(worksubmissions_folder):
+    """{participant_id: entry} from a previous (possibly interrupted) run"""
+    path = Path(worksubmissions_folder) / CHECKPOINT_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get("jobs", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(worksubmissions_folder, checkpoint):
+    path = Path(worksubmissions_folder) / CHECKPOINT_FILE
+    tmp_path = path.with_name(CHECKPOINT_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"jobs": checkpoint}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def grade_cohort(worksubmissions_folder, orchestrator=ORCHESTRATOR, assignment="Assignment 5",
+                 jobs=None, budget=JOB_BUDGET, retries=0, force=False, retry_failed=False,
+                 on_result=None):
+    """
+    Grade every cloned repository in a cohort
+
+    jobs defaults to the number of cores. Repositories graded in an earlier
+    run (same repository path) are skipped unless force is set; failed ones
+    are retried only with retry_failed. The checkpoint is rewritten after
+    each job. on_result is called with (participant_id, entry).
+    Returns (graded, skipped): {participant_id: entry} for this run's jobs
+    and {participant_id: entry} for those taken from the checkpoint.
+    """
+    worksubmissions_folder = Path(worksubmissions_folder).resolve()
+    checkpoint = load_checkpoint(worksubmissions_folder)
+    submissions = find_repos(worksubmissions_folder)
+
+    tasks = []
+    skipped = {}
+    for participant_id, repo_path in submissions:
+        previous = checkpoint.get(participant_id)
+        if (previous and not force and previous.get("repo") == repo_path.name
+                and (previous["status"] == "done" or not retry_failed)):
+            skipped[participant_id] = previous
+            continue
+        tasks.append((participant_id, (str(orchestrator), str(worksubmissions_folder), participant_id,
+                                       str(repo_path), assignment, budget)))
+
+    repos = dict(submissions)
+    graded = {}
+
+    def record(result):
+        participant_id = result["key"]
+        entry = {"repo": repos[participant_id].name, "attempts": result["attempts"],
+                 "elapsed": round(result["elapsed"], 2)}
+        if result["ok"]:
+            entry.update(result["value"], status="done")
+        else:
+            entry.update(status="failed", error=result["error"])
+        checkpoint[participant_id] = graded[participant_id] = entry
+        save_checkpoint(worksubmissions_folder, checkpoint)
+        if on_result:
+            on_result(participant_id, entry)
+
+    if tasks:
+        run_tasks(grade_repo, tasks, jobs=jobs or os.cpu_count() or 1,
+                  timeout=budget + _REPORT_GRACE, retries=retries, on_result=record)
+    return graded, skipped
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a cohort's repositories with the tier2-orchestrator skill")
+    parser.add_argument("folder", help="WorkSubmissions folder containing Participant_* folders")
+    parser.add_argument("--assignment", default="Assignment 5", help="Assignment name passed to the skill")
+    parser.add_argument("--orchestrator", default=str(ORCHESTRATOR), help="Path to orchestrate.py")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Repositories graded at once (default: number of cores)")
+    parser.add_argument("--budget", type=float, default=JOB_BUDGET,
+                        help=f"Seconds one repository may take (default: {JOB_BUDGET})")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="Extra attempts for a job that failed (default: 0)")
+    parser.add_argument("--force", action="store_true", help="Re-grade repositories graded before")
+    parser.add_argument("--retry-failed", action="store_true", help="Re-run jobs that failed last time")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    folder = Path(args.folder)
+    if not Path(args.orchestrator).exists():
+        print(f"Error: orchestrator not found: {args.orchestrator}")
+        return 1
+
+    def report(participant_id, entry):
+        if entry["status"] == "done":
+            print(f"{participant_id}: OK ({entry['total_score']}/100, {entry['elapsed']}s)", flush=True)
+        else:
+            print(f"{participant_id}: FAILED - {entry['error'].splitlines()[0]}", flush=True)
+
+    graded, skipped = grade_cohort(folder, args.orchestrator, args.assignment, args.jobs, args.budget,
+                                   args.retries, args.force, args.retry_failed, on_result=report)
+    if skipped:
+        print(f"\n{len(skipped)} repositories already graded (see {CHECKPOINT_FILE}; --force to re-grade)")
+
+    failed = [pid for pid, entry in graded.items() if entry["status"] != "done"]
+    print(f"\n{'='*60}")
+    print(f"Grading complete!")
+    print(f"  Success: {len(graded) - len(failed)}")
+    print(f"  Failed: {len(failed)}")
+    print(f"  From checkpoint: {len(skipped)}")
+    print(f"{'='*60}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compiled multi-keyword matcher
+Finds every occurrence of a fixed keyword set in one pass over a document
+"""
+
+import re
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick style matcher over a fixed set of literal keywords.
+
+    All keywords are compiled into a single lookahead alternation, so one
+    scan reports every (possibly overlapping) occurrence. Alternatives are
+    ordered longest-first: at a given offset the regex returns the longest
+    keyword that matches there, and every shorter keyword matching at the
+    same offset is necessarily a prefix of it, which is precomputed.
+
+    Newlines are tracked in the same pass so each hit carries its line number.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = sorted(set(keywords), key=lambda k: (-len(k), k))
+        if not self.keywords:
+            raise ValueError("KeywordMatcher needs at least one keyword")
+
+        # keyword -> all keywords that also match at the same offset
+        self._prefixes = {
+            kw: tuple(other for other in self.keywords if kw.startswith(other))
+            for kw in self.keywords
+        }
+
+        alternation = '|'.join(re.escape(kw) for kw in self.keywords)
+        self._pattern = re.compile(rf'(?=({alternation}))|\n')
+
+    def scan(self, text):
+        """
+        Yield (line_no, offset, keyword) for every keyword occurrence in text.
+        Line numbers are 0-based and count '\\n' separators, like str.split('\\n').
+        """
+        line_no = 0
+        for match in self._pattern.finditer(text):
+            keyword = match.group(1)
+            if keyword is None:
+                line_no += 1
+                continue
+            offset = match.start()
+            for kw in self._prefixes[keyword]:
+                yield line_no, offset, kw
+
+    def line_hits(self, text):
+        """
+        Group keyword occurrences by line.
+        Returns (hits, line_count) where hits maps line_no -> set of keywords.
+        """
+        hits = {}
+        for line_no, _, keyword in self.scan(text):
+            hits.setdefault(line_no, set()).add(keyword)
+        return hits, text.count('\n') + 1
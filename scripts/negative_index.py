@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Per-document negative-indicator index
+Scans a document once and answers "is there a negative indicator near
+this position?" with a bisect instead of re-running every regex on a window
+"""
+
+import re
+from bisect import bisect_left
+
+# Greedy ".*" becomes lazy so each start offset records its shortest match
+_GREEDY_ANY = re.compile(r'(?<!\\)\.\*(?![?+])')
+_GLOBAL_FLAGS = re.compile(r'^\(\?[aiLmsux]+\)')
+
+
+def compile_indicators(patterns, flags=0):
+    """
+    Compile negative indicator regexes once per process.
+    Each pattern is wrapped in a lookahead so overlapping hits are all reported.
+    """
+    compiled = []
+    for pattern in patterns:
+        if isinstance(pattern, re.Pattern):
+            pattern, pattern_flags = pattern.pattern, pattern.flags
+        else:
+            pattern_flags = 0
+        # Inline global flags such as "(?i)" must stay at the front
+        global_flags = _GLOBAL_FLAGS.match(pattern)
+        prefix = global_flags.group(0) if global_flags else ''
+        lazy = _GREEDY_ANY.sub('.*?', pattern[len(prefix):])
+        compiled.append(re.compile(f'{prefix}(?=({lazy}))', flags | pattern_flags))
+    return compiled
+
+
+class NegativeContextIndex:
+    """
+    Sorted offsets of every negative-indicator hit in one document.
+
+    A position counts as negative when some hit lies entirely inside the
+    window [start - radius, end + radius]. Unlike searching a slice of the
+    window, \\b, ^ and $ only match at real boundaries in the document, not
+    at the slice edges (an intended change, see scripts/README.md).
+    """
+
+    def __init__(self, text, indicators):
+        hits = []
+        for indicator in indicators:
+            for match in indicator.finditer(text):
+                hits.append((match.start(1), match.end(1)))
+        hits.sort()
+        self.starts = [start for start, _ in hits]
+        self.ends = [end for _, end in hits]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def near(self, start, end=None, radius=200):
+        """Return True if a negative hit fits within radius chars of [start, end]"""
+        if end is None:
+            end = start
+        low = max(0, start - radius)
+        high = end + radius
+
+        i = bisect_left(self.starts, low)
+        while i < len(self.starts) and self.starts[i] < high:
+            if self.ends[i] <= high:
+                return True
+            i += 1
+        return False
@@ -20,7 +20,9 @@ def organize_outputs(submission_name):
 
     # Files to move
     files_to_move = [
+        "results.sqlite3",
         "criteria_graph_final.json",
+        "student_criteria.json",
         "grades.xlsx",
         "Student_Evaluation_Report.xlsx",
         "EVALUATION_SUMMARY.md",
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Evaluation pipeline
+Runs evaluation, grade comparison and student reports as one DAG in a
+single process. Results pass between stages in memory and every stage
+writes straight into outputs/<submission>/ (no organize step). Each stage
+records a key of its inputs (upstream results, the files it reads and its
+own code) in outputs/<submission>/.pipeline_state.json; a rerun skips the
+stages whose key is unchanged and whose outputs still exist.
+
+Usage:
+    python scripts/pipeline.py tests/WorkSubmissions05 --workers 8 --jobs 4
+    python scripts/pipeline.py tests/WorkSubmissions05 --stages reports --bundle
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from graphlib import TopologicalSorter
+from modulefinder import ModuleFinder
+
+import run_evaluation
+import generate_student_reports
+from results_store import RESULTS_DB, ResultsStore, grades_by_student, results_path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = Path(__file__).parent
+SKILLS_DIR = PROJECT_ROOT / ".claude" / "skills"
+COMPARISON_SKILL = SKILLS_DIR / "grade-comparison" / "scripts"
+
+STATE_FILE = ".pipeline_state.json"
+COMPARISON_FILE = "grade_comparison.xlsx"
+
+
+def local_imports(script, search_path):
+    """Files of script and every module it imports (directly or not) from search_path"""
+    finder = ModuleFinder(path=[str(folder) for folder in search_path])
+    finder.run_script(str(script))
+    return sorted(Path(module.__file__) for module in finder.modules.values() if module.__file__)
+
+
+# Code each stage's results depend on; editing any of it reruns the stage
+EVALUATE_SOURCES = (local_imports(SCRIPTS_DIR / "run_evaluation.py",
+                                  [SCRIPTS_DIR, SKILLS_DIR / "evaluating-student-projects"])
+                    + sorted((SCRIPTS_DIR / "rules").glob("*.json"))
+                    + sorted((SKILLS_DIR / "evaluating-student-projects").glob("*.py")))
+COMPARE_SOURCES = sorted(COMPARISON_SKILL.glob("*.py"))
+REPORT_SOURCES = [SCRIPTS_DIR / "generate_student_reports.py", SCRIPTS_DIR / "task_pool.py"]
+
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def source_digest(paths):
+    """Hash of the given files' contents (missing files count as empty)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(str(Path(path).name).encode('utf-8') + b"\0")
+        if Path(path).exists():
+            digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def tree_digest(worksubmissions_folder, suffixes=None):
+    """
+    Hash of the Participant_* folders' file listing (path, size, mtime)
+    Only files ending with one of suffixes when given. Contents are not read,
+    so this stays cheap on large cohorts.
+    """
+    digest = hashlib.sha256()
+    folder = Path(worksubmissions_folder)
+    for participant in sorted(folder.glob("Participant_*")):
+        for root, dirs, files in os.walk(participant):
+            dirs.sort()
+            for name in sorted(files):
+                if suffixes and not name.lower().endswith(suffixes):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                digest.update(f"{os.path.relpath(path, folder)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+# Stages. key(ctx, upstream digests) -> input key; run(ctx, upstream values)
+# -> (value, digest), where a digest of None means "do not cache this run";
+# load(ctx) -> value of a cached run, for downstream stages that need it.
+
+def _evaluate_key(ctx, upstream):
+    return _digest(str(ctx["folder"]), tree_digest(ctx["folder"]), source_digest(EVALUATE_SOURCES))
+
+
+def _evaluate_run(ctx, upstream):
+    criteria_graph, student_criteria, grades, assignment_type, category_counts = \
+        run_evaluation.evaluate_cohort(ctx["folder"], ctx["args"].workers)
+    print(f"\n[Step 10/12] Generating output files...")
+    run_evaluation.write_outputs(ctx["output_dir"], criteria_graph, student_criteria, grades,
+                                 ctx["folder"], assignment_type, category_counts)
+    value = {"criteria_graph": criteria_graph, "student_criteria": student_criteria,
+             "grades": grades_by_student(grades)}
+    return value, _digest(value)
+
+
+def _evaluate_load(ctx):
+    with ResultsStore(results_path(ctx["output_dir"])) as store:
+        return {"criteria_graph": store.criteria_graph(), "student_criteria": store.student_criteria(),
+                "grades": store.grades()}
+
+
+def _compare_key(ctx, upstream):
+    return _digest(upstream["evaluate"], tree_digest(ctx["folder"], (".pdf",)), source_digest(COMPARE_SOURCES))
+
+
+def _compare_run(ctx, upstream):
+    if not COMPARISON_SKILL.is_dir():
+        print(f"  Skipped: grade-comparison skill not found ({COMPARISON_SKILL})")
+        return None, None
+    sys.path.insert(0, str(COMPARISON_SKILL))
+    import compare_grades
+
+    evaluator_grades = upstream["evaluate"]["grades"]
+    student_folders = compare_grades.find_student_folders(str(ctx["folder"]))
+    results = compare_grades.extract_actual_grades(student_folders, evaluator_grades)
+    stats = compare_grades.calculate_statistics(results)
+    compare_grades.print_summary(stats)
+    output_path = ctx["output_dir"] / COMPARISON_FILE
+    compare_grades.generate_excel_report(results, stats, str(output_path))
+    print(f"  Comparison saved to: {output_path}")
+    return None, ""
+
+
+def _reports_args(ctx):
+    args = ctx["args"]
+    argv = [ctx["name"], "--jobs", str(args.jobs), "--timeout", str(args.timeout),
+            "--retries", str(args.retries)]
+    argv += [flag for flag, on in (("--markdown", args.markdown), ("--bundle", args.bundle),
+                                   ("--split", args.split), ("--force", args.force)) if on]
+    return generate_student_reports.parse_args(argv)
+
+
+def _reports_key(ctx, upstream):
+    try:
+        import xhtml2pdf  # noqa: F401  (PDF output depends on it being installed)
+        pdf_available = True
+    except ImportError:
+        pdf_available = False
+    args = ctx["args"]
+    return _digest(upstream["evaluate"], source_digest(REPORT_SOURCES), pdf_available,
+                   args.markdown, args.bundle, args.split)
+
+
+def _reports_run(ctx, upstream):
+    evaluated = upstream["evaluate"]
+    failed = generate_student_reports.generate_reports(
+        _reports_args(ctx), evaluated["criteria_graph"], evaluated["grades"],
+        evaluated["student_criteria"], ctx["output_dir"] / "student_reports")
+    # Failed conversions are retried on the next run
+    return None, None if failed else ""
+
+
+STAGES = {
+    "evaluate": {"deps": (), "key": _evaluate_key, "run": _evaluate_run, "load": _evaluate_load,
+                 "outputs": (RESULTS_DB, "criteria_graph_final.json", "grades.xlsx", "EVALUATION_SUMMARY.md")},
+    "compare": {"deps": ("evaluate",), "key": _compare_key, "run": _compare_run, "load": None,
+                "outputs": (COMPARISON_FILE,)},
+    "reports": {"deps": ("evaluate",), "key": _reports_key, "run": _reports_run, "load": None,
+                "outputs": ("student_reports",)},
+}
+
+
+def stage_order(targets):
+    """targets plus everything they depend on, dependencies first"""
+    needed = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(STAGES[name]["deps"])
+    return list(TopologicalSorter({name: STAGES[name]["deps"] for name in needed}).static_order())
+
+
+def load_state(output_dir):
+    path = Path(output_dir) / STATE_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get("stages", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(output_dir, state):
+    path = Path(output_dir) / STATE_FILE
+    tmp_path = path.with_name(STATE_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"stages": state}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def run_pipeline(args):
+    """Run the requested stages (and their dependencies) for args.folder; returns {stage: status}"""
+    folder = Path(args.folder)
+    name = folder.name
+    output_dir = Path(args.output_root) / name
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ctx = {"folder": folder, "name": name, "output_dir": output_dir, "args": args}
+
+    state = load_state(output_dir)
+    values = {}
+    digests = {}
+    statuses = {}
+
+    def value_of(stage_name):
+        if stage_name not in values:
+            values[stage_name] = STAGES[stage_name]["load"](ctx)
+        return values[stage_name]
+
+    for stage_name in stage_order(args.stages):
+        stage = STAGES[stage_name]
+        key = stage["key"](ctx, {dep: digests[dep] for dep in stage["deps"]})
+        previous = state.get(stage_name, {})
+        outputs_exist = all((output_dir / output).exists() for output in stage["outputs"])
+
+        print("\n" + "=" * 80)
+        if not args.force and previous.get("key") == key and outputs_exist:
+            print(f"STAGE {stage_name}: up to date")
+            digests[stage_name] = previous["digest"]
+            statuses[stage_name] = "cached"
+            continue
+        print(f"STAGE {stage_name}")
+        print("=" * 80)
+
+        start = time.perf_counter()
+        value, digest = stage["run"](ctx, {dep: value_of(dep) for dep in stage["deps"]})
+        elapsed = time.perf_counter() - start
+        values[stage_name] = value
+        digests[stage_name] = digest if digest else key
+
+        if digest is None:
+            state.pop(stage_name, None)
+            statuses[stage_name] = "incomplete"
+        else:
+            state[stage_name] = {"key": key, "digest": digests[stage_name], "elapsed": round(elapsed, 2),
+                                 "finished": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            statuses[stage_name] = "ran"
+        save_state(output_dir, state)
+    return statuses
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run evaluation, grade comparison and student reports as one pipeline")
+    parser.add_argument("folder", help="WorkSubmissions folder containing Participant_* folders")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"Comma-separated stages to bring up to date, with their dependencies "
+                             f"(default: {','.join(STAGES)})")
+    parser.add_argument("--force", action="store_true", help="Rerun every selected stage")
+    parser.add_argument("--output-root", default="outputs",
+                        help="Results go to <output-root>/<submission>/ (default: outputs)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for per-student discovery")
+    parser.add_argument("--jobs", type=int, default=1, help="Processes for PDF conversion")
+    parser.add_argument("--timeout", type=float, default=generate_student_reports.PDF_TIMEOUT,
+                        help="Seconds one PDF conversion may take")
+    parser.add_argument("--retries", type=int, default=1, help="Extra attempts for a failed PDF conversion")
+    parser.add_argument("--markdown", action="store_true", help="Also write Markdown reports")
+    parser.add_argument("--bundle", action="store_true", help="Render one bookmarked cohort PDF")
+    parser.add_argument("--split", action="store_true", help="With --bundle: also cut per-student PDFs")
+    args = parser.parse_args(argv)
+
+    args.stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in args.stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    if args.split and not args.bundle:
+        parser.error("--split requires --bundle")
+    args.workers = max(1, args.workers)
+    return args
+
+
+def main():
+    args = parse_args()
+    if not Path(args.folder).is_dir():
+        print(f"Error: {args.folder} not found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    statuses = run_pipeline(args)
+
+    print("\n" + "=" * 80)
+    print("PIPELINE COMPLETE")
+    print("=" * 80)
+    for stage_name, status in statuses.items():
+        print(f"  {stage_name:<10} {status}")
+    print(f"\nOutputs: {(Path(args.output_root) / Path(args.folder).name).absolute()}"
+          f" ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
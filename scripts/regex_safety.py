@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Static check for regexes prone to catastrophic backtracking
+Walks a pattern's parse tree and reports shapes that make Python's
+backtracking engine slow on long input:
+
+- exponential: a quantified group whose body can match the same text in
+  more than one way, e.g. (a+)+, (\\w+\\s?)*, (\\w|\\d)+
+- quadratic: an unbounded wildcard in the middle of an unanchored pattern,
+  e.g. \\bno .* currently\\b, or two overlapping unbounded repeats in a row,
+  e.g. .*\\d+ - every start position may scan to the end of the line, which
+  hurts on minified tables and inline base64 images
+
+The check is conservative: it may flag a harmless pattern, but it should
+not miss these shapes. Character classes are compared over ASCII plus a
+few coarse non-ASCII groups.
+"""
+
+import re
+
+try:
+    from re import _parser as _sre_parse, _constants as _sre
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+    import sre_constants as _sre
+
+EXPONENTIAL = "exponential"
+QUADRATIC = "quadratic"
+
+_REPEATS = {_sre.MAX_REPEAT, _sre.MIN_REPEAT}
+_ZERO_WIDTH = {_sre.AT, _sre.ASSERT, _sre.ASSERT_NOT}
+# Repeats and groups the engine never backtracks into
+_NO_BACKTRACK = {getattr(_sre, name) for name in ("POSSESSIVE_REPEAT", "ATOMIC_GROUP") if hasattr(_sre, name)}
+
+# Character sets: ASCII code points plus markers for non-ASCII groups
+_NON_ASCII = frozenset({"u_digit", "u_word", "u_space", "u_other"})
+_ALL = frozenset(range(128)) | _NON_ASCII
+_DIGIT = frozenset(range(48, 58)) | {"u_digit"}
+_WORD = frozenset(c for c in range(128) if chr(c).isalnum() or c == 95) | {"u_digit", "u_word"}
+_SPACE = frozenset(map(ord, " \t\n\r\f\v")) | {"u_space"}
+_CATEGORIES = {
+    _sre.CATEGORY_DIGIT: _DIGIT, _sre.CATEGORY_NOT_DIGIT: _ALL - _DIGIT,
+    _sre.CATEGORY_WORD: _WORD, _sre.CATEGORY_NOT_WORD: _ALL - _WORD,
+    _sre.CATEGORY_SPACE: _SPACE, _sre.CATEGORY_NOT_SPACE: _ALL - _SPACE,
+}
+
+# A repeated class covering this many ASCII characters runs to the end of the line
+_BROAD = 64
+
+
+def _literal(code, ignorecase):
+    if code >= 128:
+        return frozenset({"u_word" if chr(code).isalnum() else "u_other"})
+    if ignorecase and chr(code).isalpha():
+        return frozenset({code, ord(chr(code).swapcase())})
+    return frozenset({code})
+
+
+def _class(items, ignorecase):
+    chars = set()
+    negate = False
+    for op, av in items:
+        if op is _sre.NEGATE:
+            negate = True
+        elif op is _sre.LITERAL:
+            chars |= _literal(av, ignorecase)
+        elif op is _sre.RANGE:
+            low, high = av
+            for code in range(low, min(high, 127) + 1):
+                chars |= _literal(code, ignorecase)
+            if high >= 128:
+                chars |= {"u_word", "u_other"}
+        elif op is _sre.CATEGORY:
+            chars |= _CATEGORIES.get(av, _ALL)
+        else:
+            chars |= _ALL
+    return _ALL - chars if negate else frozenset(chars)
+
+
+def _children(op, av):
+    """Sub-sequences of one parse-tree item"""
+    if op in _REPEATS or op is getattr(_sre, "POSSESSIVE_REPEAT", None):
+        return [av[2]]
+    if op is _sre.SUBPATTERN:
+        return [av[-1]]
+    if op is _sre.BRANCH:
+        return list(av[1])
+    if op in (_sre.ASSERT, _sre.ASSERT_NOT):
+        return [av[1]]
+    if op is getattr(_sre, "ATOMIC_GROUP", None):
+        return [av]
+    if op is _sre.GROUPREF_EXISTS:
+        return [seq for seq in av[1:] if seq is not None]
+    return []
+
+
+def _unbounded(op, av):
+    return op in _REPEATS and av[1] == _sre.MAXREPEAT
+
+
+class _Analyzer:
+    def __init__(self, ignorecase):
+        self.ignorecase = ignorecase
+        self.risks = []
+
+    def add(self, severity, message):
+        if (severity, message) not in self.risks:
+            self.risks.append((severity, message))
+
+    # -- properties of sequences ----------------------------------------
+
+    def nullable(self, seq):
+        return all(self.item_nullable(op, av) for op, av in seq)
+
+    def item_nullable(self, op, av):
+        if op in _REPEATS or op is getattr(_sre, "POSSESSIVE_REPEAT", None):
+            return av[0] == 0 or self.nullable(av[2])
+        if op in _ZERO_WIDTH or op is _sre.GROUPREF:
+            return True
+        if op is _sre.BRANCH:
+            return any(self.nullable(branch) for branch in av[1])
+        if op in (_sre.SUBPATTERN,) or op is getattr(_sre, "ATOMIC_GROUP", None):
+            return self.nullable(_children(op, av)[0])
+        if op is _sre.GROUPREF_EXISTS:
+            return True
+        return False
+
+    def chars(self, seq):
+        """Every character a match of seq can consume"""
+        result = frozenset()
+        for op, av in seq:
+            result |= self.item_chars(op, av)
+        return result
+
+    def item_chars(self, op, av):
+        if op is _sre.LITERAL:
+            return _literal(av, self.ignorecase)
+        if op is _sre.NOT_LITERAL:
+            return _ALL - _literal(av, self.ignorecase)
+        if op is _sre.ANY:
+            return _ALL
+        if op is _sre.IN:
+            return _class(av, self.ignorecase)
+        if op is _sre.GROUPREF:
+            return _ALL
+        if op in _ZERO_WIDTH:
+            return frozenset()
+        result = frozenset()
+        for seq in _children(op, av):
+            result |= self.chars(seq)
+        return result
+
+    def first(self, seq):
+        """Characters a match of seq can start with"""
+        result = frozenset()
+        for op, av in seq:
+            if op in _ZERO_WIDTH:
+                continue
+            if op in _REPEATS or op is _sre.SUBPATTERN or op is _sre.BRANCH:
+                for child in _children(op, av):
+                    result |= self.first(child)
+            else:
+                result |= self.item_chars(op, av)
+            if not self.item_nullable(op, av):
+                break
+        return result
+
+    # -- shapes ---------------------------------------------------------
+
+    def walk(self, seq):
+        for op, av in seq:
+            if op in _NO_BACKTRACK:
+                continue
+            if _unbounded(op, av):
+                self.check_repeat(av[2])
+            for child in _children(op, av):
+                self.walk(child)
+        self.check_sequence(seq)
+
+    def check_repeat(self, body):
+        # (...)+ repeats the group's contents
+        while len(body) == 1 and body[0][0] is _sre.SUBPATTERN:
+            body = body[0][1][-1]
+
+        for i, (op, av) in enumerate(body):
+            inner = self.inner_repeats(op, av)
+            if not inner:
+                continue
+            inner_chars = frozenset().union(*inner)
+            separated = any(not self.item_nullable(other_op, other_av)
+                            and not (self.item_chars(other_op, other_av) & inner_chars)
+                            for j, (other_op, other_av) in enumerate(body) if j != i)
+            if not separated:
+                self.add(EXPONENTIAL, "nested quantifier: a repeated group contains an unbounded repeat "
+                                      "that nothing else in the group separates")
+
+        branches = [av[1] for op, av in body if op is _sre.BRANCH]
+        rest = [(op, av) for op, av in body if op is not _sre.BRANCH]
+        if len(branches) == 1 and self.nullable(rest):
+            alternatives = branches[0]
+            firsts = [self.first(alt) for alt in alternatives]
+            overlap = any(firsts[a] & firsts[b] for a in range(len(firsts)) for b in range(a + 1, len(firsts)))
+            if overlap or any(self.nullable(alt) for alt in alternatives):
+                self.add(EXPONENTIAL, "repeated alternation whose alternatives can match the same text")
+
+    def inner_repeats(self, op, av):
+        """Character sets of the unbounded repeats inside one item"""
+        if op in _NO_BACKTRACK:
+            return []
+        if _unbounded(op, av):
+            return [self.chars(av[2])]
+        found = []
+        for child in _children(op, av):
+            for child_op, child_av in child:
+                found.extend(self.inner_repeats(child_op, child_av))
+        return found
+
+    def check_sequence(self, seq):
+        repeats = [(i, self.chars(av[2])) for i, (op, av) in enumerate(seq) if _unbounded(op, av)]
+        for (i, first), (j, second) in zip(repeats, repeats[1:]):
+            between = seq[i + 1:j]
+            if first & second and all(self.item_chars(op, av) <= first or self.item_nullable(op, av)
+                                      for op, av in between):
+                self.add(QUADRATIC, "overlapping unbounded repeats in a row")
+
+    def check_wildcards(self, seq):
+        """Unanchored pattern with a broad unbounded repeat before more pattern"""
+        flat = self.flatten(seq)
+        if flat and flat[0][0] is _sre.AT and flat[0][1] in (_sre.AT_BEGINNING, _sre.AT_BEGINNING_STRING):
+            return
+        for i, (op, av) in enumerate(flat):
+            if _unbounded(op, av):
+                ascii_chars = sum(1 for c in self.chars(av[2]) if isinstance(c, int))
+                if ascii_chars >= _BROAD and not self.nullable(flat[i + 1:]):
+                    self.add(QUADRATIC, "unbounded wildcard in the middle of an unanchored pattern")
+                    return
+
+    def flatten(self, seq):
+        """seq with plain groups inlined"""
+        flat = []
+        for op, av in seq:
+            if op is _sre.SUBPATTERN:
+                flat.extend(self.flatten(av[-1]))
+            else:
+                flat.append((op, av))
+        return flat
+
+
+def pattern_risks(pattern, flags=0):
+    """
+    [(severity, description)] for a regex (string or compiled), where
+    severity is EXPONENTIAL or QUADRATIC; an empty list means no risky shape
+    """
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags | flags
+    parsed = _sre_parse.parse(pattern, flags)
+    state = getattr(parsed, "state", None) or getattr(parsed, "pattern", None)
+    analyzer = _Analyzer(bool((state.flags if state else flags) & re.IGNORECASE))
+    analyzer.walk(parsed)
+    analyzer.check_wildcards(list(parsed))
+    return analyzer.risks
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Concurrent repository fetcher
+Clones each participant's GitHub repository into its Participant_* folder.
+Only what the evaluation reads is fetched: a shallow, blob-filtered clone
+with a sparse checkout of markdown and known config files. Clones run in a
+bounded thread pool (git does the work in subprocesses), transient failures
+are retried with exponential backoff, and progress is recorded in a state
+file so an interrupted run picks up where it stopped.
+
+Usage:
+    python scripts/repo_fetcher.py tests/WorkSubmissions05 --workers 8
+
+    # Stand-in for GitHub: https://github.com/<owner>/<repo> is fetched from
+    # /srv/mirror/<owner>/<repo>.git
+    python scripts/repo_fetcher.py tests/WorkSubmissions05 --github-base file:///srv/mirror
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from submission_walker import EXCLUDED_DIRS
+
+STATE_FILE = ".fetch_state.json"
+SUBMISSION_INFO = "submission_info.xlsx"
+
+GITHUB_BASE = "https://github.com"
+GIT_TIMEOUT = 120
+RETRIES = 2
+BACKOFF = 2.0
+
+# Config files the code verification and the rule packs look at
+CONFIG_FILES = (
+    "package.json", "tsconfig.json", "pyproject.toml", "setup.py", "setup.cfg",
+    "requirements*.txt", "Pipfile", "tox.ini", "pytest.ini", "mypy.ini",
+    ".flake8", ".pylintrc", "pylintrc", "ruff.toml", ".ruff.toml", ".coveragerc",
+    ".pre-commit-config.yaml", ".eslintrc*", "eslint.config.*", ".prettierrc*",
+    ".editorconfig", "jest.config.*", "Makefile", "Dockerfile", "docker-compose*.yml",
+    ".gitignore", ".env.example", "LICENSE*",
+)
+
+# Non-cone sparse-checkout patterns (gitignore syntax; later lines win)
+SPARSE_PATTERNS = (
+    ["*.md"] + list(CONFIG_FILES) + ["/.github/workflows/"]
+    + [f"!**/{name}/**" for name in sorted(EXCLUDED_DIRS)]
+)
+
+# git messages that retrying will not fix
+_PERMANENT_ERRORS = (
+    "repository not found", "does not appear to be a git repository",
+    "could not read username", "terminal prompts disabled", "authentication failed",
+)
+
+_GITHUB_URL = re.compile(r'github\.com[/:]([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)')
+
+
+class FetchError(Exception):
+    """A failed git command; permanent errors are not retried"""
+
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+def parse_github_url(url):
+    """(owner, repo) of a GitHub URL (tree/blob paths and .git suffixes ignored), or None"""
+    match = _GITHUB_URL.search(url or "")
+    if not match:
+        return None
+    owner, repo = match.groups()
+    if repo.endswith(".git"):
+        repo = repo[:-4]
+    return (owner, repo) if repo else None
+
+
+def clone_url(owner, repo, github_base=GITHUB_BASE):
+    return f"{github_base.rstrip('/')}/{owner}/{repo}.git"
+
+
+def submission_url(folder):
+    """GitHub URL recorded in a participant's submission_info.xlsx, or ''"""
+    info_file = Path(folder) / SUBMISSION_INFO
+    if not info_file.exists():
+        return ""
+    import openpyxl
+    wb = openpyxl.load_workbook(info_file, read_only=True)
+    try:
+        for row in wb.active.iter_rows(values_only=True):
+            if len(row) >= 2 and row[0] == "GitHub Repository":
+                return str(row[1] or "").strip()
+    finally:
+        wb.close()
+    return ""
+
+
+def _git(args, cwd=None, timeout=GIT_TIMEOUT):
+    # Never wait on a credential prompt: a private or missing repo fails at once
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    try:
+        result = subprocess.run(["git"] + args, cwd=cwd, env=env, capture_output=True,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise FetchError(f"git {args[0]} timed out after {timeout:g}s")
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        fatal = [line for line in lines if line.startswith(("fatal:", "error:"))]
+        message = (fatal or lines or [f"git {args[0]} exited with code {result.returncode}"])[0]
+        permanent = any(text in result.stderr.lower() for text in _PERMANENT_ERRORS)
+        raise FetchError(message, permanent)
+    return result.stdout.strip()
+
+
+def fetch_repo(url, dest, depth=1, patterns=SPARSE_PATTERNS, timeout=GIT_TIMEOUT):
+    """
+    Shallow, blob-filtered, sparse clone of url into dest; returns the HEAD commit
+
+    depth=None fetches full history (blobs are still fetched only for the
+    checked-out files). The clone is built in a sibling ".partial" folder and
+    renamed into place, so dest is only ever the previous clone or a complete
+    new one.
+    """
+    dest = Path(dest)
+    partial = dest.with_name(dest.name + ".partial")
+    if partial.exists():
+        shutil.rmtree(partial)
+    try:
+        clone = ["clone", "--quiet", "--filter=blob:none", "--no-checkout"]
+        if depth:
+            clone += ["--depth", str(depth)]
+        _git(clone + ["--", url, str(partial)], timeout=timeout)
+        _git(["sparse-checkout", "set", "--no-cone", "--"] + list(patterns), cwd=partial, timeout=timeout)
+        _git(["checkout", "--quiet"], cwd=partial, timeout=timeout)
+        commit = _git(["rev-parse", "HEAD"], cwd=partial, timeout=timeout)
+        if dest.exists():
+            shutil.rmtree(dest)
+        os.replace(partial, dest)
+        return commit
+    finally:
+        if partial.exists():
+            shutil.rmtree(partial, ignore_errors=True)
+
+
+def fetch_with_retry(url, dest, depth=1, timeout=GIT_TIMEOUT, retries=RETRIES, backoff=BACKOFF):
+    """
+    fetch_repo with up to retries extra attempts for transient failures
+    Waits backoff * 2**n seconds (plus jitter) between attempts.
+    Returns a state entry: status, commit, attempts, error, elapsed.
+    """
+    start = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        try:
+            commit = fetch_repo(url, dest, depth=depth, timeout=timeout)
+            return {"status": "done", "commit": commit, "attempts": attempt, "error": None,
+                    "elapsed": round(time.perf_counter() - start, 2)}
+        except (FetchError, OSError) as e:
+            error = e if isinstance(e, FetchError) else FetchError(str(e))
+            if error.permanent or attempt > retries:
+                break
+            time.sleep(backoff * 2 ** (attempt - 1) * (1 + random.random() / 2))
+    return {"status": "failed", "commit": None, "attempts": attempt, "error": str(error),
+            "permanent": error.permanent, "elapsed": round(time.perf_counter() - start, 2)}
+
+
+def load_state(worksubmissions_folder):
+    """{participant folder name: state entry} from a previous (possibly interrupted) run"""
+    path = Path(worksubmissions_folder) / STATE_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get("repos", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(worksubmissions_folder, state):
+    path = Path(worksubmissions_folder) / STATE_FILE
+    tmp_path = path.with_name(STATE_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"repos": state}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def plan_fetches(worksubmissions_folder, state, github_base=GITHUB_BASE, force=False, retry_failed=False):
+    """
+    Decide what each participant needs
+    Returns (todo, skipped): todo is [(name, url, dest)], skipped is
+    {name: reason} for participants left as they are.
+    """
+    todo = []
+    skipped = {}
+    folders = sorted(d for d in Path(worksubmissions_folder).iterdir()
+                     if d.is_dir() and d.name.startswith('Participant_'))
+    for folder in folders:
+        parsed = parse_github_url(submission_url(folder))
+        if parsed is None:
+            skipped[folder.name] = "no GitHub URL"
+            continue
+        url = clone_url(*parsed, github_base=github_base)
+        dest = folder / parsed[1]
+        previous = state.get(folder.name, {})
+        same_url = previous.get("url") == url
+
+        if not force:
+            if same_url and previous.get("status") == "done" and dest.is_dir():
+                skipped[folder.name] = "done"
+                continue
+            if same_url and previous.get("permanent") and not retry_failed:
+                skipped[folder.name] = f"failed earlier: {previous.get('error')}"
+                continue
+            if not previous and (dest / ".git").is_dir():
+                skipped[folder.name] = "already exists"
+                continue
+        todo.append((folder.name, url, dest))
+    return todo, skipped
+
+
+def fetch_cohort(worksubmissions_folder, workers=8, github_base=GITHUB_BASE, depth=1,
+                 timeout=GIT_TIMEOUT, retries=RETRIES, backoff=BACKOFF,
+                 force=False, retry_failed=False, on_result=None):
+    """
+    Fetch every participant's repository, workers at a time
+
+    The state file is rewritten after each repository, so stopping the run
+    (Ctrl+C, crash) loses at most the clones in flight. on_result is called
+    with (name, entry) as each fetch finishes. Returns (fetched, skipped):
+    {name: state entry} for this run's fetches and {name: reason} for the rest.
+    """
+    worksubmissions_folder = Path(worksubmissions_folder)
+    state = load_state(worksubmissions_folder)
+    todo, skipped = plan_fetches(worksubmissions_folder, state, github_base, force, retry_failed)
+
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch_with_retry, url, dest, depth, timeout, retries, backoff): (name, url, dest)
+                   for name, url, dest in todo}
+        for future in as_completed(futures):
+            name, url, dest = futures[future]
+            entry = dict(future.result(), url=url, dest=dest.name)
+            state[name] = fetched[name] = entry
+            save_state(worksubmissions_folder, state)
+            if on_result:
+                on_result(name, entry)
+    return fetched, skipped
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch participants' repositories (shallow, sparse, resumable)")
+    parser.add_argument("folder", help="WorkSubmissions folder containing Participant_* folders")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent clones (default: 8)")
+    parser.add_argument("--depth", type=int, default=1,
+                        help="Commits of history to fetch; 0 for full history (default: 1)")
+    parser.add_argument("--timeout", type=float, default=GIT_TIMEOUT,
+                        help=f"Seconds one git command may take (default: {GIT_TIMEOUT})")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help=f"Extra attempts for transient failures (default: {RETRIES})")
+    parser.add_argument("--github-base", default=GITHUB_BASE,
+                        help="Where github.com/<owner>/<repo> is fetched from, e.g. file:///srv/mirror")
+    parser.add_argument("--force", action="store_true", help="Re-fetch repositories fetched before")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Retry repositories that failed permanently last time (not found, private)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    folder = Path(args.folder)
+    if not folder.is_dir():
+        print(f"Error: {folder} not found")
+        sys.exit(1)
+
+    def report(name, entry):
+        participant_id = name.split('_')[1]
+        if entry["status"] == "done":
+            print(f"{participant_id}: OK ({entry['commit'][:10]}, {entry['elapsed']}s)", flush=True)
+        else:
+            print(f"{participant_id}: FAILED after {entry['attempts']} attempt(s): {entry['error']}", flush=True)
+
+    fetched, skipped = fetch_cohort(folder, args.workers, args.github_base, args.depth or None,
+                                  args.timeout, args.retries, force=args.force,
+                                  retry_failed=args.retry_failed, on_result=report)
+    for name, reason in skipped.items():
+        print(f"{name.split('_')[1]}: skipped ({reason})")
+
+    done = sum(e["status"] == "done" for e in fetched.values())
+    print(f"\n{'='*60}")
+    print(f"Summary: {done} fetched, {len(skipped)} skipped, {len(fetched) - done} failed")
+    print(f"{'='*60}")
+    return 0 if done == len(fetched) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Canonical results store
+One SQLite file per evaluation run holding students, criteria, the
+student/criterion membership, scores and run metadata. Report generation,
+grade comparison and the dev validators read from it; grades.xlsx and
+criteria_graph_final.json are exports for people, not interchange files.
+
+The file is written to a temporary path and renamed into place, so readers
+never see a half-written run.
+"""
+
+import os
+import json
+import sqlite3
+from pathlib import Path
+
+RESULTS_DB = "results.sqlite3"
+
+# Bump when the schema changes; readers refuse newer files
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE metadata (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE students (
+    id                  INTEGER PRIMARY KEY,
+    name                TEXT NOT NULL UNIQUE,
+    raw_score           REAL,
+    max_possible        REAL,
+    percentage          REAL,
+    rarity_bonus        REAL,
+    grade               REAL,
+    rank                INTEGER,
+    criteria_count      INTEGER,
+    rare_criteria_count INTEGER
+);
+CREATE TABLE criteria (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    count    INTEGER NOT NULL,
+    weight   REAL NOT NULL,
+    extra    TEXT
+);
+CREATE TABLE membership (
+    student_id   INTEGER NOT NULL REFERENCES students(id),
+    criterion_id INTEGER NOT NULL REFERENCES criteria(id),
+    PRIMARY KEY (student_id, criterion_id)
+) WITHOUT ROWID;
+CREATE INDEX membership_by_criterion ON membership (criterion_id, student_id);
+CREATE INDEX students_by_rank ON students (rank);
+CREATE INDEX criteria_by_category ON criteria (category);
+"""
+
+# Per-criterion keys stored in their own columns; anything else goes to "extra"
+_CRITERION_COLUMNS = ("students", "count", "category", "weight")
+
+
+def results_path(output_dir):
+    return Path(output_dir) / RESULTS_DB
+
+
+def grades_by_student(grades):
+    """calculate_grades() rows as {student: grade row}, the shape ResultsStore.grades() returns"""
+    return {
+        g["student"]: {
+            'raw_score': g["score"],
+            'max_possible': g["max_possible"],
+            'percentage': g["percentage"],
+            'rarity_bonus': g["rarity_bonus"],
+            'grade': g["grade"],
+            'rank': g["rank"],
+            'criteria_count': g["criteria_count"],
+        }
+        for g in grades
+    }
+
+
+def save_results(path, criteria_graph, student_criteria, grades):
+    """
+    Write a complete run to path (replacing any previous file)
+
+    criteria_graph   - {"metadata": {...}, "criteria": {name: {...}}}
+    student_criteria - {student: [criteria]}; fixes the student order
+    grades           - calculate_grades() rows (student, score, grade, rank, ...)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    by_student = {g["student"]: g for g in grades}
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        conn.executescript(_SCHEMA)
+        metadata = dict(criteria_graph["metadata"], schema_version=SCHEMA_VERSION)
+        conn.executemany("INSERT INTO metadata VALUES (?, ?)",
+                         ((key, json.dumps(value)) for key, value in metadata.items()))
+
+        student_ids = {name: i for i, name in enumerate(student_criteria, 1)}
+        rows = []
+        for name, sid in student_ids.items():
+            g = by_student.get(name, {})
+            rows.append((sid, name, g.get("score"), g.get("max_possible"), g.get("percentage"),
+                         g.get("rarity_bonus"), g.get("grade"), g.get("rank"),
+                         g.get("criteria_count"), g.get("rare_criteria_count")))
+        conn.executemany("INSERT INTO students VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+        criterion_ids = {}
+        rows = []
+        for cid, (name, data) in enumerate(criteria_graph["criteria"].items(), 1):
+            criterion_ids[name] = cid
+            extra = {k: v for k, v in data.items() if k not in _CRITERION_COLUMNS}
+            rows.append((cid, name, data["category"], data["count"], data["weight"],
+                         json.dumps(extra) if extra else None))
+        conn.executemany("INSERT INTO criteria VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+        conn.executemany("INSERT INTO membership VALUES (?, ?)", (
+            (student_ids[student], criterion_ids[criterion])
+            for student, crits in student_criteria.items()
+            for criterion in crits if criterion in criterion_ids
+        ))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+class ResultsStore:
+    """
+    Read-only view of a results file.
+
+    Use as a context manager. The criteria_graph() and grades() shapes match
+    criteria_graph_final.json and generate_student_reports' grade rows, so
+    existing consumers can switch over without other changes.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"{self.path} not found - run scripts/run_evaluation.py first")
+        self._conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        version = self.metadata().get("schema_version", 0)
+        if version > SCHEMA_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} uses results schema {version}; "
+                             f"this checkout reads up to {SCHEMA_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def metadata(self):
+        return {key: json.loads(value)
+                for key, value in self._conn.execute("SELECT key, value FROM metadata")}
+
+    def students(self):
+        """Student names in evaluation order"""
+        return [name for (name,) in self._conn.execute("SELECT name FROM students ORDER BY id")]
+
+    def grades(self):
+        """{student: grade row}, best rank first"""
+        grades = {}
+        for row in self._conn.execute(
+                "SELECT name, raw_score, max_possible, percentage, rarity_bonus, grade, rank, criteria_count"
+                " FROM students ORDER BY rank, id"):
+            grades[row[0]] = {
+                'raw_score': row[1],
+                'max_possible': row[2],
+                'percentage': row[3],
+                'rarity_bonus': row[4],
+                'grade': row[5],
+                'rank': row[6],
+                'criteria_count': row[7],
+            }
+        return grades
+
+    def criteria_of(self, student):
+        """Criteria a student has, in criteria order"""
+        return [name for (name,) in self._conn.execute(
+            "SELECT c.name FROM membership m"
+            " JOIN students s ON s.id = m.student_id JOIN criteria c ON c.id = m.criterion_id"
+            " WHERE s.name = ? ORDER BY c.id", (student,))]
+
+    def student_criteria(self):
+        """{student: sorted criteria} for every student (students without criteria included)"""
+        result = {name: [] for name in self.students()}
+        for student, criterion in self._conn.execute(
+                "SELECT s.name, c.name FROM membership m"
+                " JOIN students s ON s.id = m.student_id JOIN criteria c ON c.id = m.criterion_id"):
+            result[student].append(criterion)
+        for crits in result.values():
+            crits.sort()
+        return result
+
+    def criteria_graph(self):
+        """Rebuild the criteria_graph_final.json structure"""
+        criteria = {}
+        for name, category, count, weight, extra in self._conn.execute(
+                "SELECT name, category, count, weight, extra FROM criteria ORDER BY id"):
+            criteria[name] = {"students": [], "count": count, "category": category, "weight": weight}
+            if extra:
+                criteria[name].update(json.loads(extra))
+
+        for criterion, student in self._conn.execute(
+                "SELECT c.name, s.name FROM membership m"
+                " JOIN criteria c ON c.id = m.criterion_id JOIN students s ON s.id = m.student_id"
+                " ORDER BY m.criterion_id, m.student_id"):
+            criteria[criterion]["students"].append(student)
+
+        metadata = self.metadata()
+        metadata.pop("schema_version", None)
+        return {"metadata": metadata, "criteria": criteria}
@@ -5,14 +5,13 @@ Includes code verification and assignment profiles
 """
 
 import sys
-import os
 import json
-import re
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from collections import defaultdict
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 
 # Add skills directory to path
 project_root = Path(__file__).parent.parent  # Go up from scripts/ to project root
@@ -22,363 +21,349 @@ sys.path.insert(0, str(skills_dir))
 # Import the new modules
 from code_analysis import run_full_code_analysis, format_criteria_summary
 from assignment_profiles import detect_assignment_type, apply_assignment_profile
+from extraction_engine import RuleTimeout, format_rule_stats, load_rule_pack, merge_rule_stats
+from extraction_cache import CACHE_DB, ExtractionCache
+from submission_walker import walk_files
+from criteria_matrix import CriteriaMatrix
+from scoring import competition_ranks, ranking_order, rare_mask, score_students
+from excel_export import StreamingWorkbook, grade_color_scale
+from results_store import ResultsStore, results_path, save_results
+import tracing
 
 def find_markdown_files(student_folder):
-    """Recursively find all .md files in student folder"""
-    md_files = []
-    for root, dirs, files in os.walk(student_folder):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        for file in files:
-            if file.endswith('.md'):
-                md_files.append(Path(root) / file)
-    return md_files
+    """Lazily find .md files in student folder, skipping hidden and vendor directories"""
+    return walk_files(student_folder, suffixes=(".md",))
+
+# Extraction rules: scripts/rules/run_evaluation.json, compiled once per process
+RULES = load_rule_pack("run_evaluation")
+
+# Seconds extracting one markdown file (or one block of a large one) may take
+DOCUMENT_TIMEOUT = 30
+
+# RULES.configure() options, set from the command line and passed to every worker
+RULE_LIMITS = {"document_timeout": DOCUMENT_TIMEOUT, "accounting": False}
+# Seconds one rule evaluation may take before it is reported (--rule-budget)
+RULE_BUDGET = None
+
+def scan_markdown(md_content, filename):
+    """
+    Scan markdown content in a single pass
+    Returns list of (line_no, criterion) hits; filename hits use line_no None
+    """
+    return RULES.scan(md_content, filename)
 
 def extract_criteria_from_markdown(md_content, filename):
     """
     Extract criteria from markdown content
     Returns list of criteria found
     """
-    criteria = []
-
-    # Filename-based detection
-    filename_lower = filename.lower()
-
-    # Check for PRD document (flexible matching)
-    if filename_lower.startswith('prd') or 'prd.md' in filename_lower or 'product_requirements' in filename_lower:
-        criteria.append('PRD Document')
-
-    # Other filename patterns (exact match)
-    filename_criteria = {
-        'testing.md': 'Testing Documentation',
-        'contributing.md': 'Contributing Guide',
-        'architecture.md': 'Architecture Documentation',
-        'changelog.md': 'Changelog',
-        'api.md': 'API Documentation',
-        'roadmap.md': 'Roadmap',
-    }
-
-    for pattern, criterion in filename_criteria.items():
-        if pattern in filename_lower:
-            criteria.append(criterion)
-
-    # Content-based extraction patterns
-    positive_patterns = [
-        (r'we (built|created|developed|implemented)', 'implementation'),
-        (r'the project includes?', 'feature'),
-        (r'(unit|integration|e2e) tests?', 'testing'),
-        (r'test coverage', 'testing'),
-        (r'ci/cd', 'devops'),
-        (r'docker', 'devops'),
-        (r'eslint|pylint|ruff|black|prettier', 'code quality'),
-        (r'pre-commit', 'code quality'),
-        (r'typescript|mypy', 'type checking'),
-        (r'screenshots?', 'visuals'),
-        (r'problem statement', 'planning'),
-        (r'cost analysis', 'research'),
-        (r'requirements?', 'planning'),
-        (r'success metrics', 'planning'),
-        (r'architecture', 'documentation'),
-    ]
-
-    # Negative patterns (things to skip)
-    negative_patterns = [
-        r'todo:',
-        r'future work',
-        r'planned',
-        r'not yet implemented',
-        r'coming soon',
-        r'stretch goal',
-    ]
-
-    lines = md_content.lower().split('\n')
-
-    for i, line in enumerate(lines):
-        # Skip negative contexts
-        if any(re.search(neg, line, re.IGNORECASE) for neg in negative_patterns):
-            continue
-
-        # Extract from positive patterns
-        if 'unit test' in line and 'test' not in [c.lower() for c in criteria]:
-            criteria.append('Unit Tests')
-        if 'integration test' in line:
-            criteria.append('Integration Tests')
-        if 'e2e test' in line or 'end-to-end test' in line:
-            criteria.append('E2E Tests')
-        if 'test coverage' in line:
-            criteria.append('Test Coverage Metrics')
-        if 'ci/cd' in line or 'github actions' in line:
-            criteria.append('CI/CD Pipeline')
-        if 'docker' in line:
-            criteria.append('Docker Containerization')
-        if 'eslint' in line:
-            criteria.append('ESLint Configuration')
-        if 'pylint' in line:
-            criteria.append('Pylint Configuration')
-        if 'ruff' in line:
-            criteria.append('Ruff Linting')
-        if 'black' in line and 'formatting' in line:
-            criteria.append('Black Code Formatting')
-        if 'prettier' in line:
-            criteria.append('Prettier Configuration')
-        if 'pre-commit' in line:
-            criteria.append('Pre-commit Hooks')
-        if 'typescript' in line:
-            criteria.append('TypeScript Type Checking')
-        if 'mypy' in line:
-            criteria.append('MyPy Type Checking')
-        if 'screenshot' in line:
-            criteria.append('Screenshots')
-        if 'problem statement' in line:
-            criteria.append('Problem Statement')
-        if 'cost analysis' in line or 'cost breakdown' in line:
-            criteria.append('Cost Analysis')
-        if 'requirements' in line and i > 0:
-            criteria.append('Functional Requirements')
-        if 'success metrics' in line or 'kpis' in line:
-            criteria.append('Success Metrics')
-        if 'architecture' in line and 'document' in line:
-            criteria.append('Architecture Documentation')
-        if 'readme' in line or filename_lower == 'readme.md':
-            if 'README' not in criteria:
-                criteria.append('README')
-
-    return list(set(criteria))  # Remove duplicates
+    return list(set(criterion for _, criterion in scan_markdown(md_content, filename)))
 
 def categorize_criterion(criterion_name):
     """Categorize a criterion into broad topics"""
-    criterion_lower = criterion_name.lower()
+    return RULES.categorize(criterion_name)
 
-    # CodeQuality
-    if any(kw in criterion_lower for kw in ['eslint', 'pylint', 'ruff', 'flake8', 'black', 'prettier',
-                                              'pre-commit', 'typescript', 'mypy', 'type checking',
-                                              'linting', 'formatting', 'code quality', 'verified']):
-        return 'CodeQuality'
+# Per-student criteria of the last full run, used by --regrade-student
+STUDENT_CRITERIA_FILE = "student_criteria.json"
 
-    # Testing
-    if any(kw in criterion_lower for kw in ['test', 'coverage', 'pytest', 'jest']):
-        return 'Testing'
+# Per-process extraction cache, opened lazily in each worker
+# (EXTRACTION_CACHE_DB = None disables caching)
+EXTRACTION_CACHE_DB = CACHE_DB
+_extraction_cache = None
 
-    # DevOps
-    if any(kw in criterion_lower for kw in ['ci/cd', 'docker', 'deployment', 'pipeline', '.gitignore']):
-        return 'DevOps'
+def _get_extraction_cache():
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache(RULES, EXTRACTION_CACHE_DB)
+    return _extraction_cache
 
-    # Documentation
-    if any(kw in criterion_lower for kw in ['readme', 'documentation', 'api doc', 'changelog',
-                                              'contributing', 'prompt_book']):
-        return 'Documentation'
-
-    # Planning
-    if any(kw in criterion_lower for kw in ['prd', 'problem statement', 'requirements', 'architecture',
-                                              'success metrics', 'assumptions']):
-        return 'Planning'
-
-    # Research
-    if any(kw in criterion_lower for kw in ['cost analysis', 'risk analysis', 'roi', 'market research']):
-        return 'Research'
-
-    # Visuals
-    if any(kw in criterion_lower for kw in ['screenshot', 'diagram', 'visualization']):
-        return 'Visuals'
-
-    # Security (new category for verified criteria)
-    if any(kw in criterion_lower for kw in ['secret', 'security', '.env']):
-        return 'Security'
-
-    return 'Uncategorized'
-
-def main():
-    worksubmissions_folder = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("tests/WorkSubmissions04")
+def discover_student(student_folder, trace=False, rule_limits=None):
+    """
+    Step 3-4c for one student: extract criteria from markdown, then verify with code
+    Returns a picklable result dict so it can run in a worker process
+    With trace, result["trace"] holds the student's spans and counters (tracing.Tracer.export())
+    rule_limits are RULES.configure() options; result["rule_stats"] has the per-rule costs
+    """
+    if rule_limits is not None:
+        RULES.configure(**rule_limits)
+    cache = _get_extraction_cache()
+    tracer = tracing.Tracer() if trace else tracing.NULL_TRACER
+    hits, misses = cache.hits, cache.misses
+    regex_evaluations = RULES.regex_evaluations
+    student_crits = []
+    warnings = []
+
+    cohort = student_folder.parent.name
+    with tracer.span(student_folder.name, "student", cohort=cohort) as student_span:
+        # Step 3-4: Extract from markdown
+        files = size = 0
+        for md_file in find_markdown_files(student_folder):
+            file_hits = cache.hits
+            with tracer.span(str(md_file.relative_to(student_folder)), "file",
+                             cohort=cohort, student=student_folder.name) as file_span:
+                try:
+                    student_crits.extend(cache.extract_file(md_file))
+                except RuleTimeout as e:
+                    warnings.append(f"Skipped {md_file}: {e}")
+                    tracer.count("documents_timed_out")
+                except Exception as e:
+                    warnings.append(f"Could not read {md_file}: {e}")
+                if trace:
+                    file_span.update(bytes=md_file.stat().st_size, cached=cache.hits > file_hits)
+                    files += 1
+                    size += file_span["bytes"]
+        cache.commit()
 
-    print("\n" + "="*80)
-    print("INTEGRATED STUDENT PROJECT EVALUATOR")
-    print("With Code Verification & Assignment Profiles")
-    print("="*80)
+        # Step 4c: CODE VERIFICATION (NEW!)
+        verified, code_error = 0, None
+        with tracer.span("code analysis", "code", cohort=cohort, student=student_folder.name):
+            try:
+                code_results = run_full_code_analysis(str(student_folder))
+                verified_criteria = format_criteria_summary(code_results)
+                student_crits.extend(verified_criteria)
+                verified = len(verified_criteria)
+            except Exception as e:
+                code_error = str(e)
+
+        student_span.update(files=files, bytes=size, cache_hits=cache.hits - hits)
+
+    tracer.count("files_scanned", files)
+    tracer.count("bytes_read", size)
+    tracer.count("regex_evaluations", RULES.regex_evaluations - regex_evaluations)
+    tracer.count("cache_hits", cache.hits - hits)
+    tracer.count("cache_misses", cache.misses - misses)
+
+    return {
+        "student": student_folder.name,
+        "criteria": list(set(student_crits)),  # Remove duplicates
+        "verified": verified,
+        "code_error": code_error,
+        "warnings": warnings,
+        "cache_hits": cache.hits - hits,
+        "cache_misses": cache.misses - misses,
+        "trace": tracer.export() if trace else None,
+        "rule_stats": RULES.take_rule_stats(),
+    }
 
-    # Step 2: Discover students
-    student_folders = [f for f in worksubmissions_folder.iterdir()
-                      if f.is_dir() and f.name.startswith('Participant_')]
+def discover_students(student_folders, workers=1, trace=False):
+    """
+    Yield discover_student results in student_folders order
+    With workers > 1 students are processed in a process pool; results are
+    still yielded in order as soon as each one (and all before it) finishes
+    """
+    if workers <= 1 or len(student_folders) <= 1:
+        for student_folder in student_folders:
+            yield discover_student(student_folder, trace, RULE_LIMITS)
+        return
 
-    print(f"\n[Step 2/12] Found {len(student_folders)} student folders")
+    with ProcessPoolExecutor(max_workers=min(workers, len(student_folders))) as pool:
+        yield from pool.map(partial(discover_student, trace=trace, rule_limits=RULE_LIMITS), student_folders)
 
-    # Data structures
-    student_criteria = {}  # student_name -> [criteria]
+def build_criteria_graph(student_criteria, worksubmissions_folder):
+    """Step 5: invert per-student criteria into the criteria graph"""
     criteria_graph = {
         "metadata": {
-            "total_students": len(student_folders),
+            "total_students": len(student_criteria),
             "total_criteria": 0,
             "assignment_folder": str(worksubmissions_folder)
         },
         "criteria": {}
     }
 
-    # Step 3-4c: Read markdown, extract criteria, verify with code
-    print(f"\n[Step 3-4c/12] Reading markdown files and verifying with code analysis...")
-
-    for i, student_folder in enumerate(student_folders, 1):
-        student_name = student_folder.name
-        print(f"  [{i}/{len(student_folders)}] {student_name}...", end='', flush=True)
-
-        # Step 3-4: Extract from markdown
-        md_files = find_markdown_files(student_folder)
-        student_crits = []
-
-        for md_file in md_files:
-            try:
-                content = md_file.read_text(encoding='utf-8', errors='ignore')
-                file_criteria = extract_criteria_from_markdown(content, md_file.name)
-                student_crits.extend(file_criteria)
-            except Exception as e:
-                print(f"\n    Warning: Could not read {md_file}: {e}")
-
-        # Step 4c: CODE VERIFICATION (NEW!)
-        try:
-            code_results = run_full_code_analysis(str(student_folder))
-            verified_criteria = format_criteria_summary(code_results)
-            student_crits.extend(verified_criteria)
-            print(f" {len(verified_criteria)} verified", end='')
-        except Exception as e:
-            print(f" [code analysis failed: {e}]", end='')
+    # Counts are column sums of the student x criterion matrix
+    matrix = CriteriaMatrix.from_student_criteria(student_criteria)
+    counts = matrix.counts()
 
-        # Remove duplicates
-        student_crits = list(set(student_crits))
-        student_criteria[student_name] = student_crits
-
-        print(f" -> {len(student_crits)} total criteria")
-
-    # Step 5: Build criteria graph
-    print(f"\n[Step 5/12] Building criteria graph...")
-    all_criteria = set()
-    for crits in student_criteria.values():
-        all_criteria.update(crits)
-
-    for criterion in all_criteria:
-        students_with_criterion = [s for s, crits in student_criteria.items() if criterion in crits]
+    for j, criterion in enumerate(matrix.criteria):
+        count = int(counts[j])
         category = categorize_criterion(criterion)
 
         criteria_graph["criteria"][criterion] = {
-            "students": students_with_criterion,
-            "count": len(students_with_criterion),
+            "students": matrix.students_with(criterion),
+            "count": count,
             "category": category,
-            "weight": len(students_with_criterion) / len(student_folders)
+            "weight": count / len(student_criteria)
         }
 
-    criteria_graph["metadata"]["total_criteria"] = len(all_criteria)
-
-    print(f"  Discovered {len(all_criteria)} unique criteria")
-
-    # Step 7: Categorize summary
-    print(f"\n[Step 7/12] Categorizing criteria...")
-    category_counts = defaultdict(int)
-    for criterion_data in criteria_graph["criteria"].values():
-        category_counts[criterion_data["category"]] += 1
+    criteria_graph["metadata"]["total_criteria"] = len(matrix.criteria)
+    return criteria_graph
 
-    for category, count in sorted(category_counts.items()):
-        print(f"  {category}: {count} criteria")
+def _profile_multiplier(criteria_graph, category):
+    """Weight multiplier the assignment profile applied to a category (1.0 if none)"""
+    adjustments = criteria_graph["metadata"].get("assignment_profile", {}).get("adjustments_applied", {})
+    return adjustments.get(category, {}).get("multiplier", 1.0)
 
-    # Step 8b: APPLY ASSIGNMENT PROFILE (NEW!)
-    print(f"\n[Step 8b/12] Applying assignment-specific calibration...")
-    assignment_type = detect_assignment_type(worksubmissions_folder)
-
-    if assignment_type:
-        criteria_graph = apply_assignment_profile(criteria_graph, assignment_type)
-    else:
-        print("  No assignment profile detected, using default weights")
-
-    # Step 9: Score and grade with rarity bonuses (NO CURVE)
-    print(f"\n[Step 9/12] Calculating grades with rarity bonuses...")
+def apply_student_delta(criteria_graph, student_criteria, student_name, new_crits):
+    """
+    Replace one student's criteria and patch the graph in place
+    Only criteria the student gained or lost are touched; weights are rescaled
+    by the count change so assignment profile multipliers are preserved.
+    Returns (added, removed) criteria sets
+    """
+    criteria = criteria_graph["criteria"]
+    old = set(student_criteria.get(student_name, []))
+    new = set(new_crits)
+    old_total = criteria_graph["metadata"]["total_students"]
+    new_total = old_total + (0 if student_name in student_criteria else 1)
+
+    # A new student dilutes every weight (weight = count / total_students)
+    if new_total != old_total:
+        for crit_data in criteria.values():
+            crit_data["weight"] *= old_total / new_total
+
+    for criterion in old - new:
+        crit_data = criteria[criterion]
+        crit_data["students"].remove(student_name)
+        crit_data["count"] -= 1
+        if crit_data["count"] == 0:
+            del criteria[criterion]
+        else:
+            crit_data["weight"] *= crit_data["count"] / (crit_data["count"] + 1)
+
+    for criterion in new - old:
+        crit_data = criteria.get(criterion)
+        if crit_data is None:
+            category = categorize_criterion(criterion)
+            criteria[criterion] = {
+                "students": [student_name],
+                "count": 1,
+                "category": category,
+                "weight": _profile_multiplier(criteria_graph, category) / new_total
+            }
+        else:
+            crit_data["students"].append(student_name)
+            crit_data["weight"] *= (crit_data["count"] + 1) / crit_data["count"]
+            crit_data["count"] += 1
+
+    student_criteria[student_name] = sorted(new)
+    criteria_graph["metadata"]["total_students"] = new_total
+    criteria_graph["metadata"]["total_criteria"] = len(criteria)
+    return new - old, old - new
+
+def calculate_grades(criteria_graph, student_criteria):
+    """Step 9: score and grade with rarity bonuses (NO CURVE), ranked by grade"""
+    criteria = criteria_graph["criteria"]
+
+    # Scores are row reductions of the student x criterion matrix;
+    # criteria missing from the graph get weight 0
+    matrix = CriteriaMatrix.from_student_criteria(student_criteria, criteria=criteria)
+    weights = [criteria[c]["weight"] if c in criteria else 0.0 for c in matrix.criteria]
+    counts = [criteria[c]["count"] if c in criteria else 0 for c in matrix.criteria]
+
+    # Identify rare criteria (≤15% prevalence): +1 point each
+    rare = rare_mask(counts, len(student_criteria)) & (np.asarray(counts) > 0)
+    print(f"  Rare criteria (<=15%%): {int(rare.sum())}")
+
+    scores = score_students(matrix, weights, bonus=rare.astype(float))
+
+    # Final grade = percentage + rarity bonus (capped at 100)
+    final_grades = np.minimum(100.0, scores["percentage"] + scores["rarity_bonus"])
+    ranks = competition_ranks(final_grades)
+    criteria_counts = matrix.row_counts()
 
+    # Rank by final grade
     grades = []
-    max_possible = sum(c["weight"] for c in criteria_graph["criteria"].values())
-    total_students = len(student_criteria)
-
-    # Identify rare criteria (≤15% prevalence)
-    rare_criteria = set()
-    for criterion, crit_data in criteria_graph["criteria"].items():
-        prevalence = crit_data["count"] / total_students
-        if prevalence <= 0.15:
-            rare_criteria.add(criterion)
-
-    print(f"  Rare criteria (<=15%%): {len(rare_criteria)}")
-
-    for student_name, crits in student_criteria.items():
-        # Base score
-        score = sum(
-            criteria_graph["criteria"][c]["weight"]
-            for c in crits
-            if c in criteria_graph["criteria"]
-        )
-        percentage = (score / max_possible * 100) if max_possible > 0 else 0
-
-        # Calculate rarity bonus
-        rare_count = sum(1 for c in crits if c in rare_criteria)
-        rarity_bonus = rare_count * 1.0  # +1 point per rare criterion
-
-        # Final grade = percentage + rarity bonus (capped at 100)
-        final_grade = min(100.0, percentage + rarity_bonus)
-
+    for i in ranking_order(final_grades):
         grades.append({
-            "student": student_name,
-            "score": score,
-            "max_possible": max_possible,
-            "percentage": percentage,
-            "rarity_bonus": rarity_bonus,
-            "grade": final_grade,
-            "criteria_count": len(crits),
-            "rare_criteria_count": rare_count
+            "student": matrix.students[i],
+            "score": float(scores["raw_score"][i]),
+            "max_possible": scores["max_possible"],
+            "percentage": float(scores["percentage"][i]),
+            "rarity_bonus": float(scores["rarity_bonus"][i]),
+            "grade": float(final_grades[i]),
+            "criteria_count": int(criteria_counts[i]),
+            "rare_criteria_count": int(round(scores["rarity_bonus"][i])),
+            "rank": int(ranks[i])
         })
 
-    # Rank by final grade
-    grades.sort(key=lambda x: x["grade"], reverse=True)
-    for rank, grade_data in enumerate(grades, 1):
-        grade_data["rank"] = rank
-
     print(f"  Top student: {grades[0]['student']} ({grades[0]['grade']:.1f})")
-    print(f"  Average grade: {sum(g['grade'] for g in grades) / len(grades):.1f}")
-    print(f"  Average rarity bonus: +{sum(g['rarity_bonus'] for g in grades) / len(grades):.2f}")
+    print(f"  Average grade: {final_grades.mean():.1f}")
+    print(f"  Average rarity bonus: +{scores['rarity_bonus'].mean():.2f}")
+    return grades
 
-    # Step 10: Generate outputs
-    print(f"\n[Step 10/12] Generating output files...")
+def count_categories(criteria_graph):
+    category_counts = defaultdict(int)
+    for criterion_data in criteria_graph["criteria"].values():
+        category_counts[criterion_data["category"]] += 1
+    return category_counts
+
+def save_student_criteria(output_dir, student_criteria, worksubmissions_folder):
+    """Persist per-student criteria so a single resubmission can be re-graded incrementally"""
+    with open(output_dir / STUDENT_CRITERIA_FILE, 'w') as f:
+        json.dump({
+            "assignment_folder": str(worksubmissions_folder),
+            "students": {s: sorted(crits) for s, crits in student_criteria.items()}
+        }, f, indent=2)
+    print(f"  [OK] Saved {STUDENT_CRITERIA_FILE}")
+
+def load_previous_run(previous_dir):
+    """Load the criteria graph and per-student criteria of an earlier full run"""
+    previous_dir = Path(previous_dir)
+    if results_path(previous_dir).exists():
+        with ResultsStore(results_path(previous_dir)) as store:
+            return store.criteria_graph(), store.student_criteria()
+
+    # Runs from before the results store
+    graph_file = previous_dir / "criteria_graph_final.json"
+    crits_file = previous_dir / STUDENT_CRITERIA_FILE
+    for required in (graph_file, crits_file):
+        if not required.exists():
+            raise FileNotFoundError(
+                f"{required} not found - run a full evaluation first")
+
+    with open(graph_file) as f:
+        criteria_graph = json.load(f)
+    with open(crits_file) as f:
+        student_criteria = json.load(f)["students"]
+    return criteria_graph, student_criteria
+
+def write_grades_workbook(path, grades):
+    """Write the Grades sheet of calculate_grades() rows to path"""
+    workbook = StreamingWorkbook(header_color="366092", header_border=False)
 
-    output_dir = Path("outputs")
-    output_dir.mkdir(exist_ok=True)
+    # Headers - Include rarity bonus
+    headers = ["Student", "Raw Score", "Max Possible", "Percentage", "Rarity Bonus", "Grade", "Rank", "Criteria Count"]
+    workbook.add_table("Grades", headers, (
+        [
+            grade_data["student"],           # Student ID
+            grade_data['score'],             # Raw Score (number)
+            grade_data['max_possible'],      # Max Possible (number)
+            grade_data['percentage'],        # Percentage (number)
+            grade_data['rarity_bonus'],      # Rarity Bonus (NEW!)
+            grade_data['grade'],             # Grade (percentage + bonus, capped at 100)
+            grade_data["rank"],              # Rank
+            grade_data["criteria_count"],    # Criteria Count
+        ]
+        for grade_data in grades
+    ), autosize=False, rules={"Grade": [grade_color_scale()]})
+
+    workbook.save(path)
+
+def write_outputs(output_dir, criteria_graph, student_criteria, grades, worksubmissions_folder,
+                  assignment_type, category_counts):
+    """Step 10: write the results store, then the criteria graph, grades workbook and summary report"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    all_criteria = criteria_graph["criteria"]
+
+    # Canonical results read by report generation and comparison
+    save_results(results_path(output_dir), criteria_graph, student_criteria, grades)
+    print(f"  [OK] Saved {results_path(output_dir).name}")
 
     # Save criteria graph
     with open(output_dir / "criteria_graph_final.json", 'w') as f:
         json.dump(criteria_graph, f, indent=2)
     print("  [OK] Saved criteria_graph_final.json")
 
-    # Save grades Excel
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Grades"
+    save_student_criteria(output_dir, student_criteria, worksubmissions_folder)
 
-    # Headers - Include rarity bonus
-    headers = ["Student", "Raw Score", "Max Possible", "Percentage", "Rarity Bonus", "Grade", "Rank", "Criteria Count"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(1, col, header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        cell.font = Font(bold=True, color="FFFFFF")
-
-    # Data - Include rarity bonus column
-    for row, grade_data in enumerate(grades, 2):
-        ws.cell(row, 1, grade_data["student"])           # Student ID
-        ws.cell(row, 2, grade_data['score'])             # Raw Score (number)
-        ws.cell(row, 3, grade_data['max_possible'])      # Max Possible (number)
-        ws.cell(row, 4, grade_data['percentage'])        # Percentage (number)
-        ws.cell(row, 5, grade_data['rarity_bonus'])      # Rarity Bonus (NEW!)
-        ws.cell(row, 6, grade_data['grade'])             # Grade (percentage + bonus, capped at 100)
-        ws.cell(row, 7, grade_data["rank"])              # Rank
-        ws.cell(row, 8, grade_data["criteria_count"])    # Criteria Count
-
-    wb.save(output_dir / "grades.xlsx")
+    # Save grades Excel (streamed, write-only)
+    write_grades_workbook(output_dir / "grades.xlsx", grades)
     print("  [OK] Saved grades.xlsx")
 
     # Summary report
     with open(output_dir / "EVALUATION_SUMMARY.md", 'w') as f:
         f.write("# Evaluation Summary\n\n")
-        f.write(f"**Students evaluated:** {len(student_folders)}\n")
+        f.write(f"**Students evaluated:** {len(student_criteria)}\n")
         f.write(f"**Criteria discovered:** {len(all_criteria)}\n")
         f.write(f"**Verified via code analysis:** {sum(1 for c in all_criteria if '(verified)' in c)}\n\n")
 
@@ -397,6 +382,255 @@ def main():
 
     print("  [OK] Saved EVALUATION_SUMMARY.md")
 
+def print_discovery_line(i, total, result):
+    for warning in result["warnings"]:
+        print(f"    Warning: {warning}")
+    status = (f" {result['verified']} verified" if result["code_error"] is None
+              else f" [code analysis failed: {result['code_error']}]")
+    print(f"  [{i}/{total}] {result['student']}...{status}"
+          f" -> {len(result['criteria'])} total criteria", flush=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Integrated student project evaluator")
+    parser.add_argument("folders", nargs="*", default=["tests/WorkSubmissions04"], metavar="folder",
+                        help="WorkSubmissions folder(s) containing Participant_* folders. With several, "
+                             "all students share one worker pool, each cohort is graded on its own, "
+                             "and outputs go to outputs/<folder name>/")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for per-student discovery, shared by all cohorts (default: 1, sequential)")
+    parser.add_argument("--regrade-student", metavar="PARTICIPANT",
+                        help="Incremental mode: re-extract only this Participant_* folder and "
+                             "re-grade from the previous run's cached criteria")
+    parser.add_argument("--previous", default="outputs",
+                        help="Folder holding the previous run's outputs (default: outputs)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Record per-stage, per-student and per-file timings to FILE (Chrome trace-event "
+                             "JSON, open in chrome://tracing or ui.perfetto.dev) and print the slowest ones")
+    parser.add_argument("--trace-top", type=int, default=10, metavar="N",
+                        help="Students and files listed in the trace summary (default: 10)")
+    parser.add_argument("--document-timeout", type=float, default=DOCUMENT_TIMEOUT, metavar="SECONDS",
+                        help=f"Skip a markdown file (with a warning) when extracting it, or one block "
+                             f"of a large streamed file, takes longer (default: {DOCUMENT_TIMEOUT}; 0 = no limit)")
+    parser.add_argument("--rule-budget", type=float, metavar="MS",
+                        help="Record match time per extraction rule and report rules whose slowest "
+                             "single evaluation took longer than MS milliseconds")
+    return parser.parse_args(argv)
+
+def regrade_student(worksubmissions_folder, student_name, previous_dir):
+    """Incremental re-grade of one resubmitted student against a previous full run"""
+    print(f"\n[Step 2/12] Incremental re-grade of {student_name}")
+    student_folder = worksubmissions_folder / student_name
+    if not student_folder.is_dir():
+        print(f"Error: student folder not found: {student_folder}")
+        sys.exit(1)
+
+    try:
+        criteria_graph, student_criteria = load_previous_run(previous_dir)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"  Loaded previous run: {len(student_criteria)} students, "
+          f"{len(criteria_graph['criteria'])} criteria")
+
+    print(f"\n[Step 3-4c/12] Re-extracting {student_name}...")
+    result = discover_student(student_folder, rule_limits=RULE_LIMITS)
+    print_discovery_line(1, 1, result)
+    if RULE_LIMITS["accounting"]:
+        print_rule_costs(result["rule_stats"])
+
+    print(f"\n[Step 5/12] Applying criteria deltas...")
+    added, removed = apply_student_delta(criteria_graph, student_criteria, student_name, result["criteria"])
+    print(f"  +{len(added)} / -{len(removed)} criteria for {student_name}; "
+          f"{len(criteria_graph['criteria'])} criteria in graph")
+
+    print(f"\n[Step 9/12] Recalculating grades from cached criteria...")
+    grades = calculate_grades(criteria_graph, student_criteria)
+
+    print(f"\n[Step 10/12] Generating output files...")
+    assignment_type = criteria_graph["metadata"].get("assignment_profile", {}).get("key")
+    write_outputs(Path(previous_dir), criteria_graph, student_criteria, grades, worksubmissions_folder,
+                  assignment_type, count_categories(criteria_graph))
+
+def find_student_folders(worksubmissions_folder):
+    return [f for f in Path(worksubmissions_folder).iterdir()
+            if f.is_dir() and f.name.startswith('Participant_')]
+
+def discover_cohorts(cohort_folders, workers=1):
+    """
+    Steps 2-4c for several cohorts at once
+    Every student of every cohort is scheduled on one pool, so small cohorts
+    do not leave workers idle. Returns {cohort folder: {student: [criteria]}}
+    in cohort_folders order.
+    """
+    tracer = tracing.active()
+    with tracer.span("Step 2: find student folders"):
+        students = {cohort: find_student_folders(cohort) for cohort in cohort_folders}
+    for cohort, student_folders in students.items():
+        print(f"\n[Step 2/12] Found {len(student_folders)} student folders in {cohort}")
+
+    # Step 3-4c: Read markdown, extract criteria, verify with code
+    print(f"\n[Step 3-4c/12] Reading markdown files and verifying with code analysis...")
+
+    # Unchanged markdown files reuse criteria cached under outputs/.cache
+    jobs = [(cohort, folder) for cohort, student_folders in students.items() for folder in student_folders]
+    cohort_criteria = {cohort: {} for cohort in cohort_folders}  # cohort -> student_name -> [criteria]
+    cache_hits = cache_misses = 0
+    rule_stats = {}
+    with tracer.span("Step 3-4c: extract and verify criteria", students=len(jobs)):
+        results = discover_students([folder for _, folder in jobs], workers, trace=tracer is not tracing.NULL_TRACER)
+        for i, ((cohort, _), result) in enumerate(zip(jobs, results), 1):
+            print_discovery_line(i, len(jobs), result)
+            cohort_criteria[cohort][result["student"]] = result["criteria"]
+            cache_hits += result["cache_hits"]
+            cache_misses += result["cache_misses"]
+            merge_rule_stats(rule_stats, result["rule_stats"])
+            if result["trace"]:
+                tracer.merge(result["trace"])
+                tracer.sample("progress", {"students": i, "files": tracer.counters["files_scanned"]})
+
+    print(f"  Markdown cache: {cache_hits} reused, {cache_misses} extracted")
+    if RULE_LIMITS["accounting"]:
+        print_rule_costs(rule_stats)
+    return cohort_criteria
+
+def print_rule_costs(rule_stats):
+    """Per-rule match time of this run's extractions (cache hits run no rules)"""
+    print(f"\n  Rule costs ({len(rule_stats)} rules ran):")
+    for line in format_rule_stats(rule_stats, RULE_BUDGET):
+        print(f"  {line}")
+    for risky in RULES.risky_rules:
+        print(f"    Backtracking risk: {risky['rule']} {risky['pattern']!r} ({risky['risk']})")
+
+def grade_cohort(worksubmissions_folder, student_criteria):
+    """
+    Steps 5-9 for one cohort: build its criteria graph, apply its assignment
+    profile and grade. Weights and rarity are relative to this cohort only.
+    Returns (criteria_graph, grades, assignment_type, category_counts)
+    """
+    cohort = Path(worksubmissions_folder).name
+
+    # Step 5: Build criteria graph
+    print(f"\n[Step 5/12] Building criteria graph...")
+    with tracing.span("Step 5: build criteria graph", cohort=cohort):
+        criteria_graph = build_criteria_graph(student_criteria, worksubmissions_folder)
+    print(f"  Discovered {criteria_graph['metadata']['total_criteria']} unique criteria")
+
+    # Step 7: Categorize summary
+    print(f"\n[Step 7/12] Categorizing criteria...")
+    with tracing.span("Step 7: categorize criteria", cohort=cohort):
+        category_counts = count_categories(criteria_graph)
+    for category, count in sorted(category_counts.items()):
+        print(f"  {category}: {count} criteria")
+
+    # Step 8b: APPLY ASSIGNMENT PROFILE (NEW!)
+    print(f"\n[Step 8b/12] Applying assignment-specific calibration...")
+    with tracing.span("Step 8b: apply assignment profile", cohort=cohort):
+        assignment_type = detect_assignment_type(worksubmissions_folder)
+
+        if assignment_type:
+            criteria_graph = apply_assignment_profile(criteria_graph, assignment_type)
+        else:
+            print("  No assignment profile detected, using default weights")
+
+    # Step 9: Score and grade with rarity bonuses (NO CURVE)
+    print(f"\n[Step 9/12] Calculating grades with rarity bonuses...")
+    with tracing.span("Step 9: calculate grades", cohort=cohort):
+        grades = calculate_grades(criteria_graph, student_criteria)
+    return criteria_graph, grades, assignment_type, category_counts
+
+def evaluate_cohort(worksubmissions_folder, workers=1):
+    """
+    Steps 2-9: discover students, extract and verify criteria, build the graph,
+    apply the assignment profile and grade
+    Returns (criteria_graph, student_criteria, grades, assignment_type, category_counts)
+    """
+    student_criteria = discover_cohorts([worksubmissions_folder], workers)[worksubmissions_folder]
+    criteria_graph, grades, assignment_type, category_counts = grade_cohort(worksubmissions_folder, student_criteria)
+    return criteria_graph, student_criteria, grades, assignment_type, category_counts
+
+def evaluate_cohorts(cohort_folders, workers=1):
+    """
+    Evaluate several cohorts in one run (e.g. end-of-term regrading)
+    Students from all cohorts share one discovery pool; each cohort is then
+    graded on its own and written to outputs/<cohort name>/.
+    """
+    cohort_criteria = discover_cohorts(cohort_folders, workers)
+    for cohort, student_criteria in cohort_criteria.items():
+        print("\n" + "-"*80)
+        print(f"COHORT {cohort.name}")
+        print("-"*80)
+        criteria_graph, grades, assignment_type, category_counts = grade_cohort(cohort, student_criteria)
+
+        print(f"\n[Step 10/12] Generating output files...")
+        with tracing.span("Step 10: write outputs", cohort=cohort.name):
+            write_outputs(Path("outputs") / cohort.name, criteria_graph, student_criteria, grades, cohort,
+                          assignment_type, category_counts)
+
+def finish_trace(path, top):
+    """Write the run's trace to path and print its summary"""
+    tracer = tracing.stop()
+    tracer.write_chrome_trace(path)
+    print("\n" + "="*80)
+    print("TRACE SUMMARY")
+    print("="*80)
+    for line in tracer.summary(top):
+        print(line)
+    print(f"\nTrace saved to: {Path(path).absolute()}")
+
+def main():
+    args = parse_args()
+    cohort_folders = [Path(folder) for folder in args.folders]
+    workers = max(1, args.workers)
+
+    names = [folder.name for folder in cohort_folders]
+    if len(set(names)) != len(names):
+        print("Error: submission folders must have distinct names (outputs go to outputs/<name>/)")
+        sys.exit(1)
+    if args.regrade_student and len(cohort_folders) > 1:
+        print("Error: --regrade-student takes a single submission folder")
+        sys.exit(1)
+
+    print("\n" + "="*80)
+    print("INTEGRATED STUDENT PROJECT EVALUATOR")
+    print("With Code Verification & Assignment Profiles")
+    print("="*80)
+
+    if args.trace:
+        tracing.start()
+
+    global RULE_BUDGET
+    RULE_LIMITS.update(document_timeout=args.document_timeout, accounting=args.rule_budget is not None)
+    RULE_BUDGET = args.rule_budget / 1000 if args.rule_budget is not None else None
+
+    if len(cohort_folders) > 1:
+        evaluate_cohorts(cohort_folders, workers)
+
+        print("\n" + "="*80)
+        print("EVALUATION COMPLETE!")
+        print("="*80)
+        for folder in cohort_folders:
+            print(f"  {folder.name}: {(Path('outputs') / folder.name).absolute()}")
+        print("\nNext steps:")
+        for folder in cohort_folders:
+            print(f"  python compare_grades.py {folder.name}")
+        if args.trace:
+            finish_trace(args.trace, args.trace_top)
+        return
+
+    worksubmissions_folder = cohort_folders[0]
+    if args.regrade_student:
+        regrade_student(worksubmissions_folder, args.regrade_student, args.previous)
+    else:
+        criteria_graph, student_criteria, grades, assignment_type, category_counts = \
+            evaluate_cohort(worksubmissions_folder, workers)
+
+        # Step 10: Generate outputs
+        print(f"\n[Step 10/12] Generating output files...")
+        with tracing.span("Step 10: write outputs", cohort=worksubmissions_folder.name):
+            write_outputs(Path("outputs"), criteria_graph, student_criteria, grades, worksubmissions_folder,
+                          assignment_type, category_counts)
+
+    output_dir = Path(args.previous if args.regrade_student else "outputs")
     print("\n" + "="*80)
     print("EVALUATION COMPLETE!")
     print("="*80)
@@ -404,6 +638,8 @@ def main():
     print("\nNext steps:")
     print(f"  1. python organize_outputs.py {worksubmissions_folder.name}")
     print(f"  2. python compare_grades.py {worksubmissions_folder.name}")
+    if args.trace:
+        finish_trace(args.trace, args.trace_top)
 
 if __name__ == "__main__":
     main()
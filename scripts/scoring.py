@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Vectorized scoring and ranking
+Turns a CriteriaMatrix and per-criterion weights into raw scores,
+percentages, rarity bonuses, relative grades and competition ranks with a
+handful of array operations. Shared by run_evaluation and the per-cohort
+graders so tie handling is the same everywhere.
+"""
+
+import numpy as np
+
+# Criteria held by at most this fraction of students are "rare"
+RARE_PREVALENCE = 0.15
+
+# Scores equal to this many decimal places share a rank
+RANK_DECIMALS = 9
+
+
+def rare_mask(counts, total_students, threshold=RARE_PREVALENCE):
+    """Boolean vector over criteria: prevalence <= threshold"""
+    counts = np.asarray(counts, dtype=np.float64)
+    if total_students <= 0:
+        return np.zeros(len(counts), dtype=bool)
+    return counts / total_students <= threshold
+
+
+def round_values(values, decimals):
+    """
+    Round like the built-in round(), which is exact on the stored binary value
+    (np.round scales first, so e.g. 7.875 may round differently)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return np.fromiter((round(v, decimals) for v in values.tolist()), dtype=np.float64, count=values.size)
+
+
+def competition_ranks(values, decimals=RANK_DECIMALS):
+    """
+    Competition ("1224") ranks, highest value first
+    Equal values share a rank and the next rank skips accordingly; values are
+    compared after rounding to decimals places, so sums of the same weights
+    taken in a different order still tie
+    """
+    values = np.round(np.asarray(values, dtype=np.float64), decimals)
+    descending = np.sort(-values)
+    return np.searchsorted(descending, -values, side='left') + 1
+
+
+def ranking_order(values):
+    """Indices sorting values highest first; ties keep input order"""
+    return np.argsort(-np.asarray(values, dtype=np.float64), kind='stable')
+
+
+def score_students(matrix, weights, bonus=None, bonus_in_score=False):
+    """
+    Score every student in matrix
+
+    weights         - one weight per matrix criterion (0 for criteria to ignore)
+    bonus           - optional per-criterion bonus (e.g. 1.0 for rare criteria)
+    bonus_in_score  - add the bonus into the raw score and max possible
+                      (otherwise it is reported separately)
+
+    Returns a dict of arrays in matrix.students order:
+        raw_score, rarity_bonus, percentage, relative_grade
+    plus the scalar max_possible. relative_grade is the percentage scaled so
+    the best student gets 100.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    raw_score = matrix.row_sums(weights)
+    # Summed left to right like the graders' sum() over the criteria graph
+    max_possible = sum(weights.tolist())
+
+    if bonus is None:
+        rarity_bonus = np.zeros(len(matrix.students))
+    else:
+        bonus = np.asarray(bonus, dtype=np.float64)
+        rarity_bonus = matrix.row_sums(bonus)
+        if bonus_in_score:
+            raw_score = raw_score + rarity_bonus
+            max_possible += sum(bonus.tolist())
+
+    if max_possible > 0:
+        percentage = raw_score / max_possible * 100
+    else:
+        percentage = np.zeros(len(matrix.students))
+
+    best = percentage.max() if len(percentage) else 0.0
+    relative_grade = percentage / best * 100 if best > 0 else np.zeros(len(percentage))
+
+    return {
+        "raw_score": raw_score,
+        "rarity_bonus": rarity_bonus,
+        "max_possible": max_possible,
+        "percentage": percentage,
+        "relative_grade": relative_grade,
+    }
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Shared submission file walker
+Walks a student folder with os.scandir, pruning vendor/build trees, hidden
+directories and oversized files, and yields matching paths lazily
+"""
+
+import os
+from pathlib import Path
+
+# Directories that never contain student-written documentation
+EXCLUDED_DIRS = frozenset({
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components", "vendor",
+    "venv", ".venv", "virtualenv", "site-packages", "dist-packages",
+    "dist", "build", "target", ".next", ".nuxt",
+    "__pycache__", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    "htmlcov",
+})
+
+# Larger files are generated dumps, not documentation
+MAX_FILE_SIZE = 50 * 1024 * 1024
+
+
+def walk_files(root, suffixes=(".md",), excluded_dirs=EXCLUDED_DIRS,
+               max_file_size=MAX_FILE_SIZE, skip_hidden=True, follow_symlinks=True):
+    """
+    Yield Path objects for files under root whose name ends with one of suffixes
+
+    - directories named in excluded_dirs (case-insensitive) are not entered
+    - hidden directories (".git", ...) are skipped when skip_hidden is set
+    - files larger than max_file_size bytes are skipped (None disables the cap)
+    - symlinked directories are followed at most once; loops are detected by
+      (device, inode)
+
+    Entries are visited in sorted order so results are deterministic.
+    """
+    suffixes = tuple(s.lower() for s in suffixes)
+    excluded = {name.lower() for name in excluded_dirs}
+    root = Path(root)
+
+    try:
+        root_stat = root.stat()
+    except OSError:
+        return
+    visited = {(root_stat.st_dev, root_stat.st_ino)}
+    stack = [root]
+
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if (skip_hidden and name.startswith('.')) or name.lower() in excluded:
+                        continue
+                    if follow_symlinks:
+                        # os.stat, not DirEntry.stat: the latter has no inode on Windows
+                        target = os.stat(entry.path)
+                        key = (target.st_dev, target.st_ino)
+                        if key in visited:
+                            continue
+                        visited.add(key)
+                    subdirs.append(Path(entry.path))
+                elif name.lower().endswith(suffixes) and entry.is_file(follow_symlinks=follow_symlinks):
+                    if max_file_size is not None and entry.stat().st_size > max_file_size:
+                        continue
+                    yield Path(entry.path)
+            except OSError:
+                # Broken symlink or entry removed during the walk
+                continue
+
+        # Depth-first, in sorted order
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Process pool with per-task timeouts
+Runs one function over many independent tasks in worker processes. Unlike
+concurrent.futures, a task that exceeds its timeout is killed (its worker is
+terminated and replaced), so one pathological input cannot stall a batch.
+Failed tasks are retried; the caller gets one result dict per task.
+"""
+
+import time
+import traceback
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from collections import deque
+
+
+def _result(key, ok, value=None, error=None, timed_out=False, attempts=1, elapsed=0.0):
+    """
+    Outcome of one task
+    error is the last attempt's message (None when ok); elapsed is the last
+    attempt's duration in seconds
+    """
+    return {"key": key, "ok": ok, "value": value, "error": error,
+            "timed_out": timed_out, "attempts": attempts, "elapsed": elapsed}
+
+
+def _worker(func, conn):
+    """Worker loop: receive (task_id, args), send (task_id, ok, value_or_error)"""
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        task_id, args = message
+        try:
+            conn.send((task_id, True, func(*args)))
+        except Exception as e:
+            detail = traceback.format_exception_only(type(e), e)[-1].strip()
+            conn.send((task_id, False, detail))
+
+
+class _Slot:
+    """One worker process and the task it is running"""
+
+    def __init__(self, ctx, func):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker, args=(func, child), daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None
+        self.started = 0.0
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def run_tasks(func, tasks, jobs=1, timeout=None, retries=1, retry_timeouts=False, on_result=None):
+    """
+    Run func(*args) for each (key, args) in tasks
+
+    jobs            - worker processes
+    timeout         - seconds one attempt may take (None: no limit)
+    retries         - extra attempts for a task that raised or crashed its worker
+    retry_timeouts  - also retry attempts that hit the timeout (off: a document
+                      that hangs once usually hangs again)
+    on_result       - called with each final result as it completes
+
+    func must be picklable (a module-level function). Returns one result dict
+    per task (key, ok, value, error, timed_out, attempts, elapsed) in the
+    order of tasks. With jobs <= 1 and no timeout, tasks run in-process.
+    """
+    tasks = list(tasks)
+    results = {}
+
+    def finish(result):
+        results[result["key"]] = result
+        if on_result:
+            on_result(result)
+
+    if jobs <= 1 and timeout is None:
+        for key, args in tasks:
+            for attempt in range(1, retries + 2):
+                start = time.perf_counter()
+                try:
+                    result = _result(key, True, func(*args), attempts=attempt)
+                except Exception as e:
+                    detail = traceback.format_exception_only(type(e), e)[-1].strip()
+                    result = _result(key, False, error=detail, attempts=attempt)
+                result["elapsed"] = time.perf_counter() - start
+                if result["ok"]:
+                    break
+            finish(result)
+        return [results[key] for key, _ in tasks]
+
+    ctx = mp.get_context()
+    pending = deque((i, 1) for i in range(len(tasks)))  # (task index, attempt)
+    slots = [_Slot(ctx, func) for _ in range(min(max(1, jobs), len(tasks)))]
+
+    def retry_or_finish(index, attempt, error, timed_out, elapsed):
+        if attempt <= retries and (retry_timeouts or not timed_out):
+            pending.append((index, attempt + 1))
+        else:
+            finish(_result(tasks[index][0], False, error=error, timed_out=timed_out,
+                           attempts=attempt, elapsed=elapsed))
+
+    try:
+        while pending or any(slot.task for slot in slots):
+            # Hand out work to idle workers
+            for slot in slots:
+                if slot.task is None and pending:
+                    index, attempt = pending.popleft()
+                    slot.task = (index, attempt)
+                    slot.started = time.perf_counter()
+                    slot.conn.send((index, tasks[index][1]))
+
+            busy = [slot for slot in slots if slot.task]
+            wait_for = None
+            if timeout is not None:
+                now = time.perf_counter()
+                wait_for = max(0.0, min(slot.started + timeout - now for slot in busy))
+            ready = wait([slot.conn for slot in busy] + [slot.process.sentinel for slot in busy], wait_for)
+
+            for i, slot in enumerate(slots):
+                if slot.task is None:
+                    continue
+                index, attempt = slot.task
+                elapsed = time.perf_counter() - slot.started
+
+                if slot.conn in ready:
+                    try:
+                        _, ok, payload = slot.conn.recv()
+                    except (EOFError, OSError):
+                        ok, payload = None, None
+                    if ok is not None:
+                        slot.task = None
+                        if ok:
+                            finish(_result(tasks[index][0], True, payload, attempts=attempt, elapsed=elapsed))
+                        else:
+                            retry_or_finish(index, attempt, payload, False, elapsed)
+                        continue
+
+                if slot.conn in ready or slot.process.sentinel in ready:
+                    # Worker died mid-task (crash, out of memory, ...)
+                    slot.stop(kill=True)
+                    code = slot.process.exitcode
+                    slots[i] = _Slot(ctx, func)
+                    retry_or_finish(index, attempt, f"worker exited with code {code}", False, elapsed)
+                elif timeout is not None and elapsed >= timeout:
+                    slot.stop(kill=True)
+                    slots[i] = _Slot(ctx, func)
+                    retry_or_finish(index, attempt, f"timed out after {timeout:g}s", True, elapsed)
+    finally:
+        for slot in slots:
+            slot.stop(kill=slot.task is not None)
+
+    return [results[key] for key, _ in tasks]
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Lightweight run tracing
+Records timed spans (stages, students, files) and counters (files scanned,
+bytes read, regex evaluations, cache hits) in memory. A run is written as a
+Chrome trace-event JSON file, viewable in chrome://tracing or
+ui.perfetto.dev, and summarized as a table of the slowest students and
+files, so a sudden slowdown can be pinned on one submission without
+rerunning under a profiler.
+
+Tracing is off unless start() is called; until then span() and count()
+go to a NullTracer that records nothing. Worker processes record into
+their own Tracer and send export() back with their results; the parent
+merge()s it.
+"""
+
+import os
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Spans and counters of one process"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.events = []
+        self.counters = defaultdict(int)
+        self.process_names = {}
+
+    @contextmanager
+    def span(self, name, cat="stage", **args):
+        """Time the enclosed block; args may be added to while it runs"""
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.events.append({"name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": self.pid,
+                                "ts": start // 1000, "dur": (time.perf_counter_ns() - start) // 1000,
+                                "args": args})
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def sample(self, name, values):
+        """Record counter values at this instant (a counter track in the viewer)"""
+        self.events.append({"name": name, "ph": "C", "pid": self.pid, "tid": self.pid,
+                            "ts": time.perf_counter_ns() // 1000, "args": dict(values)})
+
+    def export(self):
+        """Picklable events and counters, for sending back from a worker"""
+        return {"pid": self.pid, "events": self.events, "counters": dict(self.counters)}
+
+    def merge(self, exported):
+        """Add a worker's export() to this trace"""
+        self.events.extend(exported["events"])
+        for name, n in exported["counters"].items():
+            self.counters[name] += n
+        if exported["pid"] != self.pid:
+            self.process_names.setdefault(exported["pid"], f"worker {exported['pid']}")
+
+    def spans(self, cat):
+        return [e for e in self.events if e["ph"] == "X" and e.get("cat") == cat]
+
+    def slowest(self, cat, n=10):
+        return sorted(self.spans(cat), key=lambda e: -e["dur"])[:n]
+
+    def write_chrome_trace(self, path):
+        """Write the trace-event JSON (timestamps in microseconds)"""
+        names = {**self.process_names, self.pid: "evaluator"}
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": pid, "args": {"name": name}}
+                    for pid, name in sorted(names.items())]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": metadata + sorted(self.events, key=lambda e: e["ts"]),
+                       "displayTimeUnit": "ms",
+                       "otherData": {"counters": dict(self.counters)}}, f)
+
+    def summary(self, top=10):
+        """Stage times, counters and the slowest students and files, as printable lines"""
+        lines = ["Stages:"]
+        for event in self.spans("stage"):
+            lines.append(f"  {event['dur'] / 1e6:9.3f}s  {event['name']}")
+
+        lines.append("Counters:")
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"  {name:<20} {n:>14,}")
+
+        students = self.slowest("student", top)
+        if students:
+            lines.append("Slowest students:")
+            lines.append(f"  {'Seconds':>9}  {'Files':>6}  {'MB':>8}  {'Cached':>6}  Student")
+            for event in students:
+                args = event["args"]
+                lines.append(f"  {event['dur'] / 1e6:9.3f}  {args.get('files', 0):>6}  "
+                             f"{args.get('bytes', 0) / 1e6:>8.2f}  {args.get('cache_hits', 0):>6}  "
+                             f"{_path(args.get('cohort'), event['name'])}")
+
+        files = self.slowest("file", top)
+        if files:
+            lines.append("Slowest files:")
+            lines.append(f"  {'Seconds':>9}  {'MB':>8}  File")
+            for event in files:
+                args = event["args"]
+                lines.append(f"  {event['dur'] / 1e6:9.3f}  {args.get('bytes', 0) / 1e6:>8.2f}  "
+                             f"{_path(args.get('cohort'), args.get('student'), event['name'])}")
+        return lines
+
+
+def _path(*parts):
+    """cohort/student/file label, skipping missing parts"""
+    return "/".join(part for part in parts if part)
+
+
+class NullTracer(Tracer):
+    """A Tracer that records nothing, used when tracing is off"""
+
+    @contextmanager
+    def span(self, name, cat="stage", **args):
+        yield args
+
+    def count(self, name, n=1):
+        pass
+
+    def sample(self, name, values):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+# Tracer of this process's run, or None when tracing is off
+_active = None
+
+
+def start():
+    """Turn tracing on for this process and return its Tracer"""
+    global _active
+    _active = Tracer()
+    return _active
+
+
+def stop():
+    global _active
+    tracer, _active = _active, None
+    return tracer
+
+
+def active():
+    """The running Tracer, or NULL_TRACER when tracing is off"""
+    return _active or NULL_TRACER
+
+
+def span(name, cat="stage", **args):
+    """Tracer.span() on the running tracer"""
+    return active().span(name, cat, **args)
+
+
+def count(name, n=1):
+    active().count(name, n)
@@ -3,71 +3,25 @@
 
 import os
 import re
+import sys
 from pathlib import Path
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from cover_page import find_cover_pdf, parse_form_fields
+
 def extract_info_from_pdf_text(pdf_text):
     """Extract the 5 required pieces of information from PDF text."""
-    info = {
-        'group_code': '',
-        'student1': '',
-        'student2': '',
-        'github_link': '',
-        'suggested_grade': ''
-    }
-
-    # Patterns for extraction
-    patterns = {
-        'group_code': [
-            r'1\.\s*(?:Group [Cc]ode|Codegroupe|קוד קבוצה):\s*([^\n]+)',
-            r'Group [Cc]ode:\s*([^\n]+)',
-            r'קוד קבוצה:\s*([^\n]+)',
-        ],
-        'student1': [
-            r'2\.\s*(?:Student one|Member A|שם חבר צוות ראשון):\s*([^\n]+)',
-            r'Student one:\s*([^\n]+)',
-            r'Member A:\s*([^\n]+)',
-        ],
-        'student2': [
-            r'3\.\s*(?:Student two|Member B|שם חבר צוות שני):\s*([^\n]+)',
-            r'Student two:\s*([^\n]+)',
-            r'Member B:\s*([^\n]+)',
-        ],
-        'github_link': [
-            r'4\.\s*(?:Repo link|GitHub Repository|קישור לריפו):\s*([^\n]+)',
-            r'GitHub Repository:\s*([^\n]+)',
-            r'Repo link:\s*([^\n]+)',
-            r'(https://github\.com/[^\s\)]+)',
-        ],
-        'suggested_grade': [
-            r'5\.\s*(?:Grade suggestion|הציון העצמי שלי):\s*(\d+)',
-            r'Grade suggestion:\s*(\d+)',
-            r'הציון העצמי שלי\s*[:]?\s*(\d+)',
-        ]
+    info = parse_form_fields(pdf_text)
+    return {
+        'group_code': info['group_code'],
+        'student1': info['student1'],
+        'student2': info['student2'],
+        'github_link': info['github'],
+        'suggested_grade': info['grade'],
     }
 
-    # Try each pattern for each field
-    for field, pattern_list in patterns.items():
-        for pattern in pattern_list:
-            match = re.search(pattern, pdf_text, re.IGNORECASE)
-            if match:
-                info[field] = match.group(1).strip()
-                break
-
-    # Clean up GitHub URL
-    github_match = re.search(r'https://github\.com/[^\s\)]+', info['github_link'])
-    if github_match:
-        info['github_link'] = github_match.group(0)
-
-    # Extract just the number from suggested grade
-    grade_match = re.search(r'(\d+)', info['suggested_grade'])
-    if grade_match:
-        info['suggested_grade'] = grade_match.group(1)
-
-    return info
-
-
 def create_excel_workbook(output_file):
     """Create a new Excel workbook with headers."""
     wb = openpyxl.Workbook()
@@ -116,10 +70,7 @@ def get_participant_folders():
 
 def find_main_pdf(folder_path):
     """Find the main assignment PDF (not submission_keys.pdf)."""
-    pdf_files = list(folder_path.glob('*.pdf'))
-    # Filter out submission_keys.pdf
-    main_pdfs = [p for p in pdf_files if 'submission_keys' not in p.name.lower()]
-    return main_pdfs[0] if main_pdfs else (pdf_files[0] if pdf_files else None)
+    return find_cover_pdf(folder_path)
 
 
 def extract_participant_id(folder_name):
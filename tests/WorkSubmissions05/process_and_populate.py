@@ -12,6 +12,9 @@ from pathlib import Path
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from cover_page import find_cover_pdf, parse_form_fields
+
 # Set UTF-8 encoding for stdout on Windows
 if sys.platform == 'win32':
     if sys.stdout.encoding != 'utf-8':
@@ -29,68 +32,7 @@ def extract_info_from_pdf_text(pdf_text):
     Extract the required pieces of information from PDF text.
     Looks at first ~2 pages (passed as pdf_text parameter).
     """
-    info = {
-        'group_code': '',
-        'student1': '',
-        'student2': '',
-        'github': '',
-        'grade': ''
-    }
-
-    # Patterns for extraction
-    patterns = {
-        'group_code': [
-            r'1\.\s*(?:Group [Cc]ode|Codegroupe|קוד קבוצה):\s*([^\n]+)',
-            r'Group [Cc]ode:\s*([^\n]+)',
-            r'קוד קבוצה:\s*([^\n]+)',
-        ],
-        'student1': [
-            r'2\.\s*(?:Student one|Member A|שם חבר צוות ראשון):\s*([^\n]+)',
-            r'Student one:\s*([^\n]+)',
-            r'Member A:\s*([^\n]+)',
-            r'Student 1:\s*([^\n]+)',
-        ],
-        'student2': [
-            r'3\.\s*(?:Student two|Member B|שם חבר צוות שני):\s*([^\n]+)',
-            r'Student two:\s*([^\n]+)',
-            r'Member B:\s*([^\n]+)',
-            r'Student 2:\s*([^\n]+)',
-        ],
-        'github': [
-            r'4\.\s*(?:Repo link|GitHub Repository|קישור לריפו):\s*([^\n]+)',
-            r'GitHub Repository:\s*([^\n]+)',
-            r'Repo link:\s*([^\n]+)',
-            r'(https://github\.com/[^\s\)]+)',
-        ],
-        'grade': [
-            r'5\.\s*(?:Grade suggestion|הציון העצמי שלי):\s*(\d+)',
-            r'Grade suggestion:\s*(\d+)',
-            r'הציון העצמי שלי\s*[:]?\s*(\d+)',
-            r'(?:Suggested [Gg]rade|Self [Gg]rade):\s*(\d+)',
-        ]
-    }
-
-    # Try each pattern for each field
-    for field, pattern_list in patterns.items():
-        for pattern in pattern_list:
-            match = re.search(pattern, pdf_text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                info[field] = match.group(1).strip()
-                break
-
-    # Clean up GitHub URL - extract just the URL if there's extra text
-    if info['github']:
-        github_match = re.search(r'https://github\.com/[^\s\)]+', info['github'])
-        if github_match:
-            info['github'] = github_match.group(0)
-
-    # Extract just the number from suggested grade
-    if info['grade']:
-        grade_match = re.search(r'(\d+)', info['grade'])
-        if grade_match:
-            info['grade'] = grade_match.group(1)
-
-    return info
+    return parse_form_fields(pdf_text)
 
 
 def create_student_excel(folder_path, participant_id, group_code, student1, student2, github, grade, pdf_filename):
@@ -142,10 +84,7 @@ def create_student_excel(folder_path, participant_id, group_code, student1, stud
 
 def find_main_pdf(folder_path):
     """Find the main assignment PDF (not submission_keys.pdf)."""
-    pdf_files = list(folder_path.glob('*.pdf'))
-    # Filter out submission_keys.pdf
-    main_pdfs = [p for p in pdf_files if 'submission_keys' not in p.name.lower()]
-    return main_pdfs[0] if main_pdfs else (pdf_files[0] if pdf_files else None)
+    return find_cover_pdf(folder_path)
 
 
 def main():
@@ -2,11 +2,17 @@
 """
 Calculate student grades based on criteria graph
 """
+import sys
 import json
 import pandas as pd
 from pathlib import Path
 from collections import defaultdict
 
+# Shared scoring helpers live in scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from criteria_matrix import CriteriaMatrix
+from scoring import competition_ranks, round_values, score_students
+
 BASE_DIR = Path(r"E:\Projects\student-project-evaluator\tests\WorkSubmissions06")
 OUTPUT_DIR = Path(r"E:\Projects\student-project-evaluator\tests\WorkSubmissions06\outputs")
 
@@ -20,50 +26,36 @@ def calculate_scores(data):
     criteria_graph = data["criteria_graph"]
     student_data = data["student_data"]
 
-    scores = {}
-
-    for student_id, student_info in student_data.items():
-        raw_score = 0.0
-        criteria_list = student_info["criteria"]
-
-        # Sum weights for all criteria this student has
-        for criterion in criteria_list:
-            if criterion in criteria_graph:
-                weight = criteria_graph[criterion]["weight"]
-                raw_score += weight
-
-        scores[student_id] = {
-            "raw_score": round(raw_score, 2),
-            "criteria_count": len(criteria_list),
-            "criteria": criteria_list,
-            "md_files_count": len(student_info["md_files"])
-        }
+    # Sum weights for all criteria each student has (row sums of the membership matrix)
+    matrix = CriteriaMatrix.from_student_criteria(
+        {student_id: info["criteria"] for student_id, info in student_data.items()},
+        criteria=criteria_graph)
+    weights = [criteria_graph[c]["weight"] if c in criteria_graph else 0.0 for c in matrix.criteria]
+    result = score_students(matrix, weights)
 
     # Calculate max possible score (sum of all weights)
-    max_possible = sum(c["weight"] for c in criteria_graph.values())
+    max_possible = result["max_possible"]
 
-    # Calculate percentages
-    for student_id, score_data in scores.items():
-        percentage = (score_data["raw_score"] / max_possible) * 100
-        scores[student_id]["percentage"] = round(percentage, 2)
+    # Percentages and relative grades from the rounded raw scores
+    raw_scores = round_values(result["raw_score"], 2)
+    percentages = round_values((raw_scores / max_possible) * 100, 2)
+    relative_grades = round_values((percentages / percentages.max()) * 100, 2)
 
-    # Calculate relative grades
-    best_percentage = max(s["percentage"] for s in scores.values())
+    # Rank students (ties share the same rank)
+    ranks = competition_ranks(relative_grades)
 
-    for student_id, score_data in scores.items():
-        relative_grade = (score_data["percentage"] / best_percentage) * 100
-        scores[student_id]["relative_grade"] = round(relative_grade, 2)
-
-    # Rank students
-    sorted_students = sorted(scores.items(), key=lambda x: x[1]["relative_grade"], reverse=True)
-
-    current_rank = 1
-    previous_grade = None
-    for i, (student_id, score_data) in enumerate(sorted_students):
-        if previous_grade is not None and score_data["relative_grade"] < previous_grade:
-            current_rank = i + 1
-        scores[student_id]["rank"] = current_rank
-        previous_grade = score_data["relative_grade"]
+    scores = {}
+    for i, student_id in enumerate(matrix.students):
+        student_info = student_data[student_id]
+        scores[student_id] = {
+            "raw_score": float(raw_scores[i]),
+            "criteria_count": len(student_info["criteria"]),
+            "criteria": student_info["criteria"],
+            "md_files_count": len(student_info["md_files"]),
+            "percentage": float(percentages[i]),
+            "relative_grade": float(relative_grades[i]),
+            "rank": int(ranks[i])
+        }
 
     return scores, max_possible
 
@@ -3,11 +3,16 @@
 Extract criteria from student markdown files in WorkSubmissions06
 """
 import os
+import sys
 import json
-import re
 from pathlib import Path
 from collections import defaultdict
 
+# Shared extraction helpers live in scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from extraction_engine import load_rule_pack
+from submission_walker import walk_files
+
 # Base directory
 BASE_DIR = Path(r"E:\Projects\student-project-evaluator\tests\WorkSubmissions06")
 OUTPUT_DIR = Path(r"E:\Projects\student-project-evaluator\tests\WorkSubmissions06\outputs")
@@ -19,122 +24,20 @@ criteria_graph = defaultdict(lambda: {"students": [], "count": 0, "sources": def
 # Student data: {student_id: {"criteria": [], "md_files": []}}
 student_data = defaultdict(lambda: {"criteria": set(), "md_files": []})
 
-# File-based criteria detection
-FILENAME_CRITERIA = {
-    r"(?i)prd\.md|productrequ": "PRD Document",
-    r"(?i)testing\.md|test\.md": "Testing Documentation",
-    r"(?i)contributing\.md": "Contributing Guide",
-    r"(?i)quickstart\.md|quick-start\.md": "Quick Start Guide",
-    r"(?i)architecture\.md|design\.md": "Architecture Documentation",
-    r"(?i)changelog\.md|changes\.md": "Changelog",
-    r"(?i)api\.md|api_docs\.md": "API Documentation",
-    r"(?i)roadmap\.md": "Roadmap",
-    r"(?i)deployment\.md|deploy\.md": "Deployment Guide",
-    r"(?i)troubleshooting\.md|faq\.md": "Troubleshooting Guide",
-    r"(?i)readme\.md": "README",
-}
-
-# Content-based extraction patterns
-EXTRACTION_PATTERNS = {
-    # Testing
-    r"(?i)\b(unit test|unittest|unit testing)\b": "Unit Tests",
-    r"(?i)\b(integration test|integration testing)\b": "Integration Tests",
-    r"(?i)\b(e2e test|end-to-end test|e2e testing)\b": "E2E Tests",
-    r"(?i)\b(test coverage|code coverage|coverage:?\s*[\d~]+%)\b": "Test Coverage Metrics",
-    r"(?i)\b(pytest|jest|mocha|junit)\b": "Testing Framework",
-
-    # Quality Standards
-    r"(?i)\b(eslint|\.eslintrc)\b": "ESLint Configuration",
-    r"(?i)\b(pylint|\.pylintrc)\b": "Pylint Configuration",
-    r"(?i)\b(prettier|\.prettierrc)\b": "Prettier Formatting",
-    r"(?i)\b(black formatter|black formatting)\b": "Black Formatting",
-    r"(?i)\b(pre-commit hook|pre-commit|\.pre-commit)\b": "Pre-commit Hooks",
-    r"(?i)\b(type checking|mypy|typescript strict)\b": "Type Checking",
-    r"(?i)\b(code review|peer review)\b": "Code Review Process",
-    r"(?i)\b(code style guide|coding standards|style guide)\b": "Code Style Guide",
-    r"(?i)\b(pep ?8 compli|follows? pep ?8)\b": "PEP8 Compliance",
-
-    # DevOps
-    r"(?i)\b(ci/?cd|continuous integration|github actions|gitlab ci)\b": "CI/CD Pipeline",
-    r"(?i)\b(docker|dockerfile|containeriz)\b": "Docker",
-    r"(?i)\b(kubernetes|k8s)\b": "Kubernetes",
-
-    # Planning & Analysis
-    r"(?i)##\s*(problem statement|problem)\b": "Problem Statement",
-    r"(?i)##\s*(solution|proposed solution)\b": "Solution Overview",
-    r"(?i)##\s*(requirements|functional requirements)\b": "Functional Requirements",
-    r"(?i)##\s*(use case|use cases)\b": "Use Case Documentation",
-    r"(?i)##\s*(cost analysis|budget|costs)\b": "Cost Analysis",
-    r"(?i)##\s*(risk analysis|risks)\b": "Risk Analysis",
-    r"(?i)##\s*(success metrics|kpis|metrics)\b": "Success Metrics",
-    r"(?i)##\s*(assumptions|constraints)\b": "Assumptions Documentation",
-    r"(?i)##\s*(roadmap|future work)\b": "Roadmap",
-    r"(?i)##\s*(design decision|trade-?offs)\b": "Design Decision Documentation",
-    r"(?i)##\s*(user stories|user personas)\b": "User Research",
-
-    # Documentation
-    r"(?i)##\s*(api|endpoints|api reference)\b": "API Documentation",
-    r"(?i)##\s*(installation|setup|getting started)\b": "Installation Instructions",
-    r"(?i)##\s*(usage|how to use)\b": "Usage Guide",
-    r"(?i)##\s*(screenshots|demo|examples)\b": "Screenshots",
-    r"(?i)##\s*(architecture|design)\b": "Architecture Documentation",
-    r"(?i)##\s*(contributing|development)\b": "Contributing Guide",
-}
-
-# Negative patterns (don't count these)
-NEGATIVE_PATTERNS = [
-    r"(?i)\b(todo|fixme|not yet|not complete|missing|planned|future work|out of scope|skipped|omitted)\b",
-    r"(?i)\bwill (add|implement|create)\b",
-    r"(?i)\b(might be|considering|if time permits|would be nice|ideally|optional)\b",
-]
+# Filename, content and negative-context rules live in scripts/rules/ws06_basic.json
+RULES = load_rule_pack("ws06_basic")
 
 def is_student_folder(path):
     """Check if this is a student folder"""
     return path.is_dir() and path.name.startswith("Participant_")
 
-def is_negative_context(text):
-    """Check if text contains negative indicators"""
-    for pattern in NEGATIVE_PATTERNS:
-        if re.search(pattern, text):
-            return True
-    return False
-
-def extract_from_filename(filepath):
-    """Extract criteria based on filename"""
-    filename = filepath.name
-    criteria = []
-    for pattern, criterion in FILENAME_CRITERIA.items():
-        if re.search(pattern, filename):
-            criteria.append(criterion)
-    return criteria
-
-def extract_from_content(content, filepath):
-    """Extract criteria from file content"""
-    criteria = []
-
-    # Check each pattern
-    for pattern, criterion in EXTRACTION_PATTERNS.items():
-        matches = re.finditer(pattern, content)
-        for match in matches:
-            # Get context around the match (100 chars before and after)
-            start = max(0, match.start() - 100)
-            end = min(len(content), match.end() + 100)
-            context = content[start:end]
-
-            # Skip if negative context
-            if not is_negative_context(context):
-                criteria.append(criterion)
-                break  # Only count once per file
-
-    return criteria
-
 def process_student(student_dir):
     """Process all markdown files for a student"""
     student_id = student_dir.name
     print(f"Processing {student_id}...")
 
     # Find all .md files
-    md_files = list(student_dir.rglob("*.md"))
+    md_files = list(walk_files(student_dir, skip_hidden=False))
     student_data[student_id]["md_files"] = [str(f.relative_to(BASE_DIR)) for f in md_files]
 
     print(f"  Found {len(md_files)} markdown files")
@@ -142,15 +45,8 @@ def process_student(student_dir):
     # Extract criteria from each file
     for md_file in md_files:
         try:
-            # Extract from filename
-            file_criteria = extract_from_filename(md_file)
-            for criterion in file_criteria:
-                student_data[student_id]["criteria"].add(criterion)
-
-            # Extract from content
-            content = md_file.read_text(encoding='utf-8', errors='ignore')
-            content_criteria = extract_from_content(content, md_file)
-            for criterion in content_criteria:
+            # Extract from filename and content (large files are streamed)
+            for criterion in RULES.extract_file(md_file):
                 student_data[student_id]["criteria"].add(criterion)
 
         except Exception as e:
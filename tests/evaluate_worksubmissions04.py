@@ -6,6 +6,7 @@ Following the complete workflow from SKILL.md
 
 import os
 import re
+import sys
 import json
 from pathlib import Path
 from collections import defaultdict
@@ -14,6 +15,10 @@ import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 
+# Shared extraction helpers live in scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from submission_walker import walk_files
+
 # Base paths
 BASE_DIR = Path(r"E:\Projects\student-project-evaluator\tests\WorkSubmissions04")
 OUTPUT_DIR = Path(r"E:\Projects\student-project-evaluator\outputs")
@@ -320,7 +325,7 @@ def main():
         print(f"Processing {student_id}...", end=" ")
 
         # Find all markdown files
-        md_files = list(student_path.rglob("*.md"))
+        md_files = list(walk_files(student_path, skip_hidden=False))
         print(f"({len(md_files)} markdown files)")
 
         # Extract criteria from all markdown files